@@ -0,0 +1,160 @@
+# Standard library for compact arrays of basic values
+from array import array
+
+# Kinds of the nodes of the syntax tree, the position of a kind in this list is its kind code
+NODE_KINDS = (
+    "program",
+    "block",
+    "var",
+    "assign",
+    "if",
+    "while",
+    "for",
+    "do",
+    "fun",
+    "class",
+    "print",
+    "input",
+    "call",
+    "index",
+    "list",
+    "binary",
+    "unary",
+    "postfix",
+    "name",
+    "number",
+    "string",
+    "true",
+    "false",
+    "empty",
+)
+
+# Kind code of every node kind
+(
+    PROGRAM,
+    BLOCK,
+    VAR,
+    ASSIGN,
+    IF,
+    WHILE,
+    FOR,
+    DO,
+    FUN,
+    CLASS,
+    PRINT,
+    INPUT,
+    CALL,
+    INDEX,
+    LIST,
+    BINARY,
+    UNARY,
+    POSTFIX,
+    NAME,
+    NUMBER,
+    STRING,
+    TRUE,
+    FALSE,
+    EMPTY,
+) = range(len(NODE_KINDS))
+
+
+class Ast:
+    """
+    Ast class stores a syntax tree in flat typed arrays instead of one object per node, a node is an
+    index into the arrays and its children are a range of the children array
+    """
+
+    def __init__(self):
+        """
+        Initializer of Ast class
+        Values
+        ======
+        kinds    (array) = Kind code of every node, see NODE_KINDS
+        values   (array) = Value of every node, the symbol id of names and constants, the token kind
+                           code of operators (see token_spec.TOKEN_CODES), -1 for no value
+        lines    (array) = Line number of every node
+        firsts   (array) = Index of the first child of every node in children
+        counts   (array) = Number of children of every node
+        children (array) = Child nodes of all nodes, the children of a node are next to each other
+        root     (int)   = The program node, -1 before the tree is parsed
+        """
+
+        self.kinds = array("B")
+        self.values = array("i")
+        self.lines = array("i")
+        self.firsts = array("i")
+        self.counts = array("i")
+        self.children = array("i")
+        self.root = -1
+
+    def add(self, kind, value, line_num, children=()):
+        """
+        Adds a node, its children have to be added before it
+        Params
+        ======
+        kind     (int)  = Kind code of the node
+        value    (int)  = Value of the node, -1 for no value
+        line_num (int)  = Line number
+        children (list) = The child nodes in order
+        Returns
+        =======
+        int: The node
+        """
+
+        self.kinds.append(kind)
+        self.values.append(value)
+        self.lines.append(line_num)
+        self.firsts.append(len(self.children))
+        self.counts.append(len(children))
+        self.children.extend(children)
+
+        return len(self.kinds) - 1
+
+    def child_nodes(self, node):
+        """
+        Returns the children of a node
+        Params
+        ======
+        node (int) = The node
+        Returns
+        =======
+        array: The child nodes in order
+        """
+
+        first = self.firsts[node]
+        return self.children[first : first + self.counts[node]]
+
+    def dump(self, node=None):
+        """
+        Returns a node and its descendants as nested tuples, for printing and comparing trees
+        Params
+        ======
+        node (int) = The node, by default the root
+        Returns
+        =======
+        tuple: (kind, value, [children]) of the node
+        """
+
+        node = self.root if node is None else node
+
+        # Children come before their parents, so one pass in order builds every subtree
+        trees = []
+        for index in range(node + 1):
+            trees.append(
+                (
+                    NODE_KINDS[self.kinds[index]],
+                    self.values[index],
+                    [trees[child] for child in self.child_nodes(index)],
+                )
+            )
+
+        return trees[node]
+
+    def __len__(self):
+        """
+        Returns
+        =======
+        int: Number of nodes
+        """
+
+        return len(self.kinds)
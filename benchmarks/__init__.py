@@ -0,0 +1,3 @@
+# Benchmarks of the pulse scanner and virtual machine, and differential tests of the scanning
+# engines, run from the repository root with:
+# python -m benchmarks.run, python -m benchmarks.vm and python -m benchmarks.differential
@@ -0,0 +1,138 @@
+# Standard library for pseudo random numbers
+import random
+
+# Standard library for operating system dependent functionality
+import os
+
+# Statements opening a block, {} is replaced by a condition
+BLOCK_STATEMENTS = ["if {}:", "while {}:", "elif {}:", "else:", "fun {}():", "for {}:"]
+
+# Operators used in generated expressions
+OPERATORS = ["+", "-", "*", "/", "//", "%", "==", "!=", "<", "<=", ">", ">=", "and", "or"]
+
+# Operators used in generated assignments
+ASSIGNMENTS = ["=", "+=", "-=", "*=", "/=", "%="]
+
+# Words used in generated strings and comments
+WORDS = ["alpha", "beta", "gamma", "delta", "pulse", "token", "value", "count", "total"]
+
+
+def generate_source(
+    size=1 << 20,
+    seed=0,
+    identifier_churn=0.05,
+    literal_density=0.3,
+    comment_ratio=0.1,
+    string_ratio=0.2,
+    max_depth=3,
+):
+    """
+    Generates deterministic pulse source code of a given shape
+    Params
+    ======
+    size             (int)
+        : Approximate length of the source code in characters
+    seed             (int)
+        : Seed of the generator, the same parameters always give the same source code
+    identifier_churn (float)
+        : Probability that an identifier is new instead of one used before
+    literal_density  (float)
+        : Probability that an operand is a literal instead of an identifier
+    comment_ratio    (float)
+        : Probability that a line is a single or multi line comment
+    string_ratio     (float)
+        : Probability that a literal is a string instead of a number
+    max_depth        (int)
+        : Deepest level of indentation of blocks
+    Returns
+    =======
+    (str)
+        : The generated source code
+    """
+
+    rng = random.Random(seed)
+    identifiers = ["x0"]
+    lines = []
+    length = 0
+    depth = 0
+
+    def identifier():
+        if rng.random() < identifier_churn:
+            identifiers.append("%s%d" % (rng.choice(WORDS), len(identifiers)))
+        return rng.choice(identifiers)
+
+    def operand():
+        if rng.random() >= literal_density:
+            return identifier()
+        if rng.random() < string_ratio:
+            quote = rng.choice("\"'")
+            return quote + " ".join(rng.sample(WORDS, rng.randint(1, 4))) + quote
+        if rng.random() < 0.5:
+            return str(rng.randint(0, 100000))
+        return "%d.%s" % (rng.randint(0, 999), str(rng.randint(0, 10**9)).zfill(rng.randint(1, 10)))
+
+    def expression():
+        parts = [operand()]
+        for _ in range(rng.randint(0, 3)):
+            parts += [rng.choice(OPERATORS), operand()]
+        return " ".join(parts)
+
+    while length < size:
+        indent = "\t" * depth
+        choice = rng.random()
+
+        if choice < comment_ratio:
+            if rng.random() < 0.5:
+                line = "# " + " ".join(rng.sample(WORDS, 3))
+            else:
+                line = "/* " + " ".join(rng.sample(WORDS, 3)) + " */"
+        elif choice < comment_ratio + 0.15 and depth < max_depth:
+            template = rng.choice(BLOCK_STATEMENTS)
+            line = template.format(identifier() if template.startswith("fun") else expression())
+            depth += 1
+        elif choice < comment_ratio + 0.3 and depth > 0:
+            depth -= rng.randint(1, depth)
+            line = "print(%s)" % expression()
+            indent = "\t" * depth
+        elif choice < comment_ratio + 0.4:
+            line = "print(%s)" % expression()
+        else:
+            line = "var %s %s %s" % (identifier(), rng.choice(ASSIGNMENTS), expression())
+
+        lines.append(indent + line)
+        length += len(indent) + len(line) + 1
+
+    return "\n".join(lines) + "\n"
+
+
+def write_corpus(directory, files=16, size=1 << 16, seed=0, **shape):
+    """
+    Writes generated pulse source files into a directory
+    Params
+    ======
+    directory (str)
+        : Directory receiving the files, created if it does not exist
+    files     (int)
+        : Number of files
+    size      (int)
+        : Approximate length of every file in characters
+    seed      (int)
+        : Seed of the first file, the following files use the next seeds
+    shape     (dict)
+        : Further parameters of generate_source
+    Returns
+    =======
+    (list)
+        : Paths of the written files
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+
+    for i in range(files):
+        path = os.path.join(directory, "corpus_%04d.pulse" % i)
+        with open(path, "w") as file:
+            file.write(generate_source(size, seed + i, **shape))
+        paths.append(path)
+
+    return paths
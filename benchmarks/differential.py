@@ -0,0 +1,246 @@
+# Standard library to parse command line arguments
+import argparse
+
+# The module for system-specific parameters and functions
+import sys
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import the scanner and its registry of engines
+from pulse_scanner import ENGINES, register_engine, scanner
+
+# Import the parallel engine
+from pulse_parallel import parallel_scanner
+
+# Import the generator of the corpus
+from benchmarks.corpus import generate_source
+
+# Engine all other engines are compared with
+REFERENCE = "reference"
+
+# Characters per chunk of the chunked parallel engine, small so that every generated source is split
+CHUNK_SIZE = 1 << 12
+
+# Shapes of the generated sources, as keyword arguments of generate_source
+SHAPES = {
+    "default": {},
+    "comments": {"comment_ratio": 0.5},
+    "strings": {"literal_density": 0.8, "string_ratio": 0.8},
+    "deep": {"max_depth": 8, "identifier_churn": 0.5},
+}
+
+# Sources the generator does not make, blocks are indented with tabs
+EDGE_CASES = {
+    "empty": "",
+    "blank_lines": "\n\n\t\n\n",
+    "single_quotes": "var s = 'it is'\nprint(s, \"and\")\n",
+    "numbers": "var x = 12.5 + 0.25 * 3 // 2 - 007\n",
+    "comments": "# first\n/* one\ntwo */\nvar a = 1 # last",
+    "unicode": 'var s = "héllo wörld ✓"\n# ümlaut comment\nprint(s)\n',
+    "nested_blocks": "if a:\n\tif b:\n\t\twhile c:\n\t\t\tc -= 1\nprint(a)\n",
+    "staged_dedent": "while c < 2:\n\tif c == 0:\n\t\tprint(c)\n\tprint(c)\n\tc++\nprint(c)\n",
+    "space_dedent": "if a:\n  if b:\n    a = b\n  b = a\nprint(b)\n",
+    "no_newline_at_end": "fun f(a, b):\n\tvar c = a * b",
+    "operators": "a += 1\nb -= 2\nc *= 3\nd /= 4\ne %= 5\nf = a == b != c <= d >= e < f > g\n",
+}
+
+
+def chunked_parallel_scanner(
+    source_code,
+    table,
+    stats=None,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+    workers=None,
+):
+    """
+    Generate tokens with the parallel engine split into small chunks, so that the merging of the
+    chunks is compared on sources too small for the parallel engine to split by default
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    stats       (ScanStats) (Optional)
+        : Statistics receiving token counts, timings and symbol table counts of this scan
+    diagnostics (list) (Optional)
+        : List receiving the errors in the source code
+    spans       (bool) (Optional)
+        : Whether comment tokens get a Span of the source code as value instead of a copy of their text
+    comments    (bool) (Optional)
+        : Whether comment tokens are generated
+    newlines    (bool) (Optional)
+        : Whether newline tokens are generated
+    workers     (int) (Optional)
+        : Number of worker processes, two by default
+    Returns
+    ========
+    tokens: A list of tokens of the source code
+    """
+
+    return parallel_scanner(
+        source_code,
+        table,
+        workers or 2,
+        CHUNK_SIZE,
+        stats,
+        diagnostics,
+        spans,
+        comments,
+        newlines,
+    )
+
+
+register_engine("parallel_chunks", __name__, "chunked_parallel_scanner")
+
+
+def scan(engine, source_code, comments, newlines):
+    """
+    Scans source code with an engine
+    Params
+    ======
+    engine      (str)
+        : Name of the engine
+    source_code (str/bytes)
+        : Pulse source code
+    comments    (bool)
+        : Whether comment tokens are generated
+    newlines    (bool)
+        : Whether newline tokens are generated
+    Returns
+    =======
+    (list)
+        : (type, value, line number) of every token, offsets are left out since the ones of bytes are
+          byte offsets and the reference engine has none
+    (list)
+        : [value, type, typedata] of every entry of the symbol table
+    """
+
+    table = SymbolTable()
+    tokens = scanner(source_code, table, comments=comments, newlines=newlines, engine=engine)
+
+    return (
+        [(token.type, token.val, token.line_num) for token in tokens],
+        [table.get_by_id(id) for id in range(1, table.id)],
+    )
+
+
+def difference(expected, found):
+    """
+    Describes the first difference between two lists
+    Params
+    ======
+    expected (list)
+        : Items of the reference engine
+    found    (list)
+        : Items of the compared engine
+    Returns
+    =======
+    (str)
+        : The first index where the lists differ and their items there, None if they are equal
+    """
+
+    if expected == found:
+        return None
+
+    for index, (left, right) in enumerate(zip(expected, found)):
+        if left != right:
+            return "at %d expected %r, found %r" % (index, left, right)
+
+    return "expected %d items, found %d" % (len(expected), len(found))
+
+
+def sources(sizes, seeds):
+    """
+    Generates the sources every engine scans
+    Params
+    ======
+    sizes (list)
+        : Approximate lengths of the generated sources in characters
+    seeds (int)
+        : Number of generated sources per size and shape
+    Yields
+    ======
+    (str)
+        : Name of the source
+    (str)
+        : The source code
+    """
+
+    yield from EDGE_CASES.items()
+
+    for size in sizes:
+        for shape, options in SHAPES.items():
+            for seed in range(seeds):
+                yield "%s/%d/%d" % (shape, size, seed), generate_source(size, seed, **options)
+
+
+def main():
+    """
+    Scans generated and hand written sources with every engine and reports the tokens and symbol
+    tables which differ from the ones of the reference engine
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Differential tests of the scanning engines against the reference engine"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1 << 10, 1 << 14],
+        help="lengths of the generated sources in characters",
+    )
+    parser.add_argument("--seeds", type=int, default=3, help="generated sources per size and shape")
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=sorted(set(ENGINES) - {REFERENCE}),
+        help="engines to compare (default: all)",
+    )
+    args = parser.parse_args()
+
+    engines = args.engines or sorted(set(ENGINES) - {REFERENCE})
+    mismatches = 0
+    count = 0
+
+    for name, source_code in sources(args.sizes, args.seeds):
+        count += 1
+
+        # Every engine gets both the text and its utf-8 encoding, with and without trivia
+        for comments, newlines in ((True, True), (False, False)):
+            expected = scan(REFERENCE, source_code, comments, newlines)
+
+            for engine in engines:
+                for source in (source_code, source_code.encode("utf-8")):
+                    found = scan(engine, source, comments, newlines)
+
+                    for part, left, right in zip(("tokens", "symbols"), expected, found):
+                        message = difference(left, right)
+                        if message is not None:
+                            mismatches += 1
+                            print(
+                                "%s: %s on %s (%s%s): %s %s"
+                                % (
+                                    engine,
+                                    name,
+                                    type(source).__name__,
+                                    "comments" if comments else "no comments",
+                                    ", newlines" if newlines else ", no newlines",
+                                    part,
+                                    message,
+                                )
+                            )
+
+    print("%d sources, %d engines, %d mismatches" % (count, len(engines), mismatches))
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+# Standard library to parse command line arguments
+import argparse
+
+# Standard library for json encoding
+import json
+
+# Standard library for process based parallelism
+import multiprocessing
+
+# Standard library for operating system dependent functionality
+import os
+
+# Standard library to run the command line interface in a new process
+import subprocess
+
+# The module for system-specific parameters and functions
+import sys
+
+# Standard library to create temporary files
+import tempfile
+
+# Standard library for timing
+import time
+
+# Standard library to trace memory allocations
+import tracemalloc
+
+# Standard library for streams in memory
+import io
+
+# Standard library to run every benchmark in a fresh process
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    # Standard library for resource usage, only available on Unix
+    import resource
+except ImportError:
+    resource = None
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import scanner
+from pulse_scanner import iter_tokens, reference_scanner, scanner
+
+# Import the vector engine, which scans like the scanner when NumPy is missing
+from pulse_vector import vector_scanner
+
+# Import the corpus generator
+from benchmarks.corpus import generate_source
+
+# Path of the command line interface
+PULSE_CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pulse.py")
+
+
+def bench_scanner(source_code):
+    """Scans the source code with the table driven scanner"""
+    tokens = scanner(source_code, SymbolTable())
+    return len(tokens), tokens
+
+
+def bench_scanner_no_trivia(source_code):
+    """Scans the source code without generating comment and newline tokens"""
+    tokens = scanner(source_code, SymbolTable(), comments=False, newlines=False)
+    return len(tokens), tokens
+
+
+def bench_vector_scanner(source_code):
+    """Scans the source code with the NumPy pre-pass engine"""
+    tokens = vector_scanner(source_code, SymbolTable())
+    return len(tokens), tokens
+
+
+def bench_reference_scanner(source_code):
+    """Scans the source code with the character by character reference scanner"""
+    tokens = reference_scanner(source_code + "\0", SymbolTable())
+    return len(tokens), tokens
+
+
+def bench_iter_tokens(source_code):
+    """Streams the source code through the scanner in chunks"""
+    tokens = list(iter_tokens(io.StringIO(source_code), SymbolTable()))
+    return len(tokens), tokens
+
+
+def bench_symbol_table(source_code):
+    """Inserts and looks up every whitespace separated word of the source code in a symbol table"""
+    table = SymbolTable()
+    words = source_code.split()
+    for word in words:
+        if table.get_by_symbol(word) == -1:
+            table.entry(word, "var", "variable")
+    return len(words), table
+
+
+# In process benchmarks, each function returns the number of tokens (or operations) it produced and
+# the objects it produced, whose allocations are counted
+BENCHMARKS = {
+    "scanner": bench_scanner,
+    "scanner_no_trivia": bench_scanner_no_trivia,
+    "vector_scanner": bench_vector_scanner,
+    "reference_scanner": bench_reference_scanner,
+    "iter_tokens": bench_iter_tokens,
+    "symbol_table": bench_symbol_table,
+}
+
+
+def measure(function, source_code, repeat):
+    """
+    Times a benchmark function and traces its memory allocations, the process should be new since
+    its peak resident memory is reported
+    Params
+    ======
+    function    (function)
+        : The benchmark function
+    source_code (str)
+        : Source code passed to the function
+    repeat      (int)
+        : Number of timed runs, the fastest one is reported
+    Returns
+    =======
+    (dict)
+        : The measurements of the benchmark
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count, produced = function(source_code)
+        del produced
+        times.append(time.perf_counter() - start)
+
+    # One more run under tracemalloc, which would distort the timings, counting the memory blocks
+    # still held by the produced objects and the most memory allocated at once during the run
+    tracemalloc.start()
+    count, produced = function(source_code)
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del produced
+
+    best = min(times)
+    size = len(source_code.encode("utf-8"))
+
+    return {
+        "seconds": best,
+        "count": count,
+        "tokens_per_second": count / best,
+        "mb_per_second": size / best / 1e6,
+        "peak_traced_bytes": peak,
+        "live_blocks": blocks,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+    }
+
+
+def measure_cli(source_code, repeat):
+    """
+    Times the command line interface end to end, including interpreter startup and output, the
+    process should be new since the peak resident memory of its children is reported
+    Params
+    ======
+    source_code (str)
+        : Source code written to a file for the command line interface
+    repeat      (int)
+        : Number of timed runs, the fastest one is reported
+    Returns
+    =======
+    (dict)
+        : The measurements of the benchmark
+    """
+
+    with tempfile.NamedTemporaryFile("w", suffix=".pulse", delete=False) as file:
+        file.write(source_code)
+
+    try:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, PULSE_CLI, file.name], stdout=subprocess.DEVNULL, check=True
+            )
+            times.append(time.perf_counter() - start)
+    finally:
+        os.remove(file.name)
+
+    best = min(times)
+
+    return {
+        "seconds": best,
+        "mb_per_second": len(source_code.encode("utf-8")) / best / 1e6,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss if resource else None,
+    }
+
+
+def isolated(name, source_code, repeat):
+    """
+    Measures one benchmark, run by main in a process of its own since the peak resident memory of a
+    process never decreases and would otherwise be the one of the largest benchmark run before
+    Params
+    ======
+    name        (str)
+        : Name of the benchmark, "cli" for the command line interface
+    source_code (str)
+        : Source code passed to the benchmark
+    repeat      (int)
+        : Number of timed runs, the fastest one is reported
+    Returns
+    =======
+    (dict)
+        : The measurements of the benchmark
+    """
+
+    if name == "cli":
+        return measure_cli(source_code, repeat)
+
+    return measure(BENCHMARKS[name], source_code, repeat)
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results against a stored baseline
+    Params
+    ======
+    results   (dict)
+        : Measurements of this run
+    baseline  (dict)
+        : Measurements of the baseline run
+    tolerance (float)
+        : Allowed slow down, for example 0.1 for 10%
+    Returns
+    =======
+    (bool)
+        : Whether no benchmark is slower than the baseline by more than the tolerance
+    """
+
+    ok = True
+
+    for name, result in results["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            continue
+
+        ratio = result["seconds"] / baseline["benchmarks"][name]["seconds"]
+        slower = ratio > 1 + tolerance
+        ok = ok and not slower
+
+        print("%-20s %6.2fx baseline time%s" % (name, ratio, "  REGRESSION" if slower else ""))
+
+    return ok
+
+
+def main():
+    """
+    Runs the benchmarks on a generated corpus and reports or stores the results
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmarks of the pulse scanner")
+    parser.add_argument("--size", type=int, default=1 << 20, help="corpus size in characters")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the corpus generator")
+    parser.add_argument("--identifier-churn", type=float, default=0.05)
+    parser.add_argument("--literal-density", type=float, default=0.3)
+    parser.add_argument("--comment-ratio", type=float, default=0.1)
+    parser.add_argument("--string-ratio", type=float, default=0.2)
+    parser.add_argument("--max-depth", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(BENCHMARKS) + ["cli"], help="benchmarks to run"
+    )
+    parser.add_argument("--json", metavar="PATH", help="write the results to a json file")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with stored json results")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="allowed slow down against the baseline"
+    )
+    args = parser.parse_args()
+
+    shape = {
+        "identifier_churn": args.identifier_churn,
+        "literal_density": args.literal_density,
+        "comment_ratio": args.comment_ratio,
+        "string_ratio": args.string_ratio,
+        "max_depth": args.max_depth,
+    }
+    source_code = generate_source(args.size, args.seed, **shape)
+
+    results = {
+        "python": sys.version.split()[0],
+        "corpus": dict(shape, size=args.size, seed=args.seed),
+        "benchmarks": {},
+    }
+
+    # Fresh processes are started, not forked, so that they do not inherit the memory of this one
+    context = multiprocessing.get_context("spawn")
+
+    for name in args.only or sorted(BENCHMARKS) + ["cli"]:
+        with ProcessPoolExecutor(1, mp_context=context) as executor:
+            result = executor.submit(isolated, name, source_code, args.repeat).result()
+        results["benchmarks"][name] = result
+
+        print(
+            "%-20s %8.4fs %10s tokens/s %7.2f MB/s"
+            % (
+                name,
+                result["seconds"],
+                "%d" % result["tokens_per_second"] if "tokens_per_second" in result else "-",
+                result["mb_per_second"],
+            )
+        )
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# Standard library to parse command line arguments
+import argparse
+
+# Standard library for json encoding
+import json
+
+# The module for system-specific parameters and functions
+import sys
+
+# Standard library for timing
+import time
+
+# Standard library for streams in memory
+import io
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import scanner
+from pulse_scanner import scanner
+
+# Import parser
+from pulse_parser import parse
+
+# Import compiler
+from pulse_compiler import compile_ast
+
+# Import optimizer
+from pulse_optimizer import optimize
+
+# Import virtual machine
+from pulse_vm import execute
+
+# Import the comparison with stored results
+from benchmarks.run import compare
+
+# Micro benchmark programs, {n} is replaced by the number of iterations, blocks are indented with tabs
+# like the programs of the corpus
+PROGRAMS = {
+    "count_loop": """
+var i = 0
+while i < {n}:
+	i++
+""",
+    "for_sum": """
+var total = 0
+for var i = 0, i < {n}, i++:
+	total += i
+print(total)
+""",
+    "arithmetic": """
+var x = 0
+var i = 0
+while i < {n}:
+	x = (x * 3 + i) % 1000003 - i // 7
+	i += 1
+print(x)
+""",
+    "float_math": """
+var x = 1.5
+var i = 0
+while i < {n}:
+	x = x * 1.000001 + 0.5 / (i + 1)
+	i++
+print(x)
+""",
+    "nested_loops": """
+var total = 0
+for var i = 0, i < {n} // 100, i++:
+	for var j = 0, j < 100, j++:
+		if j % 3 == 0 or i == j:
+			total += j
+print(total)
+""",
+    "list_updates": """
+var l = [0, 0, 0, 0, 0, 0, 0, 0]
+var i = 0
+while i < {n}:
+	l[i % 8] += i
+	i++
+print(l)
+""",
+    "constant_expressions": """
+var scale = 4
+var offset = 17
+var total = 0
+var i = 0
+while i < {n}:
+	total += i * scale + offset * 2 - 1
+	i++
+	if false:
+		print(i)
+print(total)
+""",
+    "function_calls": """
+var total = 0
+fun step(a, b):
+	var c = a * b
+	total += c
+for var i = 0, i < {n} // 10, i++:
+	step(i, 2)
+print(total)
+""",
+}
+
+
+def compile_program(source_code, optimized=False):
+    """
+    Compiles the source code of a benchmark program
+    Params
+    ======
+    source_code (str)
+        : The source code
+    optimized   (bool) (Optional)
+        : Whether the optimization passes run on the program
+    Returns
+    =======
+    (Bytecode)
+        : The compiled program
+    """
+
+    table = SymbolTable()
+    ast = parse(scanner(source_code + "\0", table))
+
+    return optimize(ast, table)[0] if optimized else compile_ast(ast, table)
+
+
+def measure(bytecode, repeat):
+    """
+    Times the execution of a compiled program
+    Params
+    ======
+    bytecode (Bytecode)
+        : The compiled program
+    repeat   (int)
+        : Number of timed runs, the fastest one is reported
+    Returns
+    =======
+    (dict)
+        : The measurements of the benchmark
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        steps = execute(bytecode, io.StringIO())
+        times.append(time.perf_counter() - start)
+
+    best = min(times)
+
+    return {
+        "seconds": best,
+        "instructions": steps,
+        "instructions_per_second": steps / best,
+        "code_size": bytecode.count(),
+    }
+
+
+def main():
+    """
+    Runs the virtual machine benchmarks and reports or stores the results
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmarks of the pulse virtual machine")
+    parser.add_argument(
+        "--iterations", type=int, default=200000, help="loop iterations of every program"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument(
+        "--optimize", action="store_true", help="run the optimization passes on the programs"
+    )
+    parser.add_argument("--only", nargs="+", choices=sorted(PROGRAMS), help="benchmarks to run")
+    parser.add_argument("--json", metavar="PATH", help="write the results to a json file")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with stored json results")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="allowed slow down against the baseline"
+    )
+    args = parser.parse_args()
+
+    results = {
+        "python": sys.version.split()[0],
+        "iterations": args.iterations,
+        "optimized": args.optimize,
+        "benchmarks": {},
+    }
+
+    for name in args.only or sorted(PROGRAMS):
+        bytecode = compile_program(PROGRAMS[name].format(n=args.iterations), args.optimize)
+        result = measure(bytecode, args.repeat)
+        results["benchmarks"][name] = result
+
+        print(
+            "%-20s %8.4fs %10d instructions %10d instructions/s"
+            % (name, result["seconds"], result["instructions"], result["instructions_per_second"])
+        )
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Standard library for binary search in sorted lists
+from bisect import bisect_right
+
+# Import the instruction set
+from opcode_spec import OPCODE_NAMES, SIZES
+
+
+class Function:
+    """
+    Function class describes a compiled pulse function
+    """
+
+    __slots__ = ("name", "entry", "params", "locals")
+
+    def __init__(self, name, entry, params, locals=0):
+        """
+        Class initializer
+        Params
+        ======
+        name   (int) = Symbol id of the name of the function
+        entry  (int) = Index of the first instruction of the function in the code
+        params (int) = Number of parameters, which are the first local variables
+        locals (int) = Number of local variables
+        """
+
+        self.name = name
+        self.entry = entry
+        self.params = params
+        self.locals = locals
+
+
+class Bytecode:
+    """
+    Bytecode class holds a compiled pulse program, every instruction is an opcode followed by its
+    operands in one flat array of integers, see opcode_spec.OPCODES
+    """
+
+    def __init__(self, code, consts, functions, lines, globals):
+        """
+        Class initializer
+        Params
+        ======
+        code      (array) = The instructions, the program starts at index 0
+        consts    (list)  = The constants, indexed by their symbol id in the symbol table, followed by
+                            nil, true, false, 1 and -1
+        functions (list)  = The Function of every function instruction
+        lines     (array) = Pairs of an instruction index and the line number of the source code from
+                            that instruction on
+        globals   (int)   = Number of global variables
+        """
+
+        self.code = code
+        self.consts = consts
+        self.functions = functions
+        self.lines = lines
+        self.globals = globals
+
+    def line(self, pc):
+        """
+        Returns the line of the source code an instruction was compiled from
+        Params
+        ======
+        pc (int) = Index of the instruction
+        Returns
+        =======
+        int: The line number, 0 if it is not known
+        """
+
+        starts = self.lines[0::2]
+        position = bisect_right(starts, pc)
+
+        return self.lines[2 * position - 1] if position else 0
+
+    def instructions(self):
+        """
+        Iterates over the instructions
+        Returns
+        =======
+        iterator: (index, opcode, operands) of every instruction
+        """
+
+        code = self.code
+        pc = 0
+
+        while pc < len(code):
+            opcode = code[pc]
+            size = SIZES[opcode]
+            yield pc, opcode, code[pc + 1 : pc + size]
+            pc += size
+
+    def count(self):
+        """
+        Returns
+        =======
+        int: Number of instructions
+        """
+
+        return sum(1 for _ in self.instructions())
+
+    def disassemble(self):
+        """
+        Returns
+        =======
+        string: One line per instruction with its index, name and operands
+        """
+
+        return "\n".join(
+            "%5d %-20s %s" % (pc, OPCODE_NAMES[opcode], " ".join(map(str, operands)))
+            for pc, opcode, operands in self.instructions()
+        )
@@ -0,0 +1,205 @@
+# Standard library for compact arrays of basic values
+from array import array
+
+# Import some helper functions
+from global_helpers import error
+
+# Import the classes of compiled programs
+from bytecode_class import Bytecode, Function
+
+# Import the instruction set
+from opcode_spec import HALT
+
+
+class Compiler:
+    """
+    Compiler class holds the state of the compilation of a syntax tree into bytecode
+    """
+
+    def __init__(self, ast, table):
+        """
+        Initializer of Compiler class
+        Params
+        ======
+        ast   (Ast)         = The syntax tree of the program
+        table (SymbolTable) = The symbol table of the scanner, which holds the constants
+        Values
+        ======
+        code      (array) = The instructions emitted so far
+        lines     (array) = Pairs of an instruction index and the line number from that instruction on
+        consts    (list)  = Value of every constant by symbol id, followed by nil, true, false, 1 and -1
+        loaded    (bytearray) = Whether the value of every symbol id is in consts already
+        functions (list)  = The compiled functions
+        globals   (dict)  = Slot of every global variable by the symbol id of its name
+        scopes    (list)  = Slot of every local variable by symbol id, for every function being
+                            compiled with the innermost last, empty at the top level
+        """
+
+        self.ast = ast
+        self.table = table
+        self.code = array("i")
+        self.lines = array("i")
+        self.functions = []
+        self.globals = {}
+        self.scopes = []
+
+        # Constants made by the compiler follow the constants of the symbol table
+        self.nil, self.true, self.false, self.one, self.minus_one = range(table.id, table.id + 5)
+        self.consts = [None] * table.id + [None, True, False, 1, -1]
+        self.loaded = bytearray(table.id)
+
+    def emit(self, opcode, *operands):
+        """
+        Adds an instruction
+        Params
+        ======
+        opcode   (int)   = The opcode
+        operands (tuple) = Its operands
+        Returns
+        =======
+        int: Index of the instruction
+        """
+
+        pc = len(self.code)
+        self.code.append(opcode)
+        self.code.extend(operands)
+
+        return pc
+
+    def line(self, line_num):
+        """
+        Records the line of the source code of the next instructions
+        Params
+        ======
+        line_num (int) = The line number
+        """
+
+        lines = self.lines
+
+        if lines and lines[-1] == line_num:
+            return
+        if lines and lines[-2] == len(self.code):
+            lines[-1] = line_num
+        else:
+            lines.append(len(self.code))
+            lines.append(line_num)
+
+    def constant(self, id, line_num):
+        """
+        Returns the index of a constant of the symbol table, converting its value on first use
+        Params
+        ======
+        id       (int) = Symbol id of the constant
+        line_num (int) = Line number of the constant, for errors
+        Returns
+        =======
+        int: Index of the constant in consts
+        """
+
+        if not self.loaded[id]:
+            value, type, _ = self.table.get_by_id(id)
+
+            if type == "string":
+                value = value[1:-1]
+            else:
+                try:
+                    value = int(value) if type == "int" else float(value)
+                except ValueError:
+                    error("Invalid numeric constant %s" % value, line_num)
+
+            self.consts[id] = value
+            self.loaded[id] = 1
+
+        return id
+
+    def resolve(self, name):
+        """
+        Returns where a variable is stored, variables declared in a function (and its parameters) are
+        local to it, all others are global
+        Params
+        ======
+        name (int) = Symbol id of the name of the variable
+        Returns
+        =======
+        bool: Whether the variable is a local variable, at the top level globals are the locals
+        int: The slot of the variable
+        """
+
+        if self.scopes and name in self.scopes[-1]:
+            return True, self.scopes[-1][name]
+
+        slot = self.globals.get(name)
+        if slot is None:
+            slot = self.globals[name] = len(self.globals)
+
+        return not self.scopes, slot
+
+    def label(self):
+        """
+        Returns
+        =======
+        list: A new label, [index of the instruction it is placed at, operands waiting for it]
+        """
+
+        return [None, []]
+
+    def jump(self, opcode, label, *operands):
+        """
+        Adds an instruction whose last operand is the index of a label
+        Params
+        ======
+        opcode   (int)   = The opcode
+        label    (list)  = The label jumped to
+        operands (tuple) = The operands before the jump target
+        """
+
+        self.emit(opcode, *operands, -1 if label[0] is None else label[0])
+
+        if label[0] is None:
+            label[1].append(len(self.code) - 1)
+
+    def place(self, label):
+        """
+        Places a label at the next instruction
+        Params
+        ======
+        label (list) = The label
+        """
+
+        label[0] = len(self.code)
+
+        for operand in label[1]:
+            self.code[operand] = label[0]
+
+    def function(self, name, params, locals):
+        """
+        Starts a function at the next instruction
+        Params
+        ======
+        name   (int)  = Symbol id of the name of the function
+        params (list) = Symbol ids of the parameters
+        locals (list) = Symbol ids of the other variables declared in the function
+        Returns
+        =======
+        int: Index of the function
+        """
+
+        scope = {}
+        for symbol in params + locals:
+            scope.setdefault(symbol, len(scope))
+        self.scopes.append(scope)
+
+        self.functions.append(Function(name, len(self.code), len(params), len(scope)))
+        return len(self.functions) - 1
+
+    def bytecode(self):
+        """
+        Ends the program
+        Returns
+        =======
+        Bytecode: The compiled program
+        """
+
+        self.emit(HALT)
+
+        return Bytecode(self.code, self.consts, self.functions, self.lines, len(self.globals))
@@ -1,6 +1,15 @@
 # Library to exit code when error occurs
 import sys
 
+# Standard library to memory map files
+import mmap
+
+# Standard library for compact arrays of basic values
+from array import array
+
+# Characters which make up numeric constants, '.' is included for the decimal point
+DIGITS = frozenset("0123456789.")
+
 
 def error(msg, line_num):
     """
@@ -28,7 +37,7 @@ def is_digit(char):
           standard isdigit function
     """
 
-    return char in ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "."]
+    return char in DIGITS
 
 
 def is_alpha(char):
@@ -58,8 +67,75 @@ def is_alnum(char):
           isalpha function, and '.' is not considered a digit by the standard isdigit function
     """
 
-    return (
-        char.isalpha()
-        or char == "_"
-        or char in ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "."]
-    )
+    return char.isalpha() or char == "_" or char in DIGITS
+
+
+def map_file(file):
+    """
+    Memory maps an open file for reading
+    Params
+    ======
+    file (file) = File opened in binary read mode
+    Returns
+    =======
+    mmap/bytes: Read only memory map of the file contents, empty bytes for an empty file
+    """
+
+    try:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files cannot be memory mapped
+        return b""
+
+
+def pack_strings(strings):
+    """
+    Serializes a list of strings into bytes
+    Params
+    ======
+    strings (list) = The strings to be serialized
+    Returns
+    =======
+    bytes: Number of strings, the utf-8 length of every string and the utf-8 encoded strings
+    """
+
+    encoded = [string.encode("utf-8") for string in strings]
+    lengths = array("I", [len(string) for string in encoded])
+    if sys.byteorder == "big":
+        lengths.byteswap()
+
+    return len(encoded).to_bytes(4, "little") + lengths.tobytes() + b"".join(encoded)
+
+
+def unpack_strings(data, offset=0):
+    """
+    Deserializes a list of strings serialized by pack_strings
+    Params
+    ======
+    data   (bytes) = Bytes containing the serialized strings
+    offset (int)   = Index of the serialized strings in data
+    Returns
+    =======
+    list: The strings
+    int: Index of the first byte after the serialized strings, ValueError is raised if data ends
+         before them
+    """
+
+    count = int.from_bytes(data[offset : offset + 4], "little")
+    offset += 4
+
+    lengths = array("I")
+    lengths.frombytes(data[offset : offset + 4 * count])
+    if sys.byteorder == "big":
+        lengths.byteswap()
+    offset += 4 * count
+
+    strings = []
+    for length in lengths:
+        strings.append(str(data[offset : offset + length], "utf-8"))
+        offset += length
+
+    if offset > len(data):
+        raise ValueError("Truncated strings")
+
+    return strings, offset
@@ -0,0 +1,244 @@
+# Standard library for binary search in sorted lists
+from bisect import bisect_right
+
+# Import Token class
+from token_class import Token
+
+# Shift of the tokens and snapshots which are stored as they are
+NO_SHIFT = (0, 0, 0)
+
+
+class IncrementalSource:
+    """
+    IncrementalSource class holds source code with its tokens and the scanner state at every line
+    break, for re-scanning only the lines around an edit. The tokens and snapshots are stored with
+    the positions they had when they were scanned, and split into segments which are moved by a
+    shift when they are read, so that an edit neither copies nor changes the tokens after it
+    """
+
+    # Most segments kept, beyond it the smallest segment is merged into the one before it
+    MAX_SEGMENTS = 64
+
+    def __init__(self, source_code, tokens, snapshots):
+        """
+        Initializer of IncrementalSource class
+        Params
+        ======
+        source_code (str)  = Pulse source code
+        tokens      (list) = The tokens of the source code
+        snapshots   (list) = (offset, token index, line_num, isIndent, indentLevel) of every line break
+        Values
+        ======
+        source_code     (str)  = Pulse source code
+        tokens          (list) = The tokens as they were scanned
+        snapshots       (list) = The snapshots as they were scanned
+        token_starts    (list) = Index of the first token of every segment
+        snapshot_starts (list) = Index of the first snapshot of every segment
+        shifts          (list) = (offset, line_num, token index) added to the tokens and snapshots of
+                                 every segment when they are read
+        """
+
+        self.source_code = source_code
+        self.tokens = tokens
+        self.snapshots = snapshots
+        self.token_starts = [0]
+        self.snapshot_starts = [0]
+        self.shifts = [NO_SHIFT]
+
+    def shifted_token(self, token, shift):
+        """
+        Returns a copy of a token moved by a shift, tokens are never changed in place since the
+        caller may still hold them
+        Params
+        ======
+        token (Token) = The token
+        shift (tuple) = (offset, line_num, token index) added to the token
+        Returns
+        =======
+        Token: The moved token
+        """
+
+        if shift == NO_SHIFT:
+            return token
+
+        return Token(
+            token.type,
+            token.val,
+            token.line_num + shift[1],
+            token.start + shift[0],
+            token.end + shift[0],
+        )
+
+    def shifted_snapshot(self, snapshot, shift):
+        """
+        Returns a snapshot moved by a shift
+        Params
+        ======
+        snapshot (tuple) = The snapshot
+        shift    (tuple) = (offset, line_num, token index) added to the snapshot
+        Returns
+        =======
+        tuple: The moved snapshot
+        """
+
+        offset, index, line_num, isIndent, indentLevel = snapshot
+        return (offset + shift[0], index + shift[2], line_num + shift[1], isIndent, indentLevel)
+
+    def snapshot(self, k):
+        """
+        Returns a snapshot as it is in the current source code
+        Params
+        ======
+        k (int) = Index of the snapshot
+        Returns
+        =======
+        tuple: (offset, token index, line_num, isIndent, indentLevel) of the line break
+        """
+
+        shift = self.shifts[bisect_right(self.snapshot_starts, k) - 1]
+        return self.shifted_snapshot(self.snapshots[k], shift)
+
+    def find(self, offset):
+        """
+        Returns the index of the first snapshot at or after an offset
+        Params
+        ======
+        offset (int) = Offset in the current source code
+        Returns
+        =======
+        int: Index of the snapshot, the number of snapshots if every line break is before the offset
+        """
+
+        low, high = 0, len(self.snapshots)
+        while low < high:
+            middle = (low + high) // 2
+            if self.snapshot(middle)[0] < offset:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def replace(self, first, last, start, stop, tokens, snapshots, offset_shift, line_shift):
+        """
+        Replaces the tokens and snapshots of re-scanned lines, the ones after them are moved by the
+        change of the source code without being touched
+        Params
+        ======
+        first        (int)   = Index of the first replaced snapshot
+        last         (int)   = Index after the last replaced snapshot
+        start        (int)   = Index of the first replaced token
+        stop         (int)   = Index after the last replaced token, the token index of snapshot last
+        tokens       (list)  = The new tokens
+        snapshots    (list)  = The new snapshots, with the token indices they have after the change
+        offset_shift (int)   = Change of the offsets after the replaced lines
+        line_shift   (int)   = Change of the line numbers after the replaced lines
+        """
+
+        token_shift = len(tokens) - (stop - start)
+        snapshot_shift = len(snapshots) - (last - first)
+
+        # Segments up to the replaced lines stay, the replaced lines are stored as they are
+        m = bisect_right(self.token_starts, start) - 1
+        token_starts = self.token_starts[: m + 1] + [start]
+        snapshot_starts = self.snapshot_starts[: m + 1] + [first]
+        shifts = self.shifts[: m + 1] + [NO_SHIFT]
+
+        # Segments after the replaced lines are moved, starting with the one the lines end in
+        if stop < len(self.tokens):
+            n = bisect_right(self.token_starts, stop) - 1
+            token_starts.append(stop)
+            snapshot_starts.append(last)
+            shifts.append(self.shifts[n])
+            token_starts.extend(self.token_starts[n + 1 :])
+            snapshot_starts.extend(self.snapshot_starts[n + 1 :])
+            shifts.extend(self.shifts[n + 1 :])
+
+            for i in range(m + 2, len(shifts)):
+                offset, line_num, index = shifts[i]
+                token_starts[i] += token_shift
+                snapshot_starts[i] += snapshot_shift
+                shifts[i] = (offset + offset_shift, line_num + line_shift, index + token_shift)
+
+        self.tokens[start:stop] = tokens
+        self.snapshots[first:last] = snapshots
+
+        # Empty segments and segments moved like the one before them are left out
+        self.token_starts, self.snapshot_starts, self.shifts = [], [], []
+        ends = token_starts[1:] + [len(self.tokens)]
+        for i in range(len(shifts)):
+            if token_starts[i] == ends[i] or (self.shifts and shifts[i] == self.shifts[-1]):
+                continue
+            self.token_starts.append(token_starts[i])
+            self.snapshot_starts.append(snapshot_starts[i])
+            self.shifts.append(shifts[i])
+
+        if not self.shifts:
+            self.token_starts, self.snapshot_starts, self.shifts = [0], [0], [NO_SHIFT]
+
+        while len(self.shifts) > self.MAX_SEGMENTS:
+            self.merge()
+
+    def merge(self):
+        """
+        Merges the segment with the fewest tokens into the one before it, its tokens and snapshots
+        are replaced by copies moved to the shift of that segment
+        """
+
+        ends = self.token_starts[2:] + [len(self.tokens)]
+        m = min(range(1, len(self.shifts)), key=lambda m: ends[m - 1] - self.token_starts[m])
+
+        old, new = self.shifts[m], self.shifts[m - 1]
+        shift = tuple(a - b for a, b in zip(old, new))
+
+        start, stop = self.token_starts[m], ends[m - 1]
+        first = self.snapshot_starts[m]
+        last = self.snapshot_starts[m + 1] if m + 1 < len(self.shifts) else len(self.snapshots)
+
+        self.tokens[start:stop] = [
+            self.shifted_token(token, shift) for token in self.tokens[start:stop]
+        ]
+        self.snapshots[first:last] = [
+            self.shifted_snapshot(snapshot, shift) for snapshot in self.snapshots[first:last]
+        ]
+
+        del self.token_starts[m], self.snapshot_starts[m], self.shifts[m]
+
+    def __len__(self):
+        """
+        Returns
+        =======
+        int: The number of tokens
+        """
+
+        return len(self.tokens)
+
+    def __getitem__(self, index):
+        """
+        Returns a token as it is in the current source code
+        Params
+        ======
+        index (int) = Index of the token, negative indices count from the end
+        Returns
+        =======
+        Token: The token
+        """
+
+        if index < 0:
+            index += len(self.tokens)
+
+        shift = self.shifts[bisect_right(self.token_starts, index) - 1]
+        return self.shifted_token(self.tokens[index], shift)
+
+    def __iter__(self):
+        """
+        Returns
+        =======
+        iterator: The tokens as they are in the current source code
+        """
+
+        ends = self.token_starts[1:] + [len(self.tokens)]
+
+        for start, stop, shift in zip(self.token_starts, ends, self.shifts):
+            for index in range(start, stop):
+                yield self.shifted_token(self.tokens[index], shift)
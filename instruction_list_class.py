@@ -0,0 +1,174 @@
+# Standard library for compact arrays of basic values
+from array import array
+
+# Import the classes of compiled programs
+from bytecode_class import Bytecode, Function
+
+# Import the instruction set
+from opcode_spec import JUMPS, SIZES
+
+
+class InstructionList:
+    """
+    InstructionList class holds the instructions of a program as one list per instruction, so that
+    instructions can be replaced and removed, jump targets and function entries are instruction
+    positions instead of code indices
+    """
+
+    def __init__(self, bytecode):
+        """
+        Initializer of InstructionList class, decodes a program
+        Params
+        ======
+        bytecode (Bytecode) = The compiled program
+        Values
+        ======
+        instructions (list) = [opcode, operands...] of every instruction
+        lines        (list) = Line number of every instruction
+        entries      (list) = Position of the first instruction of every function
+        consts       (list) = The constants, constants made by optimizations are added at the end
+        const_index  (dict) = Index of every constant by type and text, built on first use
+        globals      (int)  = Number of global variables
+        functions    (list) = The Function of every function instruction
+        """
+
+        self.instructions = []
+        self.lines = []
+        self.consts = list(bytecode.consts)
+        self.const_index = None
+        self.globals = bytecode.globals
+        self.functions = bytecode.functions
+
+        # Position of the instruction at every code index
+        positions = {}
+        line_num = 0
+        next_line = 0
+        for pc, opcode, operands in bytecode.instructions():
+            positions[pc] = len(self.instructions)
+            self.instructions.append([opcode] + list(operands))
+
+            # The line pairs are sorted by code index, so they are walked along with the code
+            while next_line < len(bytecode.lines) and bytecode.lines[next_line] <= pc:
+                line_num = bytecode.lines[next_line + 1]
+                next_line += 2
+            self.lines.append(line_num)
+
+        for instruction in self.instructions:
+            if instruction[0] in JUMPS:
+                instruction[-1] = positions[instruction[-1]]
+
+        self.entries = [positions[function.entry] for function in bytecode.functions]
+
+    def targets(self):
+        """
+        Returns
+        =======
+        set: Positions of the instructions which are jumped to or start a function, code may run
+             into them from elsewhere
+        """
+
+        targets = set(self.entries)
+        for instruction in self.instructions:
+            if instruction[0] in JUMPS:
+                targets.add(instruction[-1])
+
+        return targets
+
+    def remove(self, removed):
+        """
+        Removes instructions, jumps to a removed instruction go to the next instruction which is kept
+        Params
+        ======
+        removed (list) = Whether every instruction is removed
+        Returns
+        =======
+        int: Number of removed instructions
+        """
+
+        # New position of every instruction, and of the end of the list
+        positions = []
+        count = 0
+        for flag in removed:
+            positions.append(count)
+            count += not flag
+        positions.append(count)
+
+        self.instructions = [
+            instruction for instruction, flag in zip(self.instructions, removed) if not flag
+        ]
+        self.lines = [line for line, flag in zip(self.lines, removed) if not flag]
+
+        for instruction in self.instructions:
+            if instruction[0] in JUMPS:
+                instruction[-1] = positions[instruction[-1]]
+        self.entries = [positions[entry] for entry in self.entries]
+
+        return len(removed) - count
+
+    def constant(self, value):
+        """
+        Returns the index of a constant made by an optimization, identical constants share an index
+        Params
+        ======
+        value (object) = Value of the constant
+        Returns
+        =======
+        int: Index of the constant in consts
+        """
+
+        if self.const_index is None:
+            # Keyed by type and text, so that 1, 1.0 and true, and 0.0 and -0.0, stay different
+            self.const_index = {}
+            for index in range(len(self.consts) - 1, -1, -1):
+                self.const_index[(type(self.consts[index]), repr(self.consts[index]))] = index
+
+        key = (type(value), repr(value))
+        index = self.const_index.get(key)
+        if index is None:
+            index = self.const_index[key] = len(self.consts)
+            self.consts.append(value)
+
+        return index
+
+    def __len__(self):
+        """
+        Returns
+        =======
+        int: Number of instructions
+        """
+
+        return len(self.instructions)
+
+    def bytecode(self):
+        """
+        Encodes the instructions
+        Returns
+        =======
+        Bytecode: The program
+        """
+
+        # Code index of every instruction
+        pcs = []
+        pc = 0
+        for instruction in self.instructions:
+            pcs.append(pc)
+            pc += SIZES[instruction[0]]
+        pcs.append(pc)
+
+        code = array("i")
+        lines = array("i")
+        for instruction, pc, line_num in zip(self.instructions, pcs, self.lines):
+            if instruction[0] in JUMPS:
+                instruction = instruction[:-1] + [pcs[instruction[-1]]]
+            code.extend(instruction)
+
+            if not lines or lines[-1] != line_num:
+                lines.append(pc)
+                lines.append(line_num)
+
+        functions = [
+            Function(function.name, pcs[entry], function.params, function.locals)
+            for function, entry in zip(self.functions, self.entries)
+        ]
+
+        return Bytecode(code, self.consts, functions, lines, self.globals)
@@ -0,0 +1,132 @@
+# Standard library for compact arrays of basic values
+from array import array
+
+# Standard library for binary search in sorted lists
+from bisect import bisect_right
+
+
+class LineIndex:
+    """
+    LineIndex class maps offsets in source code to line and column numbers, using the offsets where
+    lines start which are found in one pass over the source code. Columns count characters, a byte
+    of utf-8 encoded source code which is not valid utf-8 counts as one character
+    """
+
+    def __init__(self, source_code):
+        """
+        Initializer of LineIndex class
+        Params
+        ======
+        source_code (str/bytes) = Pulse source code, either as a string or as utf-8 encoded bytes (any
+                                  bytes like object, such as a memory mapped file)
+        Values
+        ======
+        source_code (str/bytes) = The source code, needed to count characters in utf-8 encoded lines
+        starts      (array)     = Offset of the first character of every line
+        """
+
+        self.source_code = source_code
+        self.starts = array("q", [0])
+
+        newline = "\n" if isinstance(source_code, str) else b"\n"
+
+        # Every line break starts a new line right after it
+        i = source_code.find(newline)
+        while i != -1:
+            self.starts.append(i + 1)
+            i = source_code.find(newline, i + 1)
+
+    def __len__(self):
+        """
+        Returns
+        =======
+        int: The number of lines, a line break at the end starts one more (empty) line
+        """
+
+        return len(self.starts)
+
+    def line(self, offset):
+        """
+        Returns the line of an offset
+        Params
+        ======
+        offset (int) = Offset in the source code, such as the start of a token
+        Returns
+        =======
+        int: The line number, starting at 1
+        """
+
+        return bisect_right(self.starts, offset)
+
+    def position(self, offset):
+        """
+        Returns the line and column of an offset, lines are counted by line breaks so a token after a
+        string or comment spanning several lines can be on a later line than its line_num says
+        Params
+        ======
+        offset (int) = Offset in the source code, such as the start of a token
+        Returns
+        =======
+        tuple: (line, column), both starting at 1, the column counts characters even in utf-8 encoded
+               source code
+        """
+
+        line = bisect_right(self.starts, offset)
+        return line, self.column(self.source_code, self.starts[line - 1], offset)
+
+    def range(self, token):
+        """
+        Returns the source range of a token
+        Params
+        ======
+        token (Token) = A token scanned from the source code of this index
+        Returns
+        =======
+        tuple: ((line, column) of the start, (line, column) of the end) of the token's lexeme
+        """
+
+        return self.position(token.start), self.position(token.end)
+
+    @staticmethod
+    def column(source_code, start, offset):
+        """
+        Returns the column of an offset, without an index of the whole source code, for example for
+        the diagnostics of a scanner which only knows where the current line starts
+        Params
+        ======
+        source_code (str/bytes) = Pulse source code or a chunk of it
+        start       (int)       = Offset of the first character of the line of the offset
+        offset      (int)       = Offset in the source code
+        Returns
+        =======
+        int: The column, starting at 1
+        """
+
+        if isinstance(source_code, str):
+            return offset - start + 1
+
+        # Count the characters of the line, not its bytes, keeping invalid bytes as one character each
+        text = bytes(source_code[start:offset]).decode("utf-8", "surrogateescape")
+        return len(text) + 1
+
+    def offset(self, line, column):
+        """
+        Returns the offset of a line and column, for example of a position given by an editor
+        Params
+        ======
+        line   (int) = Line number, starting at 1
+        column (int) = Column, starting at 1
+        Returns
+        =======
+        int: The offset in the source code
+        """
+
+        start = self.starts[line - 1]
+
+        if isinstance(self.source_code, str):
+            return start + column - 1
+
+        # Walk the characters of the line to find the byte offset of the column
+        end = self.starts[line] if line < len(self.starts) else len(self.source_code)
+        text = bytes(self.source_code[start:end]).decode("utf-8", "surrogateescape")
+        return start + len(text[: column - 1].encode("utf-8", "surrogateescape"))
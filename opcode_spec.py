@@ -0,0 +1,160 @@
+# Standard library for the functions of the operators
+import operator
+
+# Instructions of the pulse virtual machine and the number of operands following each opcode
+#   halt                 : stop the program
+#   load_const k         : push constant k, constants are numbered by symbol id
+#   load_local s         : push local variable s, at the top level the locals are the globals
+#   store_local s        : pop into local variable s
+#   load_global s        : push global variable s
+#   store_global s       : pop into global variable s
+#   pop                  : pop and forget
+#   dup_two              : push the two topmost values again
+#   binary f             : pop b and a, push BINARY_FUNCTIONS[f](a, b)
+#   unary f              : pop a, push UNARY_FUNCTIONS[f](a)
+#   jump t               : continue at t
+#   jump_if_false t      : pop, continue at t if it is false
+#   jump_if_true t       : pop, continue at t if it is true
+#   jump_if_false_or_pop : continue at t keeping the top if it is false, else pop it ('and')
+#   jump_if_true_or_pop  : continue at t keeping the top if it is true, else pop it ('or')
+#   build_list n         : pop n values, push a list of them
+#   load_index           : pop index and list, push the element
+#   store_index          : pop value, index and list, store the element
+#   call n               : pop n arguments and a function, call it
+#   return               : return from a function, its call pushes nil
+#   function i           : push function i
+#   print n              : pop n values and print them
+#   input n              : pop n prompt values, print them and push a line read from the input
+# Superinstructions, doing the work of common sequences in one dispatch
+#   branch_local_const f s k t : continue at t unless BINARY_FUNCTIONS[f](local s, constant k)
+#   branch_locals f a b t      : continue at t unless BINARY_FUNCTIONS[f](local a, local b)
+#   binary_local_const f s k   : push BINARY_FUNCTIONS[f](local s, constant k)
+#   binary_locals f a b        : push BINARY_FUNCTIONS[f](local a, local b)
+#   add_local_const s k        : add constant k to local s
+OPCODES = [
+    ("halt", 0),
+    ("load_const", 1),
+    ("load_local", 1),
+    ("store_local", 1),
+    ("load_global", 1),
+    ("store_global", 1),
+    ("pop", 0),
+    ("dup_two", 0),
+    ("binary", 1),
+    ("unary", 1),
+    ("jump", 1),
+    ("jump_if_false", 1),
+    ("jump_if_true", 1),
+    ("jump_if_false_or_pop", 1),
+    ("jump_if_true_or_pop", 1),
+    ("build_list", 1),
+    ("load_index", 0),
+    ("store_index", 0),
+    ("call", 1),
+    ("return", 0),
+    ("function", 1),
+    ("print", 1),
+    ("input", 1),
+    ("branch_local_const", 4),
+    ("branch_locals", 4),
+    ("binary_local_const", 3),
+    ("binary_locals", 3),
+    ("add_local_const", 2),
+]
+
+# Opcode of every instruction, the position of an instruction in OPCODES
+(
+    HALT,
+    LOAD_CONST,
+    LOAD_LOCAL,
+    STORE_LOCAL,
+    LOAD_GLOBAL,
+    STORE_GLOBAL,
+    POP,
+    DUP_TWO,
+    BINARY,
+    UNARY,
+    JUMP,
+    JUMP_IF_FALSE,
+    JUMP_IF_TRUE,
+    JUMP_IF_FALSE_OR_POP,
+    JUMP_IF_TRUE_OR_POP,
+    BUILD_LIST,
+    LOAD_INDEX,
+    STORE_INDEX,
+    CALL,
+    RETURN,
+    FUNCTION,
+    PRINT,
+    INPUT,
+    BRANCH_LOCAL_CONST,
+    BRANCH_LOCALS,
+    BINARY_LOCAL_CONST,
+    BINARY_LOCALS,
+    ADD_LOCAL_CONST,
+) = range(len(OPCODES))
+
+# Name and size (opcode and operands) of every instruction
+OPCODE_NAMES = [name for name, _ in OPCODES]
+SIZES = [1 + operands for _, operands in OPCODES]
+
+# Instructions whose last operand is a jump target
+JUMPS = frozenset(
+    [
+        JUMP,
+        JUMP_IF_FALSE,
+        JUMP_IF_TRUE,
+        JUMP_IF_FALSE_OR_POP,
+        JUMP_IF_TRUE_OR_POP,
+        BRANCH_LOCAL_CONST,
+        BRANCH_LOCALS,
+    ]
+)
+
+# Binary operators by token type, the operand of binary instructions is the position in this list
+BINARY_OPERATORS = [
+    ("plus", operator.add),
+    ("minus", operator.sub),
+    ("multiply", operator.mul),
+    ("divide", operator.truediv),
+    ("integer_divide", operator.floordiv),
+    ("modulus", operator.mod),
+    ("equal", operator.eq),
+    ("not_equal", operator.ne),
+    ("less_than", operator.lt),
+    ("less_than_equal", operator.le),
+    ("greater_than", operator.gt),
+    ("greater_than_equal", operator.ge),
+]
+
+# Unary operators by token type, the operand of unary instructions is the position in this list
+UNARY_OPERATORS = [
+    ("minus", operator.neg),
+    ("plus", operator.pos),
+    ("not", operator.not_),
+]
+
+BINARY_FUNCTIONS = [function for _, function in BINARY_OPERATORS]
+BINARY_CODES = {type: code for code, (type, _) in enumerate(BINARY_OPERATORS)}
+UNARY_FUNCTIONS = [function for _, function in UNARY_OPERATORS]
+UNARY_CODES = {type: code for code, (type, _) in enumerate(UNARY_OPERATORS)}
+
+# Binary operator of every augmented assignment
+AUGMENTED_OPERATORS = {
+    "plus_equal": "plus",
+    "minus_equal": "minus",
+    "multiply_equal": "multiply",
+    "divide_equal": "divide",
+    "modulus_equal": "modulus",
+}
+
+# Comparisons, which are fused with the conditional jump consuming them, and the comparison of the
+# swapped operands
+COMPARISONS = {
+    "equal": "equal",
+    "not_equal": "not_equal",
+    "less_than": "greater_than",
+    "less_than_equal": "greater_than_equal",
+    "greater_than": "less_than",
+    "greater_than_equal": "less_than_equal",
+}
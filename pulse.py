@@ -1,33 +1,77 @@
 # The module for system-specific parameters and functions
 import sys
 
+# Standard library to parse command line arguments
+import argparse
+
+# Standard library for operating system dependent functionality
+import os
+
+# Import some helper functions
+from global_helpers import map_file
+
 # Import SymbolTable class
 from symbol_table_class import SymbolTable
 
 # Import scanner
-from pulse_scanner import scanner
+from pulse_scanner import ENGINES, iter_tokens, scanner
+
+# Import batch scanning of many files
+from pulse_batch import scan_files
 
+# Import TokenCache class
+from token_cache_class import TokenCache
 
-def readFile(path):
+# Import ScanStats class
+from scan_stats_class import ScanStats
+
+# Import TokenWriter class
+from token_writer_class import TokenWriter
+
+
+def openFile(path, mode="r"):
     """
-    Reads a file and returns the contents as a string
+    Opens a file for reading and exits if it cannot be opened
 
     Params
     ======
     path (string) : Path to file which is to be read
+    mode (string) : Mode in which the file is opened ("r" or "rb")
 
     Returns
     =======
-    buffer (string) : Contents of the file
+    file (file) : The file opened in read mode
     """
     try:
         # open the file in read mode
-        file = open(path, "r")
+        return open(path, mode)
     except:
         # if file cannot be opened
         sys.stderr.write("Could not open %s" % (path))
         exit(74)
 
+
+def readFile(path, mapped=False):
+    """
+    Reads a file and returns the contents as a string
+
+    Params
+    ======
+    path   (string) : Path to file which is to be read
+    mapped (bool)   : Whether to memory map the file instead, the scanner then works on the raw utf-8
+                      bytes which the OS pages in lazily (no decoding, no EOF token and line endings
+                      are not translated)
+
+    Returns
+    =======
+    buffer (string/mmap) : Contents of the file
+    """
+    if mapped:
+        with openFile(path, "rb") as file:
+            return map_file(file)
+
+    file = openFile(path)
+
     # reading the file
     if file.mode == "r":
         buffer = file.read()
@@ -39,21 +83,186 @@ def readFile(path):
     return buffer
 
 
-# Read file path from command line
-file_path = sys.argv[1]
+def build_parser():
+    """
+    Builds the parser of the command line arguments
+
+    Returns
+    =======
+    parser (ArgumentParser) : The parser of the options of a scan
+    """
+
+    # File paths and options of a scan
+    parser = argparse.ArgumentParser(description="Lexical analyzer of the pulse language")
+    parser.add_argument(
+        "files", nargs="+", help="paths to pulse source files or directories"
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="scan the memory mapped bytes of the files instead of streaming their text",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["auto"] + sorted(ENGINES),
+        help="scanning engine of a single file, read whole instead of streamed "
+        "(auto picks one by file size and cores)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes used for many files (default: one per core)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="DIR",
+        help="directory caching the tokens of scanned files, unchanged files are not scanned again",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=256,
+        metavar="MB",
+        help="size limit of the cache directory in megabytes (default: 256)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report token counts, sub-lexer timings and symbol table counts on stderr",
+    )
+    parser.add_argument(
+        "--format",
+        choices=TokenWriter.FORMATS,
+        default="text",
+        help="output format of the tokens (default: text)",
+    )
+    parser.add_argument(
+        "--symbols",
+        action="store_true",
+        help="write the symbol table after the tokens",
+    )
+    parser.add_argument(
+        "-k",
+        "--keep-going",
+        action="store_true",
+        help="report every error on stderr and go on scanning instead of exiting on the first one",
+    )
+
+    return parser
+
+
+def run(args, out, err):
+    """
+    Scans the pulse source files of parsed command line arguments
+
+    Params
+    ======
+    args (Namespace) : The parsed command line arguments
+    out  (file)      : Binary stream receiving the tokens, for example sys.stdout.buffer
+    err  (file)      : Text stream receiving statistics and errors, for example sys.stderr
+
+    Returns
+    =======
+    status (int) : The exit status of the scan
+    """
+
+    # Create symbol table
+    table = SymbolTable()
+
+    cache = TokenCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+
+    # Statistics are printed once the scan is complete
+    stats = ScanStats(hooks=[lambda stats: print(stats, file=err)]) if args.stats else None
+
+    # Tokens are written in large batches through one buffered writer
+    writer = TokenWriter(out, args.format)
+
+    # Errors of every file, collected only when scanning goes on past them
+    diagnostics = [] if args.keep_going else None
+
+    if cache or len(args.files) > 1 or os.path.isdir(args.files[0]):
+        # Scan all files in parallel, their tokens share one symbol table
+        for path, result in scan_files(
+            args.files, table, args.jobs, args.mmap, cache, stats, args.keep_going
+        ):
+            writer.write(result.tokens)
+            if diagnostics is not None:
+                diagnostics.extend((path, diagnostic) for diagnostic in result.diagnostics)
+    else:
+        path = args.files[0]
+        errors = [] if args.keep_going else None
+
+        if args.engine:
+            # Scan the whole file with the chosen engine
+            writer.write(
+                scanner(
+                    readFile(path, mapped=args.mmap),
+                    table,
+                    stats,
+                    errors,
+                    workers=args.jobs,
+                    engine=args.engine,
+                )
+            )
+        elif args.mmap:
+            # Scan the raw bytes of the memory mapped file
+            writer.write(scanner(readFile(path, mapped=True), table, stats, errors))
+        else:
+            # Stream the source code through the lexical analyzer, tokens are written as soon as a batch is scanned
+            with openFile(path) as file:
+                writer.write(iter_tokens(file, table, stats=stats, diagnostics=errors))
+
+        if errors:
+            diagnostics.extend((path, diagnostic) for diagnostic in errors)
+
+    if args.symbols:
+        writer.write_symbols(table)
+
+    writer.flush()
+
+    # Report the collected errors in red, like the scanner does when it exits on an error
+    if diagnostics:
+        for path, diagnostic in diagnostics:
+            print("\033[91m%s: %s\033[0m" % (path, diagnostic), file=err)
+        return 65
+
+    return 0
+
+
+def main():
+    """
+    Scans the pulse source files given on the command line and prints their tokens, or runs a
+    program with pulse.py run
+    """
+
+    # The scan daemon is imported only when it is started, it builds on this module
+    if sys.argv[1:2] == ["serve"]:
+        from pulse_server import serve_main
+
+        serve_main(sys.argv[2:])
+        return
+
+    # Programs are compiled to bytecode and run by the virtual machine
+    if sys.argv[1:2] == ["run"]:
+        from pulse_vm import run_main
+
+        run_main(sys.argv[2:])
+        return
 
-# Get the source code form code file
-source_code = readFile(file_path)
+    # Read file paths and options from command line
+    parser = build_parser()
+    args = parser.parse_args()
 
-# Create symbol table
-table = SymbolTable()
+    if args.keep_going and args.engine == "reference":
+        parser.error("the reference engine exits on the first error, it cannot be used with -k")
 
-# Pass source code to lexical analyzer
-tokens = scanner(source_code, table)
+    status = run(args, sys.stdout.buffer, sys.stderr)
 
-for token in tokens:
-    print(token)
+    if status:
+        sys.exit(status)
 
-# TODO: Pass tokens into parser and compiler
 
-# TODO: Pass bytecode into VM for execution
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# Standard library for asynchronous input and output
+import asyncio
+
+# Standard library to decode binary streams incrementally
+import codecs
+
+# Standard library for partial function application
+from functools import partial
+
+# Import Scanner class
+from scanner_class import Scanner
+
+# Import scanner
+from pulse_scanner import CHUNK_SIZE, close_indentation, scan_tokens
+
+# Import batch scanning, which scans with a symbol table of its own and merges it afterwards
+from pulse_batch import merge_symbols, scan_source
+
+# Size in characters (or bytes) above which scan_document scans in the executor instead of the event loop
+OFFLOAD_SIZE = CHUNK_SIZE
+
+
+def scan_chunk(buffer, table, scanner_obj, final):
+    """
+    Scans a chunk of source code at once, between two awaits of the event loop
+    Params
+    ======
+    buffer      (str)
+        : The unscanned source code read so far
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    scanner_obj (Scanner)
+        : Instance of Scanner class holding the lexer state, which is carried across chunks
+    final       (bool)
+        : Whether the source code ends at the end of the buffer
+    Returns
+    =======
+    (list)
+        : The tokens which are complete
+    (int)
+        : The index in the buffer where scanning stopped
+    """
+
+    tokens = []
+    generator = scan_tokens(buffer, 0, table, scanner_obj, final)
+
+    while True:
+        try:
+            tokens.append(next(generator))
+        except StopIteration as stop:
+            return tokens, stop.value
+
+
+async def read_chunk(source, chunk_size):
+    """
+    Reads the next chunk of an asynchronous source
+    Params
+    ======
+    source     (StreamReader/async iterator)
+        : An object with a read coroutine, such as asyncio.StreamReader, or an asynchronous iterator of
+          bytes or strings
+    chunk_size (int)
+        : Number of bytes read at once from a source with a read coroutine
+    Returns
+    =======
+    (bytes/str)
+        : The chunk, empty at the end of the source
+    """
+
+    if hasattr(source, "read"):
+        return await source.read(chunk_size)
+
+    try:
+        return await source.__anext__()
+    except StopAsyncIteration:
+        return b""
+
+
+async def aiter_tokens(
+    source,
+    table,
+    chunk_size=CHUNK_SIZE,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+):
+    """
+    Generate tokens from an asynchronous source while it is being read, the event loop runs other
+    tasks between chunks so that many sources can be scanned concurrently
+    Params
+    ======
+    source      (StreamReader/async iterable)
+        : An object with a read coroutine, such as asyncio.StreamReader, or an asynchronous iterable
+          of bytes (utf-8 encoded) or strings
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    chunk_size  (int) (Optional)
+        : Number of bytes read at once, which bounds the time the event loop is blocked by scanning
+    diagnostics (list) (Optional)
+        : List receiving the errors in the source code, when given the scanner skips past errors
+          instead of exiting
+    spans       (bool) (Optional)
+        : Whether comment tokens get a Span of the chunk holding them as value instead of a copy of
+          their text
+    comments    (bool) (Optional)
+        : Whether comment tokens are generated
+    newlines    (bool) (Optional)
+        : Whether newline tokens are generated
+    Yields
+    ======
+    (Token)
+        : The tokens of the source code as soon as they are complete
+    """
+
+    if not hasattr(source, "read"):
+        source = source.__aiter__()
+
+    # Bytes are decoded chunk by chunk, keeping split utf-8 sequences for the next chunk
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    # Create scanner_obj class' object
+    scanner_obj = Scanner()
+    scanner_obj.diagnostics = diagnostics
+    scanner_obj.spans = spans
+    scanner_obj.comments = comments
+    scanner_obj.newlines = newlines
+
+    # Unscanned tail of the previous chunk, which holds an incomplete lexeme, and the chunks read
+    # since it was last scanned
+    buffer = ""
+    i = 0
+    pending = []
+    pending_size = 0
+
+    while True:
+        chunk = await read_chunk(source, chunk_size)
+        final = not chunk
+
+        if not isinstance(chunk, str):
+            chunk = decoder.decode(chunk, final)
+
+        # An incomplete lexeme is scanned again only once the text read after it is as long as it,
+        # so that a long string or comment is not scanned from its start for every chunk
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if not final and pending_size < len(buffer) - i:
+            continue
+
+        # Move the offset of the buffer past the scanned characters, keeping track of the last line
+        # break for the columns of diagnostics
+        line_break = buffer.rfind("\n", 0, i)
+        if line_break != -1:
+            scanner_obj.line_start = scanner_obj.offset + line_break + 1
+        scanner_obj.offset += i
+
+        buffer = buffer[i:] + "".join(pending)
+        pending = []
+        pending_size = 0
+        tokens, i = scan_chunk(buffer, table, scanner_obj, final)
+
+        for token in tokens:
+            yield token
+
+        if final or scanner_obj.isEnd:
+            break
+
+        # A source with data ready returns without suspending, so give other tasks their turn
+        await asyncio.sleep(0)
+
+    for token in close_indentation(scanner_obj, scanner_obj.offset + len(buffer)):
+        yield token
+
+
+async def scan_document(source_code, table, executor=None, offload_size=OFFLOAD_SIZE):
+    """
+    Scans a whole document without blocking the event loop, large documents are scanned in an
+    executor with a symbol table of their own which is merged into the table afterwards
+    Params
+    ======
+    source_code  (str/bytes)
+        : Pulse source code, either as a string or as utf-8 encoded bytes
+    table        (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants, only
+          changed from the event loop
+    executor     (Executor) (Optional)
+        : Executor scanning large documents, a ProcessPoolExecutor scans them in parallel, by
+          default the event loop's thread pool is used
+    offload_size (int) (Optional)
+        : Size above which a document is scanned in the executor, smaller documents are scanned
+          right away because handing them over costs more than scanning them
+    Returns
+    =======
+    (ScanResult)
+        : The tokens (as a TokenStream, with ids of the table) and the errors of the document, the
+          scanner never exits on errors here
+    """
+
+    if len(source_code) <= offload_size:
+        result = scan_source(source_code, collect_errors=True)
+    else:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            executor, partial(scan_source, source_code, collect_errors=True)
+        )
+
+    # Merging in the event loop keeps the table consistent while many documents are scanned, the ids
+    # given to new symbols depend on the order in which the documents finish
+    merge_symbols(table, result.entries, result.tokens)
+
+    return result
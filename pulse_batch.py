@@ -0,0 +1,352 @@
+# Standard library for operating system dependent functionality
+import os
+
+# Standard library for streams in memory
+import io
+
+# Standard library to run functions in a pool of worker processes
+from concurrent.futures import ProcessPoolExecutor
+
+# Import some helper functions
+from global_helpers import error, map_file
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import ScanStats class
+from scan_stats_class import ScanStats
+
+# Import the classes of scan results
+from scan_result_class import Diagnostic, ScanResult
+
+# Import LineIndex class
+from line_index_class import LineIndex
+
+# Import TokenStream class
+from token_stream_class import TokenStream
+
+# Import scanner
+from pulse_scanner import iter_tokens, scanner
+
+# File extensions of pulse source files, used when scanning directories
+PULSE_EXTENSIONS = (".pulse",)
+
+
+def collect_files(paths, extensions=PULSE_EXTENSIONS):
+    """
+    Expands directories into the pulse source files they contain
+    Params
+    ======
+    paths      (list)
+        : Paths to pulse source files or directories
+    extensions (tuple) (Optional)
+        : File extensions of the files picked from directories
+    Returns
+    =======
+    (list)
+        : Paths of the files, files inside a directory are sorted so that the order is deterministic
+    """
+
+    files = []
+
+    for path in paths:
+        # Files are always scanned, whatever their extension
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            files.extend(
+                os.path.join(root, name)
+                for name in sorted(names)
+                if name.endswith(extensions)
+            )
+
+    return files
+
+
+def read_error(path, exception):
+    """
+    Describes why a file cannot be read, an undecodable file is reported at its first invalid byte
+    Params
+    ======
+    path      (str)
+        : Path to the pulse source file
+    exception (Exception)
+        : The UnicodeDecodeError or OSError raised while reading the file
+    Returns
+    =======
+    (Diagnostic)
+        : The error, at the start of the file unless the invalid byte is found
+    """
+
+    if isinstance(exception, UnicodeDecodeError):
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+            content.decode("utf-8")
+        except UnicodeDecodeError as decode_error:
+            i = decode_error.start
+            line_num, column = LineIndex(content).position(i)
+            return Diagnostic(
+                "Source code is not utf-8: invalid byte 0x%02x" % content[i], line_num, column
+            )
+        except OSError:
+            pass
+
+        return Diagnostic("Source code is not utf-8", 1, 1)
+
+    return Diagnostic("Could not read the file: %s" % (exception.strerror or exception), 1, 1)
+
+
+def scan_file(path, mapped=False, cache=None, collect_stats=False, collect_errors=False):
+    """
+    Scans one file with its own symbol table, this is the work done by a worker process
+    Params
+    ======
+    path           (str)
+        : Path to the pulse source file
+    mapped         (bool) (Optional)
+        : Whether to scan the memory mapped bytes of the file instead of streaming its text
+    cache          (TokenCache) (Optional)
+        : Cache of previously scanned files, an unchanged file is loaded from it instead of scanned
+    collect_stats  (bool) (Optional)
+        : Whether to collect statistics of the scan
+    collect_errors (bool) (Optional)
+        : Whether to collect the errors in the file instead of exiting on the first one, a file
+          which cannot be read or decoded is then reported as an error of the file without tokens
+    Returns
+    =======
+    (ScanResult)
+        : The tokens of the file, the [value, type, typedata] entries of the file's symbol table in
+          id order, the errors found and the statistics (None if they were not collected)
+    """
+
+    stats = ScanStats() if collect_stats else None
+    diagnostics = [] if collect_errors else None
+
+    try:
+        if cache is not None:
+            return scan_cached_file(path, mapped, cache, stats, diagnostics)
+
+        table = SymbolTable()
+
+        if mapped:
+            with open(path, "rb") as file:
+                tokens = TokenStream(scanner(map_file(file), table, stats, diagnostics))
+        else:
+            tokens = TokenStream(iter_tokens(path, table, stats=stats, diagnostics=diagnostics))
+
+    except (UnicodeDecodeError, OSError) as exception:
+        diagnostic = read_error(path, exception)
+        if diagnostics is None:
+            error(diagnostic.msg, diagnostic.line_num)
+
+        return ScanResult(TokenStream(), [diagnostic], [], stats)
+
+    return ScanResult(tokens, diagnostics or (), list(table.symbol_table.values()), stats)
+
+
+def scan_source(source_code, collect_stats=False, collect_errors=False):
+    """
+    Scans source code held in memory with its own symbol table, for example in a worker process
+    Params
+    ======
+    source_code    (str/bytes)
+        : Pulse source code, either as a string or as utf-8 encoded bytes
+    collect_stats  (bool) (Optional)
+        : Whether to collect statistics of the scan
+    collect_errors (bool) (Optional)
+        : Whether to collect the errors in the source code instead of exiting on the first one
+    Returns
+    =======
+    (ScanResult)
+        : The tokens, symbol table entries, errors and statistics of the source code
+    """
+
+    stats = ScanStats() if collect_stats else None
+    diagnostics = [] if collect_errors else None
+
+    table = SymbolTable()
+    tokens = TokenStream(scanner(source_code, table, stats, diagnostics))
+
+    return ScanResult(tokens, diagnostics or (), list(table.symbol_table.values()), stats)
+
+
+def scan_cached_file(path, mapped, cache, stats=None, diagnostics=None):
+    """
+    Loads the tokens of a file from the cache, or scans the file and stores its tokens in the cache
+    Params
+    ======
+    path        (str)
+        : Path to the pulse source file
+    mapped      (bool)
+        : Whether the file is scanned as bytes instead of text
+    cache       (TokenCache)
+        : Cache of previously scanned files
+    stats       (ScanStats) (Optional)
+        : Statistics of the scan, files loaded from the cache count their tokens and size but take
+          no scanning time
+    diagnostics (list) (Optional)
+        : List receiving the errors in the file instead of exiting, files with errors are not cached
+    Returns
+    =======
+    (ScanResult)
+        : The tokens, symbol table entries, errors and statistics of the file
+    """
+
+    with open(path, "rb") as file:
+        content = file.read()
+
+    key = cache.key(content, "bytes" if mapped else "text")
+
+    cached = cache.load(key)
+    if cached is not None:
+        tokens, entries = cached
+        if stats is not None:
+            # Text is counted in characters, with line breaks read as one "\n" like iter_tokens does
+            size = len(content) if mapped else len(content.decode("utf-8")) - content.count(b"\r\n")
+            stats.count_cached(tokens, size, len(entries))
+
+        return ScanResult(tokens, (), entries, stats)
+
+    # Scan the contents already read, the same way as the file itself would be scanned
+    table = SymbolTable()
+
+    if mapped:
+        tokens = TokenStream(scanner(content, table, stats, diagnostics))
+    else:
+        stream = io.TextIOWrapper(io.BytesIO(content))
+        tokens = TokenStream(iter_tokens(stream, table, stats=stats, diagnostics=diagnostics))
+
+    entries = list(table.symbol_table.values())
+
+    # Broken files are scanned again every time, so that their errors are always reported
+    if not diagnostics:
+        cache.store(key, tokens, entries)
+
+    return ScanResult(tokens, diagnostics or (), entries, stats)
+
+
+def merge_symbols(table, entries, tokens):
+    """
+    Merges the symbol table entries of one file into a global symbol table and remaps the symbol ids
+    of its tokens, merging files in order gives the same table as scanning them one after another
+    with a shared table
+    Params
+    ======
+    table   (SymbolTable)
+        : The global symbol table
+    entries (list)
+        : The [value, type, typedata] entries of the file's symbol table in id order
+    tokens  (TokenStream)
+        : The tokens of the file, their symbol ids are replaced by ids of the global table
+    """
+
+    mapping = [0]
+
+    for value, type, typedata in entries:
+        # Identifiers are shared by every file, while constants get a new entry (unless interned)
+        id = table.get_by_symbol(value) if typedata == "variable" else -1
+        if id == -1:
+            id = table.entry(value, type, typedata)
+        mapping.append(id)
+
+    tokens.remap(mapping)
+
+
+def merge_file(table, path, result, stats=None):
+    """
+    Merges the result of scan_file into the global symbol table
+    Params
+    ======
+    table  (SymbolTable)
+        : The global symbol table
+    path   (str)
+        : Path to the pulse source file
+    result (ScanResult)
+        : The result returned by scan_file, its tokens are remapped to the global table
+    stats  (ScanStats) (Optional)
+        : Statistics of all files, receiving the statistics of this file
+    Returns
+    =======
+    (tuple)
+        : The path and the result of the file
+    """
+
+    merge_symbols(table, result.entries, result.tokens)
+
+    if stats is not None and result.stats is not None:
+        stats.merge(result.stats)
+
+    return path, result
+
+
+def scan_files(
+    paths, table, workers=None, mapped=False, cache=None, stats=None, collect_errors=False
+):
+    """
+    Scans many pulse source files in parallel worker processes
+    Params
+    ======
+    paths          (list)
+        : Paths to pulse source files or directories
+    table          (SymbolTable)
+        : Symbol table receiving the identifiers and constants of all files
+    workers        (int) (Optional)
+        : Number of worker processes, by default one per core
+    mapped         (bool) (Optional)
+        : Whether to scan the memory mapped bytes of the files instead of streaming their text
+    cache          (TokenCache) (Optional)
+        : Cache of previously scanned files, evicted down to its size limit after the scan
+    stats          (ScanStats) (Optional)
+        : Statistics receiving the statistics of all scanned files
+    collect_errors (bool) (Optional)
+        : Whether to collect the errors of every file instead of exiting on the first one, so that
+          broken files do not stop the scan of the others
+    Returns
+    =======
+    (list)
+        : (path, ScanResult) of every file in order, symbol ids refer to the global table
+    """
+
+    files = collect_files(paths)
+    workers = workers or os.cpu_count() or 1
+    collect_stats = stats is not None
+
+    # A pool is not worth starting for a single worker or file
+    if workers == 1 or len(files) <= 1:
+        results = (
+            scan_file(path, mapped, cache, collect_stats, collect_errors) for path in files
+        )
+        scanned = [
+            merge_file(table, path, result, stats) for path, result in zip(files, results)
+        ]
+    else:
+        # Hand files to workers in batches, so that small files do not pay one round trip each
+        chunksize = max(1, len(files) // (workers * 4))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                scan_file,
+                files,
+                [mapped] * len(files),
+                [cache] * len(files),
+                [collect_stats] * len(files),
+                [collect_errors] * len(files),
+                chunksize=chunksize,
+            )
+
+            # Results arrive in the order of the files, which keeps the merge deterministic
+            scanned = [
+                merge_file(table, path, result, stats) for path, result in zip(files, results)
+            ]
+
+    if cache is not None:
+        cache.evict()
+
+    if stats is not None:
+        stats.finish()
+
+    return scanned
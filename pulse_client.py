@@ -0,0 +1,179 @@
+# The module for system-specific parameters and functions
+import sys
+
+# Standard library for operating system dependent functionality
+import os
+
+# Standard library for json encoding
+import json
+
+# Standard library for network sockets
+import socket
+
+# Standard library to pack binary values
+import struct
+
+# Standard library to find the directory for temporary files
+import tempfile
+
+# Directory of the socket, private to the user: the user's runtime directory, or a directory only the
+# user may enter in the directory for temporary files, which the daemon creates
+SOCKET_DIRECTORY = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(
+    tempfile.gettempdir(), "pulse-%d" % os.getuid()
+)
+
+# Path of the socket the scan daemon listens on, one daemon per user unless PULSE_SOCKET says otherwise
+SOCKET_PATH = os.environ.get("PULSE_SOCKET") or os.path.join(SOCKET_DIRECTORY, "pulse-scan.sock")
+
+# Seconds the client waits for the daemon on every send and receive
+TIMEOUT = 60
+
+# Every message starts with the length of its json header, the header gives the length of the body
+HEADER = struct.Struct("<I")
+
+
+def send_message(sock, header, body=b""):
+    """
+    Sends a message of the scan daemon protocol
+    Params
+    ======
+    sock   (socket) = Connected socket
+    header (dict)   = Header of the message, the length of the body is added to it
+    body   (bytes)  = Body of the message, such as source code or tokens
+    """
+
+    header = dict(header, length=len(body))
+    data = json.dumps(header).encode("utf-8")
+
+    sock.sendall(HEADER.pack(len(data)) + data + body)
+
+
+def recv_exactly(sock, size):
+    """
+    Receives an exact number of bytes
+    Params
+    ======
+    sock (socket) = Connected socket
+    size (int)    = Number of bytes to be received
+    Returns
+    =======
+    bytes: The received bytes
+    """
+
+    data = bytearray()
+
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed in the middle of a message")
+        data += chunk
+
+    return bytes(data)
+
+
+def recv_message(sock):
+    """
+    Receives a message of the scan daemon protocol
+    Params
+    ======
+    sock (socket) = Connected socket
+    Returns
+    =======
+    dict: The header of the message
+    bytes: The body of the message
+    """
+
+    (size,) = HEADER.unpack(recv_exactly(sock, HEADER.size))
+    header = json.loads(recv_exactly(sock, size))
+
+    return header, recv_exactly(sock, header["length"])
+
+
+def request(header, body=b"", socket_path=SOCKET_PATH, timeout=TIMEOUT):
+    """
+    Sends a request to the scan daemon and waits for its response
+    Params
+    ======
+    header      (dict)   = Header of the request
+    body        (bytes)  = Body of the request
+    socket_path (string) = Path of the daemon's socket
+    timeout     (float)  = Seconds to wait for the daemon on every send and receive
+    Returns
+    =======
+    tuple: (header, body) of the response, None if no daemon of this user is running or it does not
+           answer in time
+    """
+
+    try:
+        # A socket of another user may be a forged daemon
+        if os.stat(socket_path).st_uid != os.getuid():
+            return None
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            send_message(sock, header, body)
+            return recv_message(sock)
+    except (FileNotFoundError, PermissionError, ConnectionError, TimeoutError):
+        return None
+
+
+def scan_remote(source_code, format="binary", symbols=True, socket_path=SOCKET_PATH):
+    """
+    Scans source code in the scan daemon
+    Params
+    ======
+    source_code (str/bytes) = Pulse source code, bytes are decoded as utf-8
+    format      (string)    = Output format of the tokens, see TokenWriter.FORMATS
+    symbols     (bool)      = Whether the symbol table is written after the tokens
+    socket_path (string)    = Path of the daemon's socket
+    Returns
+    =======
+    bytes: The tokens in the output format, the binary format is read by TokenWriter.load
+    list: The (message, line, column) of every error, the daemon always scans past errors
+    None is returned instead if no daemon is running, and ValueError is raised if the daemon cannot
+    scan the source code, for example because it is not utf-8
+    """
+
+    if isinstance(source_code, str):
+        source_code = source_code.encode("utf-8")
+
+    response = request(
+        {"source": True, "format": format, "symbols": symbols}, source_code, socket_path
+    )
+    if response is None:
+        return None
+
+    header, body = response
+    if header["status"] != "ok":
+        raise ValueError(header.get("message", "The scan daemon cannot scan the source code"))
+
+    return body, [tuple(diagnostic) for diagnostic in header["diagnostics"]]
+
+
+def main():
+    """
+    Scans the pulse source files given on the command line in the scan daemon, and in this process
+    when no daemon is running or the daemon cannot scan them the same way
+    """
+
+    argv = sys.argv[1:]
+
+    if argv[:1] != ["serve"]:
+        response = request({"argv": argv, "cwd": os.getcwd()})
+
+        if response is not None and response[0]["status"] == "ok":
+            header, body = response
+            sys.stdout.buffer.write(body)
+            sys.stdout.buffer.flush()
+            sys.stderr.write(header["stderr"])
+            sys.exit(header["exit"])
+
+    # Import the scanner only when it is needed, importing it is what the daemon saves
+    import pulse
+
+    pulse.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,583 @@
+# Import some helper functions
+from global_helpers import error
+
+# Import the node kinds of the syntax tree
+from ast_class import (
+    ASSIGN,
+    BINARY,
+    BLOCK,
+    CALL,
+    CLASS,
+    DO,
+    EMPTY,
+    FALSE,
+    FOR,
+    FUN,
+    IF,
+    INDEX,
+    INPUT,
+    LIST,
+    NAME,
+    NODE_KINDS,
+    NUMBER,
+    POSTFIX,
+    PRINT,
+    PROGRAM,
+    STRING,
+    TRUE,
+    UNARY,
+    VAR,
+    WHILE,
+)
+
+# Import Compiler class
+from compiler_class import Compiler
+
+# Import the instruction set
+from opcode_spec import (
+    ADD_LOCAL_CONST,
+    AUGMENTED_OPERATORS,
+    BINARY as BINARY_OP,
+    BINARY_CODES,
+    BINARY_LOCAL_CONST,
+    BINARY_LOCALS,
+    BRANCH_LOCAL_CONST,
+    BRANCH_LOCALS,
+    BUILD_LIST,
+    CALL as CALL_OP,
+    COMPARISONS,
+    DUP_TWO,
+    FUNCTION,
+    INPUT as INPUT_OP,
+    JUMP,
+    JUMP_IF_FALSE,
+    JUMP_IF_FALSE_OR_POP,
+    JUMP_IF_TRUE_OR_POP,
+    LOAD_CONST,
+    LOAD_GLOBAL,
+    LOAD_INDEX,
+    LOAD_LOCAL,
+    POP,
+    PRINT as PRINT_OP,
+    RETURN,
+    STORE_GLOBAL,
+    STORE_INDEX,
+    STORE_LOCAL,
+    UNARY as UNARY_OP,
+    UNARY_CODES,
+)
+
+# Import the token types, operator nodes hold the kind code of their token
+from token_spec import TOKEN_TYPES
+
+# Kinds of the nodes whose value is a constant
+CONSTANTS = frozenset([NUMBER, STRING, TRUE, FALSE])
+
+
+def load(compiler, name):
+    """
+    Adds the instruction pushing a variable
+    Params
+    ======
+    compiler (Compiler)
+        : The compiler
+    name     (int)
+        : Symbol id of the name of the variable
+    """
+
+    local, slot = compiler.resolve(name)
+    compiler.emit(LOAD_LOCAL if local else LOAD_GLOBAL, slot)
+
+
+def store(compiler, name):
+    """
+    Adds the instruction popping into a variable
+    Params
+    ======
+    compiler (Compiler)
+        : The compiler
+    name     (int)
+        : Symbol id of the name of the variable
+    """
+
+    local, slot = compiler.resolve(name)
+    compiler.emit(STORE_LOCAL if local else STORE_GLOBAL, slot)
+
+
+def constant(compiler, node):
+    """
+    Returns the constant of a node
+    Params
+    ======
+    compiler (Compiler)
+        : The compiler
+    node     (int)
+        : Node of kind number, string, true or false
+    Returns
+    =======
+    (int)
+        : Index of the constant
+    """
+
+    kind = compiler.ast.kinds[node]
+
+    if kind == TRUE:
+        return compiler.true
+    if kind == FALSE:
+        return compiler.false
+
+    return compiler.constant(compiler.ast.values[node], compiler.ast.lines[node])
+
+
+def local_slot(compiler, node):
+    """
+    Returns the slot of a node which reads a local variable, superinstructions work on local
+    variables only
+    Params
+    ======
+    compiler (Compiler)
+        : The compiler
+    node     (int)
+        : Any node
+    Returns
+    =======
+    (int)
+        : The slot, -1 if the node is not a local variable
+    """
+
+    if compiler.ast.kinds[node] != NAME:
+        return -1
+
+    local, slot = compiler.resolve(compiler.ast.values[node])
+    return slot if local else -1
+
+
+def declarations(ast, block):
+    """
+    Returns the variables and functions declared in a function body, outside of the functions
+    declared in it
+    Params
+    ======
+    ast   (Ast)
+        : The syntax tree
+    block (int)
+        : The block of the function
+    Returns
+    =======
+    (list)
+        : Symbol ids of the declared names in order
+    """
+
+    names = []
+    nodes = [block]
+
+    while nodes:
+        node = nodes.pop()
+        kind = ast.kinds[node]
+
+        if kind == VAR or kind == FUN:
+            names.append(ast.values[node])
+        if kind != FUN:
+            nodes.extend(reversed(ast.child_nodes(node)))
+
+    return names
+
+
+def compile_place(compiler, tasks, label):
+    """Task placing a label"""
+    compiler.place(label)
+
+
+def compile_jump(compiler, tasks, opcode, label):
+    """Task adding a jump to a label"""
+    compiler.jump(opcode, label)
+
+
+def compile_emit(compiler, tasks, opcode, *operands):
+    """Task adding an instruction"""
+    compiler.emit(opcode, *operands)
+
+
+def compile_store(compiler, tasks, name):
+    """Task popping into a variable"""
+    store(compiler, name)
+
+
+def compile_end_function(compiler, tasks, index, name, over):
+    """Task ending a function and storing it in the variable of its name"""
+    compiler.emit(RETURN)
+    compiler.scopes.pop()
+    compiler.place(over)
+    compiler.emit(FUNCTION, index)
+    store(compiler, name)
+
+
+def compile_branch(compiler, tasks, node, label):
+    """
+    Task compiling a condition, which jumps to a label if it is false
+    Params
+    ======
+    compiler (Compiler)
+        : The compiler
+    tasks    (list)
+        : The tasks which are left, the last one runs first
+    node     (int)
+        : The node of the condition
+    label    (list)
+        : The label
+    """
+
+    ast = compiler.ast
+    kind = ast.kinds[node]
+
+    if kind == BINARY:
+        type = TOKEN_TYPES[ast.values[node]]
+        left, right = ast.child_nodes(node)
+
+        # Both operands of 'and' jump to the label
+        if type == "and":
+            tasks.append((compile_branch, right, label))
+            tasks.append((compile_branch, left, label))
+            return
+
+        # Comparing a local variable with a constant or another local variable is one instruction
+        if type in COMPARISONS:
+            if ast.kinds[left] in CONSTANTS and local_slot(compiler, right) != -1:
+                left, right, type = right, left, COMPARISONS[type]
+
+            slot = local_slot(compiler, left)
+            if slot != -1 and ast.kinds[right] in CONSTANTS:
+                compiler.jump(
+                    BRANCH_LOCAL_CONST, label, BINARY_CODES[type], slot, constant(compiler, right)
+                )
+                return
+            if slot != -1 and local_slot(compiler, right) != -1:
+                compiler.jump(
+                    BRANCH_LOCALS, label, BINARY_CODES[type], slot, local_slot(compiler, right)
+                )
+                return
+
+    tasks.append((compile_jump, JUMP_IF_FALSE, label))
+    tasks.append((compile_expression, node))
+
+
+def compile_expression(compiler, tasks, node):
+    """
+    Task compiling an expression, which pushes its value
+    Params
+    ======
+    compiler (Compiler)
+        : The compiler
+    tasks    (list)
+        : The tasks which are left, the last one runs first
+    node     (int)
+        : The node of the expression
+    """
+
+    ast = compiler.ast
+    kind = ast.kinds[node]
+    value = ast.values[node]
+
+    if kind == NAME:
+        load(compiler, value)
+
+    elif kind in CONSTANTS:
+        compiler.emit(LOAD_CONST, constant(compiler, node))
+
+    elif kind == BINARY:
+        type = TOKEN_TYPES[value]
+        left, right = ast.child_nodes(node)
+
+        # 'and' and 'or' only evaluate the right operand if the left one does not decide the value
+        if type == "and" or type == "or":
+            end = compiler.label()
+            tasks.append((compile_place, end))
+            tasks.append((compile_expression, right))
+            tasks.append(
+                (compile_jump, JUMP_IF_FALSE_OR_POP if type == "and" else JUMP_IF_TRUE_OR_POP, end)
+            )
+            tasks.append((compile_expression, left))
+            return
+
+        # Operations on local variables and constants are one instruction
+        slot = local_slot(compiler, left)
+        if slot != -1 and ast.kinds[right] in CONSTANTS:
+            compiler.emit(BINARY_LOCAL_CONST, BINARY_CODES[type], slot, constant(compiler, right))
+            return
+        if slot != -1 and local_slot(compiler, right) != -1:
+            compiler.emit(BINARY_LOCALS, BINARY_CODES[type], slot, local_slot(compiler, right))
+            return
+
+        tasks.append((compile_emit, BINARY_OP, BINARY_CODES[type]))
+        tasks.append((compile_expression, right))
+        tasks.append((compile_expression, left))
+
+    elif kind == UNARY:
+        tasks.append((compile_emit, UNARY_OP, UNARY_CODES[TOKEN_TYPES[value]]))
+        tasks.append((compile_expression, ast.child_nodes(node)[0]))
+
+    elif kind == POSTFIX:
+        # The value of x++ is the value of x before it is incremented
+        target = ast.child_nodes(node)[0]
+        if ast.kinds[target] != NAME:
+            error("Cannot use the %s of an element as a value" % TOKEN_TYPES[value], ast.lines[node])
+
+        load(compiler, ast.values[target])
+        tasks.append((compile_postfix, node))
+
+    elif kind == INDEX or kind == CALL or kind == LIST or kind == PRINT or kind == INPUT:
+        children = ast.child_nodes(node)
+
+        if kind == INDEX:
+            tasks.append((compile_emit, LOAD_INDEX))
+        elif kind == CALL:
+            tasks.append((compile_emit, CALL_OP, len(children) - 1))
+        elif kind == LIST:
+            tasks.append((compile_emit, BUILD_LIST, len(children)))
+        elif kind == INPUT:
+            tasks.append((compile_emit, INPUT_OP, len(children)))
+        else:
+            # print has no value, it is nil when used as one
+            tasks.append((compile_emit, LOAD_CONST, compiler.nil))
+            tasks.append((compile_emit, PRINT_OP, len(children)))
+
+        tasks.extend((compile_expression, child) for child in reversed(children))
+
+    else:
+        error("Cannot use %s as a value" % NODE_KINDS[kind], ast.lines[node])
+
+
+def compile_postfix(compiler, tasks, node):
+    """
+    Task compiling an increment or decrement as a statement
+    Params
+    ======
+    compiler (Compiler)
+        : The compiler
+    tasks    (list)
+        : The tasks which are left, the last one runs first
+    node     (int)
+        : The node of the postfix operator
+    """
+
+    ast = compiler.ast
+    target = ast.child_nodes(node)[0]
+    step = compiler.one if TOKEN_TYPES[ast.values[node]] == "increment" else compiler.minus_one
+
+    if ast.kinds[target] == NAME:
+        slot = local_slot(compiler, target)
+        if slot != -1:
+            compiler.emit(ADD_LOCAL_CONST, slot, step)
+            return
+
+        tasks.append((compile_store, ast.values[target]))
+        tasks.append((compile_emit, BINARY_OP, BINARY_CODES["plus"]))
+        tasks.append((compile_emit, LOAD_CONST, step))
+        tasks.append((compile_expression, target))
+        return
+
+    if ast.kinds[target] != INDEX:
+        error(
+            "Cannot apply %s to %s" % (TOKEN_TYPES[ast.values[node]], NODE_KINDS[ast.kinds[target]]),
+            ast.lines[node],
+        )
+
+    # The list and the index are evaluated once and used to load and then to store the element
+    tasks.append((compile_emit, STORE_INDEX))
+    tasks.append((compile_emit, BINARY_OP, BINARY_CODES["plus"]))
+    tasks.append((compile_emit, LOAD_CONST, step))
+    tasks.append((compile_emit, LOAD_INDEX))
+    tasks.append((compile_emit, DUP_TWO))
+    tasks.extend((compile_expression, child) for child in reversed(ast.child_nodes(target)))
+
+
+def compile_assign(compiler, tasks, node):
+    """
+    Task compiling an assignment
+    Params
+    ======
+    compiler (Compiler)
+        : The compiler
+    tasks    (list)
+        : The tasks which are left, the last one runs first
+    node     (int)
+        : The node of the assignment
+    """
+
+    ast = compiler.ast
+    type = TOKEN_TYPES[ast.values[node]]
+    target, value = ast.child_nodes(node)
+    operator = AUGMENTED_OPERATORS.get(type)
+
+    if ast.kinds[target] == NAME:
+        name = ast.values[target]
+
+        # x = x + k is x += k
+        if (
+            operator is None
+            and ast.kinds[value] == BINARY
+            and TOKEN_TYPES[ast.values[value]] == "plus"
+            and ast.kinds[ast.child_nodes(value)[0]] == NAME
+            and ast.values[ast.child_nodes(value)[0]] == name
+        ):
+            operator = "plus"
+            value = ast.child_nodes(value)[1]
+
+        # Adding a number to a local variable is one instruction
+        slot = local_slot(compiler, target)
+        if operator == "plus" and slot != -1 and ast.kinds[value] == NUMBER:
+            compiler.emit(ADD_LOCAL_CONST, slot, constant(compiler, value))
+            return
+
+        tasks.append((compile_store, name))
+        if operator is not None:
+            tasks.append((compile_emit, BINARY_OP, BINARY_CODES[operator]))
+        tasks.append((compile_expression, value))
+        if operator is not None:
+            tasks.append((compile_expression, target))
+        return
+
+    # Elements are stored from the list, the index and the value on the stack
+    tasks.append((compile_emit, STORE_INDEX))
+    if operator is not None:
+        tasks.append((compile_emit, BINARY_OP, BINARY_CODES[operator]))
+    tasks.append((compile_expression, value))
+    if operator is not None:
+        tasks.append((compile_emit, LOAD_INDEX))
+        tasks.append((compile_emit, DUP_TWO))
+    tasks.extend((compile_expression, child) for child in reversed(ast.child_nodes(target)))
+
+
+def compile_statement(compiler, tasks, node):
+    """
+    Task compiling a statement, which leaves the stack as it was
+    Params
+    ======
+    compiler (Compiler)
+        : The compiler
+    tasks    (list)
+        : The tasks which are left, the last one runs first
+    node     (int)
+        : The node of the statement
+    """
+
+    ast = compiler.ast
+    kind = ast.kinds[node]
+    value = ast.values[node]
+    children = ast.child_nodes(node)
+
+    compiler.line(ast.lines[node])
+
+    if kind == BLOCK or kind == PROGRAM:
+        tasks.extend((compile_statement, child) for child in reversed(children))
+
+    elif kind == VAR:
+        # A declaration without a value sets the variable to nil
+        if children:
+            tasks.append((compile_assign, children[0]))
+        else:
+            compiler.emit(LOAD_CONST, compiler.nil)
+            store(compiler, value)
+
+    elif kind == ASSIGN:
+        tasks.append((compile_assign, node))
+
+    elif kind == POSTFIX:
+        tasks.append((compile_postfix, node))
+
+    elif kind == PRINT:
+        tasks.append((compile_emit, PRINT_OP, len(children)))
+        tasks.extend((compile_expression, child) for child in reversed(children))
+
+    elif kind == IF:
+        # Pairs of condition and block, then the else block if there is one
+        end = compiler.label()
+        tasks.append((compile_place, end))
+
+        if len(children) % 2:
+            tasks.append((compile_statement, children[-1]))
+
+        for index in range(len(children) // 2 * 2 - 2, -1, -2):
+            following = compiler.label()
+            tasks.append((compile_place, following))
+            if index + 2 < len(children):
+                tasks.append((compile_jump, JUMP, end))
+            tasks.append((compile_statement, children[index + 1]))
+            tasks.append((compile_branch, children[index], following))
+
+    elif kind == WHILE or kind == FOR:
+        # A while loop is a for loop without initialization and step, the clauses may be empty
+        if kind == WHILE:
+            initialization, condition, step, block = None, children[0], None, children[1]
+        else:
+            initialization, condition, step, block = children
+
+        top = compiler.label()
+        end = compiler.label()
+
+        tasks.append((compile_place, end))
+        tasks.append((compile_jump, JUMP, top))
+        if step is not None and ast.kinds[step] != EMPTY:
+            tasks.append((compile_statement, step))
+        tasks.append((compile_statement, block))
+        if ast.kinds[condition] != EMPTY:
+            tasks.append((compile_branch, condition, end))
+        tasks.append((compile_place, top))
+        if initialization is not None and ast.kinds[initialization] != EMPTY:
+            tasks.append((compile_statement, initialization))
+
+    elif kind == DO:
+        top = compiler.label()
+        end = compiler.label()
+
+        tasks.append((compile_place, end))
+        tasks.append((compile_jump, JUMP, top))
+        tasks.append((compile_branch, children[1], end))
+        tasks.append((compile_statement, children[0]))
+        tasks.append((compile_place, top))
+
+    elif kind == FUN:
+        # The body is jumped over, it runs when the function is called
+        params = [ast.values[child] for child in children[:-1]]
+        over = compiler.label()
+        compiler.jump(JUMP, over)
+        index = compiler.function(value, params, declarations(ast, children[-1]))
+
+        tasks.append((compile_end_function, index, value, over))
+        tasks.append((compile_statement, children[-1]))
+
+    elif kind == CLASS:
+        error("Classes are not supported by the compiler", ast.lines[node])
+
+    else:
+        # The value of an expression statement is dropped
+        tasks.append((compile_emit, POP))
+        tasks.append((compile_expression, node))
+
+
+def compile_ast(ast, table):
+    """
+    Compiles a syntax tree into bytecode, with an explicit stack of tasks instead of recursion, so
+    that deeply nested programs compile
+    Params
+    ======
+    ast   (Ast)
+        : The syntax tree of the program
+    table (SymbolTable)
+        : The symbol table of the scanner, whose constants are the constants of the bytecode
+    Returns
+    =======
+    (Bytecode)
+        : The compiled program
+    """
+
+    compiler = Compiler(ast, table)
+
+    # Every task is a function and its arguments, the last task runs first
+    tasks = [(compile_statement, ast.root)]
+
+    while tasks:
+        task = tasks.pop()
+        task[0](compiler, tasks, *task[1:])
+
+    return compiler.bytecode()
@@ -0,0 +1,165 @@
+# Import Scanner class
+from scanner_class import Scanner
+
+# Import IncrementalSource class
+from incremental_source_class import IncrementalSource
+
+# Import scanner
+from pulse_scanner import close_indentation, scan_tokens
+
+
+def scan_lines(source_code, i, table, scanner_obj, tokens, snapshots, resync=None):
+    """
+    Scans source code while recording a snapshot of the scanner state at every line break
+    Params
+    ======
+    source_code (str)
+        : Pulse source code
+    i           (int)
+        : The index in the source code where scanning starts
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    scanner_obj (Scanner)
+        : Instance of Scanner class holding the state at index i
+    tokens      (list)
+        : List receiving the tokens
+    snapshots   (list)
+        : List receiving the snapshots, (offset, token index, line_num, isIndent, indentLevel) of
+          every line break
+    resync      (function) (Optional)
+        : Called with every snapshot, scanning stops before the line break if it returns True
+    Returns
+    =======
+    (tuple)
+        : The snapshot at which scanning stopped, None if the end of the source code was reached
+    """
+
+    scanner_obj.snapshots = states = []
+
+    for token in scan_tokens(source_code, i, table, scanner_obj):
+        # The scanner records the state of a line break just before yielding its newline token
+        if token.type == "newline":
+            offset, line_num, isIndent, indentLevel = states[-1]
+            snapshot = (offset, len(tokens), line_num, isIndent, indentLevel)
+
+            if resync is not None and resync(snapshot):
+                return snapshot
+
+            snapshots.append(snapshot)
+
+        tokens.append(token)
+
+    tokens.extend(close_indentation(scanner_obj, len(source_code)))
+
+    return None
+
+
+def lex(source_code, table):
+    """
+    Scans source code for later incremental re-lexing
+    Params
+    ======
+    source_code (str)
+        : Pulse source code
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    Returns
+    =======
+    (IncrementalSource)
+        : The source code with its tokens and the snapshots of the scanner state at every line break
+    """
+
+    tokens = []
+    snapshots = []
+
+    scan_lines(source_code, 0, table, Scanner(), tokens, snapshots)
+
+    return IncrementalSource(source_code, tokens, snapshots)
+
+
+def relex(source, edit, table):
+    """
+    Re-scans source code after an edit, starting at a line break before the edit and stopping
+    as soon as the scanner is back in a state it had before the edit, the remaining tokens are reused
+    without being copied or changed, their positions are moved by the shifts of source
+    Params
+    ======
+    source (IncrementalSource)
+        : The source code before the edit as returned by lex, changed in place to the source code
+          after the edit
+    edit   (tuple)
+        : (offset, number of deleted characters, inserted string)
+    table  (SymbolTable)
+        : Symbol table the tokens were scanned with, entries of unchanged tokens are reused so the
+          ids may differ from a fresh scan but always refer to the same values
+    Returns
+    =======
+    (int)
+        : Index of the first re-scanned token
+    (int)
+        : Index after the last re-scanned token, the tokens from there on are the ones after the
+          edit before
+    """
+
+    offset, deleted, inserted = edit
+
+    source_code = source.source_code
+    new_source = source_code[:offset] + inserted + source_code[offset + deleted :]
+    delta = len(inserted) - deleted
+    edit_end = offset + len(inserted)
+
+    # Restart at the last line break before the character preceding the edit, the lexeme ending at a
+    # line break right before the edit depends on the character after it (a comment ends before a
+    # character followed by "/"), the lexemes before the restart are unchanged
+    k = source.find(offset - 1) - 1
+    first = max(k, 0)
+
+    scanner_obj = Scanner()
+    start, token_index = 0, 0
+
+    if k >= 0:
+        start, token_index, scanner_obj.line_num, scanner_obj.isIndent, scanner_obj.indentLevel = (
+            source.snapshot(k)
+        )
+
+    def resync(snapshot):
+        """
+        Checks whether scanning after the edit reached a line break the old scan also passed with
+        the same indentation state
+        """
+
+        # The line break has to be entirely after the edit to be unchanged
+        if snapshot[0] < edit_end:
+            return False
+
+        j = source.find(snapshot[0] - delta)
+        if j == len(source.snapshots):
+            return False
+
+        old = source.snapshot(j)
+        return old[0] == snapshot[0] - delta and old[3:] == snapshot[3:]
+
+    tokens = []
+    snapshots = []
+    stop = scan_lines(new_source, start, table, scanner_obj, tokens, snapshots, resync)
+
+    # The snapshots of the re-scanned lines count the tokens from the restart
+    snapshots = [
+        (offset, index + token_index, line_num, isIndent, indentLevel)
+        for offset, index, line_num, isIndent, indentLevel in snapshots
+    ]
+
+    if stop is None:
+        # Everything from the restart on was scanned again
+        source.replace(
+            first, len(source.snapshots), token_index, len(source.tokens), tokens, snapshots, 0, 0
+        )
+    else:
+        # The old tokens and snapshots are reused from the line break where both scans agree
+        j = source.find(stop[0] - delta)
+        old = source.snapshot(j)
+        source.replace(first, j, token_index, old[1], tokens, snapshots, delta, stop[2] - old[2])
+
+    source.source_code = new_source
+
+    return token_index, token_index + len(tokens)
@@ -0,0 +1,423 @@
+# Import the node kinds of the syntax tree
+from ast_class import ASSIGN, BLOCK, FUN, NAME, POSTFIX, PROGRAM, VAR
+
+# Import InstructionList class
+from instruction_list_class import InstructionList
+
+# Import compiler
+from pulse_compiler import CONSTANTS, compile_ast, declarations
+
+# Import the instruction set
+from opcode_spec import (
+    BINARY,
+    BINARY_CODES,
+    BINARY_FUNCTIONS,
+    FUNCTION,
+    HALT,
+    JUMP,
+    JUMP_IF_FALSE,
+    JUMP_IF_FALSE_OR_POP,
+    JUMP_IF_TRUE,
+    JUMP_IF_TRUE_OR_POP,
+    JUMPS,
+    LOAD_CONST,
+    LOAD_GLOBAL,
+    LOAD_LOCAL,
+    POP,
+    RETURN,
+    STORE_GLOBAL,
+    STORE_LOCAL,
+    UNARY,
+    UNARY_FUNCTIONS,
+)
+
+# Import the kind codes of the token types
+from token_spec import TOKEN_CODES
+
+# Largest string (in characters) or integer (in bits) made by folding, larger values are computed
+# when the program runs instead of being stored with it
+MAX_FOLDED_SIZE = 4096
+
+# Instructions which push a value without any other effect
+PURE_LOADS = frozenset([LOAD_CONST, LOAD_LOCAL, LOAD_GLOBAL, FUNCTION])
+
+# Instruction storing into the slot every load instruction reads from
+LOAD_STORES = {LOAD_LOCAL: STORE_LOCAL, LOAD_GLOBAL: STORE_GLOBAL}
+
+
+def propagate_constants(ast):
+    """
+    Replaces the uses of variables which are declared with a constant and never assigned again by
+    the constant, in place, the declaration is left out once no use of the variable is left
+    Only a declaration directly in the program or in a function body is propagated, so that it runs
+    before every use which comes after it, and uses before it (which read nil) are kept
+    Params
+    ======
+    ast (Ast)
+        : The syntax tree of the program
+    Returns
+    =======
+    (int)
+        : Number of replaced uses
+    """
+
+    replaced = 0
+
+    # Values propagated into declarations are constants too, so propagate until nothing changes
+    while True:
+        # Keys are (function node, name), the function node is -1 for global variables
+        writes = {}
+        reads = {}
+        candidates = {}
+
+        # (node, function node, names local to the function, whether it is a statement of the
+        # program or of a function body)
+        nodes = [(ast.root, -1, frozenset(), False)]
+
+        while nodes:
+            node, function, names, direct = nodes.pop()
+            kind = ast.kinds[node]
+            children = ast.child_nodes(node)
+
+            if kind == NAME:
+                key = (function if ast.values[node] in names else -1, ast.values[node])
+                reads.setdefault(key, []).append(node)
+                continue
+
+            if kind == VAR or kind == FUN:
+                key = (function if ast.values[node] in names else -1, ast.values[node])
+                writes[key] = writes.get(key, 0) + 1
+
+            if kind == VAR:
+                if children:
+                    value = ast.child_nodes(children[0])[1]
+                    if (
+                        direct
+                        and ast.values[children[0]] == TOKEN_CODES["assignment"]
+                        and ast.kinds[value] in CONSTANTS
+                    ):
+                        candidates[key] = (node, value)
+                    nodes.append((value, function, names, False))
+
+            elif kind == FUN:
+                # Parameters are local variables which are not read here
+                params = [ast.values[child] for child in children[:-1]]
+                names = frozenset(params + declarations(ast, children[-1]))
+                nodes.append((children[-1], node, names, True))
+
+            elif kind == ASSIGN or kind == POSTFIX:
+                target = children[0]
+                if ast.kinds[target] == NAME:
+                    name = ast.values[target]
+                    key = (function if name in names else -1, name)
+                    writes[key] = writes.get(key, 0) + 1
+                    children = children[1:]
+                nodes.extend((child, function, names, False) for child in reversed(children))
+
+            else:
+                direct = kind == PROGRAM or (kind == BLOCK and direct)
+                nodes.extend((child, function, names, direct) for child in reversed(children))
+
+        changed = False
+
+        for key, (declaration, value) in candidates.items():
+            if writes[key] != 1:
+                continue
+
+            # Children come before their parents, so a use after the declaration has a larger node
+            uses = reads.get(key, [])
+            for use in uses:
+                if use > declaration:
+                    ast.kinds[use] = ast.kinds[value]
+                    ast.values[use] = ast.values[value]
+                    replaced += 1
+                    changed = True
+
+            # A declaration nothing reads is an empty block
+            if all(use > declaration for use in uses):
+                ast.kinds[declaration] = BLOCK
+                ast.counts[declaration] = 0
+
+        if not changed:
+            return replaced
+
+
+def folded(listing, opcode, function, operands):
+    """
+    Returns the constant made by folding an operation on constants
+    Params
+    ======
+    listing  (InstructionList)
+        : The program
+    opcode   (int)
+        : BINARY or UNARY
+    function (function)
+        : The function of the operator
+    operands (list)
+        : Indices of the constants of the operands
+    Returns
+    =======
+    (int)
+        : Index of the result in the constants, -1 if the operation is left to run time
+    """
+
+    values = [listing.consts[operand] for operand in operands]
+
+    # Repeated strings are only built if they are small
+    if opcode == BINARY and function is BINARY_FUNCTIONS[BINARY_CODES["multiply"]]:
+        counts = [value for value in values if isinstance(value, int)]
+        texts = [value for value in values if isinstance(value, str)]
+        if texts and counts and len(texts[0]) * counts[0] > MAX_FOLDED_SIZE:
+            return -1
+
+    # Errors such as a division by zero are reported when the program runs
+    try:
+        result = function(*values)
+    except Exception:
+        return -1
+
+    if isinstance(result, str) and len(result) > MAX_FOLDED_SIZE:
+        return -1
+    if isinstance(result, int) and result.bit_length() > MAX_FOLDED_SIZE:
+        return -1
+
+    return listing.constant(result)
+
+
+def fold_constants(listing):
+    """
+    Computes the operations whose operands are constants, a constant operand is a load_const or the
+    result of an earlier folded operation
+    Params
+    ======
+    listing (InstructionList)
+        : The program, changed in place
+    Returns
+    =======
+    (int)
+        : Number of saved instructions
+    """
+
+    instructions = listing.instructions
+    targets = listing.targets()
+    removed = [False] * len(instructions)
+
+    # Positions of the instructions which are kept so far, the last ones are the operands
+    kept = []
+
+    for position, instruction in enumerate(instructions):
+        opcode = instruction[0]
+        operands = 2 if opcode == BINARY else 1 if opcode == UNARY else 0
+
+        # Code jumping between the operands and the operation does not load the operands
+        if (
+            operands
+            and len(kept) >= operands
+            and all(instructions[load][0] == LOAD_CONST for load in kept[-operands:])
+            and not any(target in targets for target in range(kept[-operands] + 1, position + 1))
+        ):
+            functions = BINARY_FUNCTIONS if opcode == BINARY else UNARY_FUNCTIONS
+            result = folded(
+                listing,
+                opcode,
+                functions[instruction[1]],
+                [instructions[load][1] for load in kept[-operands:]],
+            )
+
+            if result != -1:
+                for load in kept[-operands:]:
+                    removed[load] = True
+                del kept[-operands:]
+                instructions[position] = [LOAD_CONST, result]
+
+        kept.append(position)
+
+    return listing.remove(removed)
+
+
+def remove_unreachable(listing):
+    """
+    Removes the instructions which never run, functions run from the function instructions which
+    run
+    Params
+    ======
+    listing (InstructionList)
+        : The program, changed in place
+    Returns
+    =======
+    (int)
+        : Number of removed instructions
+    """
+
+    instructions = listing.instructions
+    reachable = [False] * len(instructions)
+    starts = [0] if instructions else []
+
+    while starts:
+        position = starts.pop()
+
+        # Follow the instructions up to one which does not go on with the next one
+        while position < len(instructions) and not reachable[position]:
+            reachable[position] = True
+            opcode = instructions[position][0]
+
+            if opcode in JUMPS:
+                starts.append(instructions[position][-1])
+            elif opcode == FUNCTION:
+                starts.append(listing.entries[instructions[position][1]])
+
+            if opcode == JUMP or opcode == RETURN or opcode == HALT:
+                break
+            position += 1
+
+    return listing.remove([not flag for flag in reachable])
+
+
+def remove_dead_branches(listing):
+    """
+    Decides the conditional jumps on constants, such as the ones of if true: and if false:, and
+    removes the code which is then never run
+    Params
+    ======
+    listing (InstructionList)
+        : The program, changed in place
+    Returns
+    =======
+    (int)
+        : Number of saved instructions
+    """
+
+    instructions = listing.instructions
+    targets = listing.targets()
+    removed = [False] * len(instructions)
+
+    for position in range(1, len(instructions)):
+        opcode = instructions[position][0]
+        load = instructions[position - 1]
+
+        if load[0] != LOAD_CONST or position in targets or removed[position - 1]:
+            continue
+
+        value = bool(listing.consts[load[1]])
+        jump = [JUMP, instructions[position][-1]]
+
+        # Jumps which pop the condition either always jump or are left out with their load
+        if opcode == JUMP_IF_FALSE or opcode == JUMP_IF_TRUE:
+            removed[position - 1] = True
+            if value == (opcode == JUMP_IF_TRUE):
+                instructions[position] = jump
+            else:
+                removed[position] = True
+
+        # Jumps which keep the condition when they jump keep its load
+        elif opcode == JUMP_IF_FALSE_OR_POP or opcode == JUMP_IF_TRUE_OR_POP:
+            if value == (opcode == JUMP_IF_TRUE_OR_POP):
+                instructions[position] = jump
+            else:
+                removed[position - 1] = True
+                removed[position] = True
+
+    return listing.remove(removed) + remove_unreachable(listing)
+
+
+def peephole(listing):
+    """
+    Threads jumps to jumps through to their final target, and removes jumps to the next
+    instruction, values which are loaded and popped right away and variables stored into the slot
+    they were just loaded from
+    Params
+    ======
+    listing (InstructionList)
+        : The program, changed in place
+    Returns
+    =======
+    (int)
+        : Number of saved instructions
+    """
+
+    saved = 0
+
+    # Every removal may make another one possible
+    while True:
+        instructions = listing.instructions
+        targets = listing.targets()
+        removed = [False] * len(instructions)
+
+        for position, instruction in enumerate(instructions):
+            opcode = instruction[0]
+
+            if opcode in JUMPS:
+                # Follow the chain of jumps, a jump to itself is an endless loop which stays
+                target = instruction[-1]
+                seen = set()
+                while instructions[target][0] == JUMP and target not in seen:
+                    seen.add(target)
+                    target = instructions[target][1]
+                instruction[-1] = target
+
+                if opcode == JUMP and instructions[target][0] in (RETURN, HALT):
+                    instructions[position] = [instructions[target][0]]
+                elif opcode == JUMP and target == position + 1:
+                    removed[position] = True
+
+            elif (
+                position + 1 < len(instructions)
+                and position + 1 not in targets
+                and not removed[position]
+                and (
+                    (opcode in PURE_LOADS and instructions[position + 1][0] == POP)
+                    or (
+                        opcode in LOAD_STORES
+                        and instructions[position + 1] == [LOAD_STORES[opcode], instruction[1]]
+                    )
+                )
+            ):
+                removed[position] = True
+                removed[position + 1] = True
+
+        count = listing.remove(removed) + remove_unreachable(listing)
+        saved += count
+
+        if not count:
+            return saved
+
+
+# Optimization passes on the compiled program in the order they run
+PASSES = {
+    "fold_constants": fold_constants,
+    "remove_dead_branches": remove_dead_branches,
+    "peephole": peephole,
+}
+
+
+def optimize(ast, table):
+    """
+    Compiles a syntax tree with optimizations, constants are propagated in the syntax tree and the
+    other passes work on the compiled instructions
+    Params
+    ======
+    ast   (Ast)
+        : The syntax tree of the program, constants are propagated into it in place
+    table (SymbolTable)
+        : The symbol table of the scanner
+    Returns
+    =======
+    (Bytecode)
+        : The optimized program
+    (dict)
+        : Number of instructions every pass saved, by name of the pass, propagation alone may cost
+          instructions (constants are not fused with the operations using them) which folding saves
+    """
+
+    report = {}
+
+    # The program is compiled without propagation too, to count what propagation saved
+    count = compile_ast(ast, table).count()
+    propagate_constants(ast)
+    listing = InstructionList(compile_ast(ast, table))
+    report["propagate_constants"] = count - len(listing)
+
+    for name, function in PASSES.items():
+        report[name] = function(listing)
+
+    return listing.bytecode(), report
@@ -0,0 +1,374 @@
+# Standard library for iterator building blocks
+from itertools import chain
+
+# Standard library for process based parallelism
+import multiprocessing
+
+# Standard library to run functions in a pool of worker processes
+from concurrent.futures import ProcessPoolExecutor
+
+# The module for system-specific parameters and functions
+import os
+
+# Import some helper functions
+from global_helpers import error
+
+# Import Token class
+from token_class import Token
+
+# Import Scanner class
+from scanner_class import Scanner
+
+# Import Span class
+from span_class import Span
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import the classes of scan results
+from scan_result_class import Diagnostic, ScanResult
+
+# Import TokenStream class
+from token_stream_class import TokenStream
+
+# Import the kind codes of the token types
+from token_spec import TOKEN_TYPES
+
+# Import scanner
+from pulse_scanner import close_indentation, scan_tokens, scanner
+
+# Import the merge of symbol tables
+from pulse_batch import merge_symbols
+
+# Sources smaller than this are not split, the pool costs more than it saves
+MIN_CHUNK_SIZE = 1 << 20
+
+# Length of the text before the value of comment tokens, for spans
+COMMENT_PREFIXES = {"single_line_comment": 1, "multi_line_comment": 2}
+
+# Source code scanned by a worker process, shared once per worker instead of sent with every chunk
+SOURCE_CODE = None
+
+
+def share_source(source_code):
+    """
+    Initializer of the worker processes, keeps the source code for scan_chunk
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code
+    """
+
+    global SOURCE_CODE
+    SOURCE_CODE = source_code
+
+
+def split_points(source_code, chunk_size):
+    """
+    Finds where the source code is split into chunks, at the start of lines which are not indented,
+    those are the places where the scanner is most likely back at indentation level 0
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code
+    chunk_size  (int)
+        : Least number of characters of a chunk
+    Returns
+    =======
+    (list)
+        : Start of every chunk followed by the end of the source code
+    """
+
+    if isinstance(source_code, str):
+        newline, indentation = "\n", (" ", "\t", "\n")
+    else:
+        newline, indentation = b"\n", (b" ", b"\t", b"\n")
+    length = len(source_code)
+
+    points = [0]
+    position = chunk_size
+
+    while position < length:
+        line_break = source_code.find(newline, position)
+        if line_break == -1:
+            break
+
+        # Indented and empty lines are skipped, the next line is tried instead
+        position = line_break + 1
+        if position < length and source_code[position : position + 1] not in indentation:
+            points.append(position)
+            position += chunk_size
+
+    points.append(length)
+
+    return points
+
+
+def scan_chunk(start, stop, final, comments=True, newlines=True):
+    """
+    Scans one chunk of the shared source code as if the scanner was at its start at indentation
+    level 0, this is the work done by a worker process
+    Params
+    ======
+    start    (int)
+        : Index of the start of the chunk
+    stop     (int)
+        : Index of the end of the chunk
+    final    (bool)
+        : Whether the chunk ends the source code
+    comments (bool) (Optional)
+        : Whether comment tokens are generated
+    newlines (bool) (Optional)
+        : Whether newline tokens are generated
+    Returns
+    =======
+    (ScanResult)
+        : The tokens of the chunk, with line numbers counted from 1, the [value, type, typedata]
+          entries of the chunk's symbol table in id order and the errors found
+    (int)
+        : Index where scanning stopped, before stop if a lexeme continues past it
+    (Scanner)
+        : The state of the scanner at the end of the chunk
+    """
+
+    table = SymbolTable()
+    diagnostics = []
+
+    # Offsets and columns are counted from the start of the whole source code
+    scanner_obj = Scanner()
+    scanner_obj.diagnostics = diagnostics
+    scanner_obj.offset = start
+    scanner_obj.line_start = start
+    scanner_obj.comments = comments
+    scanner_obj.newlines = newlines
+
+    # One character past the chunk shows whether its last lexeme continues in the next chunk
+    if final:
+        chunk = SOURCE_CODE[start:stop]
+        tokens = scan_tokens(chunk, 0, table, scanner_obj)
+    else:
+        # The character past the chunk is taken whole, a lone utf-8 lead byte would end a lexeme
+        # the pattern cannot continue into it, such as a comment
+        end = stop + 1
+        if not isinstance(SOURCE_CODE, str):
+            while end < len(SOURCE_CODE) and SOURCE_CODE[end] & 0xC0 == 0x80:
+                end += 1
+
+        chunk = SOURCE_CODE[start:end]
+        tokens = scan_tokens(chunk, 0, table, scanner_obj, False, stop - start)
+
+    stream = TokenStream()
+
+    while True:
+        try:
+            token = next(tokens)
+        except StopIteration as stopped:
+            end = start + stopped.value
+            break
+
+        stream.append(token)
+
+    scanner_obj.diagnostics = None
+    result = ScanResult(stream, diagnostics, list(table.symbol_table.values()))
+
+    return result, end, scanner_obj
+
+
+def chunk_tokens(source_code, result, shift, spans):
+    """
+    Generates the tokens of a chunk scanned by scan_chunk, after its symbols are merged
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code
+    result      (ScanResult)
+        : The result of scan_chunk
+    shift       (int)
+        : Number of lines before the chunk
+    spans       (bool)
+        : Whether comment tokens get a Span of the source code as value instead of their text
+    Yields
+    ======
+    (Token)
+        : The tokens of the chunk
+    """
+
+    stream = result.tokens
+    texts = stream.texts
+
+    for kind, val, line_num, start, end in zip(
+        stream.kinds, stream.vals, stream.lines, stream.starts, stream.ends
+    ):
+        type = TOKEN_TYPES[kind]
+
+        if val < 0:
+            if spans and type in COMMENT_PREFIXES:
+                val = Span(source_code, start + COMMENT_PREFIXES[type], end)
+            else:
+                val = "" if val == -1 else texts[-val - 2]
+
+        yield Token(type, val, line_num + shift, start, end)
+
+
+def scan_tokens_parallel(source_code, table, scanner_obj, workers, chunk_size):
+    """
+    Generate tokens from source code split into chunks which are scanned in worker processes,
+    every chunk is scanned speculatively from indentation level 0 and its tokens are only used when
+    the previous chunks leave the scanner in that state at its start, otherwise the chunk is scanned
+    again here, so the tokens are always the same as the ones of scan_tokens
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    scanner_obj (Scanner)
+        : Instance of Scanner class holding the lexer state
+    workers     (int)
+        : Number of worker processes
+    chunk_size  (int)
+        : Least number of characters of a chunk
+    Yields
+    ======
+    (Token)
+        : The tokens of the source code
+    Returns
+    =======
+    (int)
+        : The index in the source code where scanning stopped
+    """
+
+    points = split_points(source_code, chunk_size)
+    starts, stops = points[:-1], points[1:]
+    finals = [False] * (len(stops) - 1) + [True]
+
+    # Memory maps cannot be sent to worker processes which are not forked
+    shared = source_code
+    if not isinstance(source_code, (str, bytes)) and multiprocessing.get_start_method() != "fork":
+        shared = bytes(source_code)
+
+    i = 0
+
+    with ProcessPoolExecutor(workers, initializer=share_source, initargs=(shared,)) as executor:
+        results = executor.map(
+            scan_chunk,
+            starts,
+            stops,
+            finals,
+            [scanner_obj.comments] * len(starts),
+            [scanner_obj.newlines] * len(starts),
+        )
+
+        for start, stop, final, chunk in zip(starts, stops, finals, results):
+            result, end, state = chunk
+
+            # Speculation failed, for example the chunk starts inside a block, a string or a comment
+            if i != start or scanner_obj.isIndent or scanner_obj.indentLevel != 0:
+                i = yield from scan_tokens(
+                    source_code, i, table, scanner_obj, True, None if final else stop
+                )
+            else:
+                shift = scanner_obj.line_num - 1
+
+                for diagnostic in result.diagnostics:
+                    if scanner_obj.diagnostics is None:
+                        error(diagnostic.msg, diagnostic.line_num + shift)
+                    scanner_obj.diagnostics.append(
+                        Diagnostic(diagnostic.msg, diagnostic.line_num + shift, diagnostic.column)
+                    )
+
+                merge_symbols(table, result.entries, result.tokens)
+                yield from chunk_tokens(source_code, result, shift, scanner_obj.spans)
+
+                # Continue from the state the chunk ends in
+                scanner_obj.line_num = state.line_num + shift
+                scanner_obj.isIndent = state.isIndent
+                scanner_obj.indentLevel = state.indentLevel
+                scanner_obj.isEnd = state.isEnd
+                i = end
+
+            # Null character terminates the source code, the remaining chunks are not needed
+            if scanner_obj.isEnd:
+                executor.shutdown(cancel_futures=True)
+                break
+
+    return i
+
+
+def parallel_scanner(
+    source_code,
+    table,
+    workers=None,
+    chunk_size=None,
+    stats=None,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+):
+    """
+    Generate tokens from a large source code in parallel worker processes, the tokens and the symbol
+    table are the same as the ones of pulse_scanner.scanner
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    workers     (int) (Optional)
+        : Number of worker processes, by default one per core
+    chunk_size  (int) (Optional)
+        : Least number of characters of a chunk, by default the source code is split into about
+          four chunks per worker and not below MIN_CHUNK_SIZE
+    stats       (ScanStats) (Optional)
+        : Statistics receiving token counts, timings and symbol table counts of this scan, the
+          symbols counted are the ones merged from the chunks
+    diagnostics (list) (Optional)
+        : List receiving the errors in the source code, when given the scanner skips past errors
+          instead of exiting
+    spans       (bool) (Optional)
+        : Whether comment tokens get a Span of the source code as value instead of a copy of their text
+    comments    (bool) (Optional)
+        : Whether comment tokens are generated
+    newlines    (bool) (Optional)
+        : Whether newline tokens are generated
+    Returns
+    ========
+    tokens: A list of tokens of the source code
+    """
+
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_SIZE, len(source_code) // (workers * 4))
+
+    # A pool is not worth starting for a single worker or chunk
+    if workers == 1 or len(source_code) < 2 * chunk_size:
+        return scanner(source_code, table, stats, diagnostics, spans, comments, newlines)
+
+    # Create scanner_obj class' object
+    scanner_obj = Scanner()
+    scanner_obj.diagnostics = diagnostics
+    scanner_obj.spans = spans
+    scanner_obj.comments = comments
+    scanner_obj.newlines = newlines
+
+    # Instrument the symbol table and the tokens only when statistics are asked for
+    if stats is not None:
+        stats.size += len(source_code)
+        table = stats.count_symbols(table)
+
+    tokens = chain(
+        scan_tokens_parallel(source_code, table, scanner_obj, workers, chunk_size),
+        close_indentation(scanner_obj, len(source_code)),
+    )
+
+    if stats is not None:
+        tokens = stats.measure(tokens)
+
+    scanner_obj.tokens.extend(tokens)
+
+    if stats is not None:
+        stats.finish()
+
+    # Return the generated tokens
+    return scanner_obj.tokens
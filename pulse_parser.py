@@ -0,0 +1,557 @@
+# Import some helper functions
+from global_helpers import error
+
+# Import the syntax tree and its node kinds
+from ast_class import (
+    ASSIGN,
+    BINARY,
+    BLOCK,
+    CALL,
+    CLASS,
+    DO,
+    EMPTY,
+    FALSE,
+    FOR,
+    FUN,
+    IF,
+    INDEX,
+    INPUT,
+    LIST,
+    NAME,
+    NODE_KINDS,
+    NUMBER,
+    POSTFIX,
+    PRINT,
+    PROGRAM,
+    STRING,
+    TRUE,
+    UNARY,
+    VAR,
+    WHILE,
+    Ast,
+)
+
+# Import TokenCursor class
+from token_cursor_class import TokenCursor
+
+# Import the kind codes of the token types
+from token_spec import TOKEN_CODES
+
+# Binding strength of the binary operators, higher binds tighter, all of them are left associative
+BINARY_PRECEDENCE = {
+    "or": 1,
+    "and": 2,
+    "equal": 4,
+    "not_equal": 4,
+    "less_than": 4,
+    "less_than_equal": 4,
+    "greater_than": 4,
+    "greater_than_equal": 4,
+    "plus": 5,
+    "minus": 5,
+    "multiply": 6,
+    "divide": 6,
+    "integer_divide": 6,
+    "modulus": 6,
+}
+
+# Binding strength of the prefix operators, 'not' binds looser than comparisons
+UNARY_PRECEDENCE = {"not": 3, "minus": 7, "plus": 7}
+
+# Postfix operators, which bind tighter than any other operator
+POSTFIX_OPERATORS = frozenset(["increment", "decrement"])
+
+# Assignment operators, assignments are statements and not expressions
+ASSIGNMENTS = frozenset(
+    [
+        "assignment",
+        "plus_equal",
+        "minus_equal",
+        "multiply_equal",
+        "divide_equal",
+        "modulus_equal",
+    ]
+)
+
+# Tokens which are a whole operand and the kind of their node
+ATOMS = {"id": NAME, "number": NUMBER, "string": STRING, "true": TRUE, "false": FALSE}
+
+# Builtin functions, which are keywords, and the kind of their node
+BUILTINS = {"print": PRINT, "input": INPUT}
+
+# Keywords starting a statement with a block, and the kind of its node
+HEADERS = {"if": IF, "while": WHILE, "for": FOR, "do": DO, "fun": FUN, "class": CLASS}
+
+# Brackets which are still open in an expression, and the token closing them
+CLOSERS = {
+    "group": "right_paren",
+    "call": "right_paren",
+    "builtin": "right_paren",
+    "list": "token_right_bracket",
+    "index": "token_right_bracket",
+}
+
+# Brackets holding a comma separated list, which may be empty
+LISTS = frozenset(["call", "builtin", "list"])
+
+
+def strip_comments(tokens):
+    """
+    Leaves out comments, the scanner ends the token of a multi line comment at its first '*' (or
+    before a '/') and scans the rest up to the closing '*/' as further tokens, which are left out too
+    Params
+    ======
+    tokens (iterable)
+        : The tokens of the program
+    Yields
+    ======
+    (Token)
+        : The tokens which are not part of a comment
+    """
+
+    tokens = iter(tokens)
+
+    for token in tokens:
+        type = token.type
+
+        if type == "single_line_comment":
+            continue
+
+        if type == "multi_line_comment":
+            # Skip to the '/' right after a '*', tokens without offsets are taken to be adjacent
+            previous = None
+            for token in tokens:
+                if (
+                    token.type == "divide"
+                    and previous is not None
+                    and previous.type == "multiply"
+                    and (token.start < 0 or token.start == previous.end)
+                ):
+                    break
+                previous = token
+            continue
+
+        yield token
+
+
+def unexpected(cursor, expected):
+    """
+    Reports the current token as a syntax error and exits
+    Params
+    ======
+    cursor   (TokenCursor)
+        : Cursor at the unexpected token
+    expected (str)
+        : What was expected instead
+    """
+
+    token = cursor.peek()
+
+    if token is None:
+        line_num = cursor.previous.line_num if cursor.previous is not None else 1
+        error("Expected %s but found the end of the source code" % expected, line_num)
+
+    error("Expected %s but found %s" % (expected, token.type), token.line_num)
+
+
+def reduce(ast, operands, operators, precedence):
+    """
+    Builds the nodes of the operators on top of the operator stack which bind at least as tight as a
+    given precedence
+    Params
+    ======
+    ast        (Ast)
+        : The syntax tree
+    operands   (list)
+        : Stack of operand nodes
+    operators  (list)
+        : Stack of (tag, value, line, precedence or operand count) of pending operators and brackets
+    precedence (int)
+        : Precedence of the operator which comes next, 0 to build all operators up to a bracket
+    """
+
+    while operators and operators[-1][0] in ("binary", "unary") and operators[-1][3] >= precedence:
+        tag, value, line_num, _ = operators.pop()
+
+        if tag == "binary":
+            right = operands.pop()
+            operands[-1] = ast.add(BINARY, value, line_num, (operands[-1], right))
+        else:
+            operands[-1] = ast.add(UNARY, value, line_num, (operands[-1],))
+
+
+def close_bracket(cursor, ast, operands, operators):
+    """
+    Builds the node of the bracket closed by the current token
+    Params
+    ======
+    cursor    (TokenCursor)
+        : Cursor at the closing bracket
+    ast       (Ast)
+        : The syntax tree
+    operands  (list)
+        : Stack of operand nodes
+    operators (list)
+        : Stack of pending operators and brackets, with the bracket on top
+    """
+
+    tag, value, line_num, base = operators[-1]
+
+    if CLOSERS[tag] != cursor.peek().type:
+        unexpected(cursor, CLOSERS[tag])
+    operators.pop()
+
+    if tag == "call":
+        node = ast.add(CALL, -1, line_num, operands[base - 1 :])
+        del operands[base - 1 :]
+    elif tag == "index":
+        if len(operands) != base + 1:
+            error("Expected one index", line_num)
+        node = ast.add(INDEX, -1, line_num, operands[base - 1 :])
+        del operands[base - 1 :]
+    elif tag == "builtin" or tag == "list":
+        node = ast.add(value if tag == "builtin" else LIST, -1, line_num, operands[base:])
+        del operands[base:]
+    else:
+        return
+
+    operands.append(node)
+
+
+def parse_expression(cursor, ast):
+    """
+    Parses an expression with an operator stack instead of recursion, so that nesting has no limit
+    Params
+    ======
+    cursor (TokenCursor)
+        : Cursor at the first token of the expression, left after its last token
+    ast    (Ast)
+        : The syntax tree receiving the nodes
+    Returns
+    =======
+    (int)
+        : The node of the expression
+    """
+
+    operands = []
+    operators = []
+
+    # Number of brackets which are open
+    depth = 0
+
+    # Whether an operand comes next, else an operator, a bracket or the end of the expression
+    expect_operand = True
+
+    while True:
+        token = cursor.peek()
+        type = token.type if token is not None else None
+
+        if expect_operand:
+            if type in ATOMS:
+                value = token.val if type in ("id", "number", "string") else -1
+                operands.append(ast.add(ATOMS[type], value, token.line_num))
+                expect_operand = False
+            elif type in UNARY_PRECEDENCE:
+                operators.append(
+                    ("unary", TOKEN_CODES[type], token.line_num, UNARY_PRECEDENCE[type])
+                )
+            elif type == "left_paren":
+                operators.append(("group", -1, token.line_num, len(operands)))
+                depth += 1
+            elif type == "token_left_bracket":
+                operators.append(("list", -1, token.line_num, len(operands)))
+                depth += 1
+            elif type in BUILTINS:
+                cursor.advance()
+                if cursor.peek() is None or cursor.peek().type != "left_paren":
+                    unexpected(cursor, "left_paren")
+                operators.append(("builtin", BUILTINS[type], token.line_num, len(operands)))
+                depth += 1
+            elif (
+                operators
+                and operators[-1][0] in LISTS
+                and operators[-1][3] == len(operands)
+                and type == CLOSERS[operators[-1][0]]
+            ):
+                # Empty list of arguments or elements
+                close_bracket(cursor, ast, operands, operators)
+                depth -= 1
+                expect_operand = False
+            else:
+                unexpected(cursor, "an expression")
+
+        elif type in BINARY_PRECEDENCE:
+            precedence = BINARY_PRECEDENCE[type]
+            reduce(ast, operands, operators, precedence)
+            operators.append(("binary", TOKEN_CODES[type], token.line_num, precedence))
+            expect_operand = True
+        elif type in POSTFIX_OPERATORS:
+            operands[-1] = ast.add(POSTFIX, TOKEN_CODES[type], token.line_num, (operands[-1],))
+        elif type == "left_paren":
+            operators.append(("call", -1, token.line_num, len(operands)))
+            depth += 1
+            expect_operand = True
+        elif type == "token_left_bracket":
+            operators.append(("index", -1, token.line_num, len(operands)))
+            depth += 1
+            expect_operand = True
+        elif depth and type == "comma":
+            reduce(ast, operands, operators, 0)
+            if operators[-1][0] not in LISTS:
+                unexpected(cursor, CLOSERS[operators[-1][0]])
+            expect_operand = True
+        elif depth and type in ("right_paren", "token_right_bracket"):
+            reduce(ast, operands, operators, 0)
+            close_bracket(cursor, ast, operands, operators)
+            depth -= 1
+        else:
+            # Anything else ends the expression, unless a bracket is still open
+            if depth:
+                reduce(ast, operands, operators, 0)
+                unexpected(cursor, CLOSERS[operators[-1][0]])
+            break
+
+        cursor.advance()
+
+    reduce(ast, operands, operators, 0)
+
+    return operands[0]
+
+
+def parse_simple_statement(cursor, ast):
+    """
+    Parses a statement without a block: a declaration, an assignment or an expression
+    Params
+    ======
+    cursor (TokenCursor)
+        : Cursor at the first token of the statement
+    ast    (Ast)
+        : The syntax tree receiving the nodes
+    Returns
+    =======
+    (int)
+        : The node of the statement
+    """
+
+    token = cursor.peek()
+
+    # Declaration, with an optional first assignment
+    if token.type == "var":
+        cursor.advance()
+        name = cursor.expect("id")
+
+        children = []
+        operator = cursor.peek()
+        if operator is not None and operator.type in ASSIGNMENTS:
+            cursor.advance()
+            target = ast.add(NAME, name.val, name.line_num)
+            value = parse_expression(cursor, ast)
+            children.append(
+                ast.add(ASSIGN, TOKEN_CODES[operator.type], operator.line_num, (target, value))
+            )
+
+        return ast.add(VAR, name.val, token.line_num, children)
+
+    node = parse_expression(cursor, ast)
+
+    operator = cursor.peek()
+    if operator is not None and operator.type in ASSIGNMENTS:
+        if ast.kinds[node] not in (NAME, INDEX):
+            error("Cannot assign to %s" % NODE_KINDS[ast.kinds[node]], operator.line_num)
+
+        cursor.advance()
+        value = parse_expression(cursor, ast)
+        node = ast.add(ASSIGN, TOKEN_CODES[operator.type], operator.line_num, (node, value))
+
+    return node
+
+
+def parse_clause(cursor, ast):
+    """
+    Parses one clause of the header of a for loop, which may be empty
+    Params
+    ======
+    cursor (TokenCursor)
+        : Cursor at the first token of the clause
+    ast    (Ast)
+        : The syntax tree receiving the nodes
+    Returns
+    =======
+    (int)
+        : The node of the clause
+    """
+
+    token = cursor.peek()
+    if token is not None and token.type in ("comma", "begin_block"):
+        return ast.add(EMPTY, -1, token.line_num)
+
+    return parse_simple_statement(cursor, ast)
+
+
+def open_block(cursor, ast, stack):
+    """
+    Parses the header of a statement with a block and opens the block
+    Params
+    ======
+    cursor (TokenCursor)
+        : Cursor at the keyword of the statement
+    ast    (Ast)
+        : The syntax tree receiving the nodes
+    stack  (list)
+        : The open statements, receiving [kind, value, line, children, statements of the block]
+    """
+
+    token = cursor.advance()
+    type = token.type
+    value = -1
+    children = []
+
+    if type == "if" or type == "while":
+        children.append(parse_expression(cursor, ast))
+
+    # for condition: or for initialization, condition, step:
+    elif type == "for":
+        clauses = [parse_clause(cursor, ast)]
+        while cursor.accept("comma"):
+            clauses.append(parse_clause(cursor, ast))
+
+        if len(clauses) == 1:
+            empty = ast.add(EMPTY, -1, token.line_num)
+            clauses = [empty, clauses[0], empty]
+        elif len(clauses) != 3:
+            error("Expected one or three clauses in for loop", token.line_num)
+        children.extend(clauses)
+
+    # fun name(parameters):
+    elif type == "fun":
+        value = cursor.expect("id").val
+        cursor.expect("left_paren")
+
+        if not cursor.accept("right_paren"):
+            while True:
+                parameter = cursor.expect("id")
+                children.append(ast.add(NAME, parameter.val, parameter.line_num))
+                if not cursor.accept("comma"):
+                    break
+            cursor.expect("right_paren")
+
+    elif type == "class":
+        value = cursor.expect("id").val
+
+    cursor.expect("begin_block")
+
+    stack.append([HEADERS[type], value, token.line_num, children, []])
+
+
+def close_block(cursor, ast, stack):
+    """
+    Closes the innermost block, and its statement unless an elif, else or the while of a do loop
+    follows
+    Params
+    ======
+    cursor (TokenCursor)
+        : Cursor after the end of the block
+    ast    (Ast)
+        : The syntax tree receiving the nodes
+    stack  (list)
+        : The open statements
+    """
+
+    statement = stack.pop()
+    kind, value, line_num, children, statements = statement
+
+    children.append(ast.add(BLOCK, -1, line_num, statements))
+
+    # Empty lines may come before the keyword continuing the statement
+    k = 0
+    while cursor.peek(k) is not None and cursor.peek(k).type == "newline":
+        k += 1
+    following = cursor.peek(k)
+    following = following.type if following is not None else None
+
+    # if has pairs of condition and block, an odd number of children means the else block is closed
+    if kind == IF and len(children) % 2 == 0 and following in ("elif", "else"):
+        for _ in range(k + 1):
+            cursor.advance()
+
+        if following == "elif":
+            children.append(parse_expression(cursor, ast))
+        cursor.expect("begin_block")
+
+        statement[4] = []
+        stack.append(statement)
+        return
+
+    if kind == DO:
+        for _ in range(k):
+            cursor.advance()
+        cursor.expect("while")
+        children.append(parse_expression(cursor, ast))
+        end_statement(cursor)
+
+    stack[-1][4].append(ast.add(kind, value, line_num, children))
+
+
+def end_statement(cursor):
+    """
+    Checks that a statement ends at the end of its line
+    Params
+    ======
+    cursor (TokenCursor)
+        : Cursor after the statement
+    """
+
+    token = cursor.peek()
+    if token is not None and token.type not in ("newline", "unindent"):
+        unexpected(cursor, "newline")
+
+
+def parse(tokens):
+    """
+    Parses the tokens of a program into a syntax tree, statements and expressions are parsed with
+    explicit stacks, so time is linear and deeply nested programs do not hit the recursion limit
+    Params
+    ======
+    tokens (iterable)
+        : The tokens of the program, for example a list, a TokenStream or the scanner's token
+          generator which is then parsed while it is scanned, comments have to be scanned so that the
+          end of multi line comments is found
+    Returns
+    =======
+    (Ast)
+        : The syntax tree, the values of names and constants are the symbol ids of the scanner's table
+    """
+
+    cursor = TokenCursor(strip_comments(tokens))
+    ast = Ast()
+
+    # Statements whose block is open, the innermost last: [kind, value, line, children, statements]
+    stack = [[PROGRAM, -1, 1, [], []]]
+
+    while True:
+        token = cursor.peek()
+
+        # The end of the tokens closes the blocks left open
+        if token is None:
+            if len(stack) == 1:
+                break
+            close_block(cursor, ast, stack)
+            continue
+
+        type = token.type
+
+        if type == "newline":
+            cursor.advance()
+        elif type == "unindent":
+            cursor.advance()
+            if len(stack) > 1:
+                close_block(cursor, ast, stack)
+        elif type in HEADERS:
+            open_block(cursor, ast, stack)
+        else:
+            stack[-1][4].append(parse_simple_statement(cursor, ast))
+            end_statement(cursor)
+
+    ast.root = ast.add(PROGRAM, -1, 1, stack[0][4])
+
+    return ast
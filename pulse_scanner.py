@@ -1,6 +1,19 @@
 # Standard library to take input as command line argument
 import sys
 
+# Standard library to decode binary streams incrementally
+import codecs
+
+# Standard library to count the cores
+import os
+
+# Standard library to import the scanning engines by name
+import importlib
+import importlib.util
+
+# Standard library for iterator building blocks
+from itertools import chain
+
 # Import some helper functions
 from global_helpers import error, is_alpha, is_alnum, is_digit
 
@@ -10,6 +23,56 @@ from token_class import Token
 # Import Scanner class
 from scanner_class import Scanner
 
+# Import Span class
+from span_class import Span
+
+# Import the classes of scan results
+from scan_result_class import Diagnostic, ScanResult
+
+# Import LineIndex class
+from line_index_class import LineIndex
+
+# Import the declarative token specification
+from token_spec import KEYWORDS, OPERATORS, master_pattern
+
+# Master pattern and operator lookup table, built once from the token specification
+MASTER_PATTERN = master_pattern()
+OPERATOR_TYPES = dict(OPERATORS)
+
+# The same for utf-8 encoded source code, such as a memory mapped file
+BYTES_MASTER_PATTERN = master_pattern(binary=True)
+BYTES_OPERATOR_TYPES = {lexeme.encode("ascii"): type for lexeme, type in OPERATORS}
+
+# Number of characters read at once when tokens are streamed from a file
+CHUNK_SIZE = 1 << 16
+
+# Error messages of the scanner
+INVALID_NUMBER = "Invalid numeric constant, cannot have more than one decimal point in a number!"
+UNTERMINATED_STRING = "Unterminated string!"
+
+# Version of the tokens the scanner produces, part of the keys of cached tokens. It has to be
+# increased with every change to the tokens, values, line numbers or offsets of some source code:
+# 1 = first cached version, 2 = token offsets, reference engine fixes and staged dedents
+SCANNER_VERSION = 2
+
+# Scanning engines by name, as (module, function), the modules are imported when an engine is first
+# used since some of them import this module or numpy
+ENGINES = {
+    "reference": ("pulse_scanner", "reference_engine"),
+    "regex": ("pulse_scanner", "regex_scanner"),
+    "bytes": ("pulse_scanner", "bytes_scanner"),
+    "vector": ("pulse_vector", "vector_scanner"),
+    "parallel": ("pulse_parallel", "parallel_scanner"),
+}
+
+# Least number of characters for which the auto engine picks the vector engine, below it importing
+# numpy and building the arrays costs more than the scan saves
+VECTOR_MIN_SIZE = 1 << 16
+
+# Least number of characters for which the auto engine picks the parallel engine when there is more
+# than one core, below it starting the worker processes costs more than the scan saves
+PARALLEL_MIN_SIZE = 1 << 22
+
 
 def is_keyword(value):
     """
@@ -24,24 +87,7 @@ def is_keyword(value):
         : Whether the value passed is a keyword or not
     """
 
-    return value in [
-        "and",
-        "or",
-        "var",
-        "print",
-        "while",
-        "input",
-        "if",
-        "else",
-        "class",
-        "fun",
-        "for",
-        "do",
-        "not",
-        "true",
-        "false",
-        "elif",
-    ]
+    return value in KEYWORDS
 
 
 def keyword_identifier(source_code, i, table, scanner_obj):
@@ -118,7 +164,7 @@ def string_val(source_code, i, table, scanner_obj, start_char='"'):
     # Loop until we get a non-digit character
     while source_code[i] != start_char:
         if source_code[i] == "\0":
-            error("Unterminated string!", scanner_obj.line_num)
+            error(UNTERMINATED_STRING, scanner_obj.line_num)
 
         string_constant += source_code[i]
         i += 1
@@ -136,6 +182,33 @@ def string_val(source_code, i, table, scanner_obj, start_char='"'):
     return Token("string", id, scanner_obj.line_num), i
 
 
+def numeric_type(numeric_constant):
+    """
+    Determines the datatype of a numeric constant
+    Params
+    ======
+    numeric_constant (str)
+        : The digits and decimal point of the numeric constant
+    Returns
+    =======
+    (str)
+        : The datatype of the numeric constant (int/float/double)
+    """
+
+    # Check the length after . to distinguish between float and double
+    length = len(numeric_constant.split(".")[1]) if "." in numeric_constant else 0
+
+    # Determine type of numeric value
+    type = "int"
+    if length != 0:
+        if length <= 7:
+            type = "float"
+        elif length >= 7:
+            type = "double"
+
+    return type
+
+
 def numeric_val(source_code, i, table, scanner_obj):
     """
     Processes numeric values in the source code
@@ -166,22 +239,10 @@ def numeric_val(source_code, i, table, scanner_obj):
 
     # If a numeric constant contains more than 1 decimal point (.) then that is invalid
     if numeric_constant.count(".") > 1:
-        error(
-            "Invalid numeric constant, cannot have more than one decimal point in a"
-            " number!",
-            scanner_obj.line_num,
-        )
-
-    # Check the length after . to distinguish between float and double
-    length = len(numeric_constant.split(".")[1]) if "." in numeric_constant else 0
+        error(INVALID_NUMBER, scanner_obj.line_num)
 
     # Determine type of numeric value
-    type = "int"
-    if length != 0:
-        if length <= 7:
-            type = "float"
-        elif length >= 7:
-            type = "double"
+    type = numeric_type(numeric_constant)
 
     # Make entry in symbol table
     id = table.entry(numeric_constant, type, "constant")
@@ -246,7 +307,6 @@ def gen_unindent(scanner_obj):
     """
 
     if scanner_obj.unindentLevel > 0:
-        print("Here-", scanner_obj.indentLevel)
         while scanner_obj.unindentLevel != 0:
             token = Token("unindent", "", scanner_obj.line_num)
             scanner_obj.tokens.append(token)
@@ -254,12 +314,14 @@ def gen_unindent(scanner_obj):
             scanner_obj.unindentLevel -= 1
             scanner_obj.indentLevel -= 1
 
-        scanner_obj.isIndent = False
+        # Blocks which are still open go on tracking indentation
+        scanner_obj.isIndent = scanner_obj.indentLevel > 0
 
 
-def scanner(source_code, table):
+def reference_scanner(source_code, table):
     """
-    Generate tokens from source code
+    Generate tokens from source code by testing the source code character by character, kept as
+    the reference implementation against which the table driven scanner is verified
     Params
     ======
     source_code (str)
@@ -387,7 +449,8 @@ def scanner(source_code, table):
         # Identifying single line comment token
         elif source_code[i] == "#":
             i += 1
-            while source_code[i] != "\n":
+            # A comment on the last line ends at the end of the source code
+            while source_code[i] != "\n" and source_code[i] != "\0":
                 comment_str += str(source_code[i])
                 i += 1
             scanner_obj.tokens.append(
@@ -494,3 +557,820 @@ def scanner(source_code, table):
 
     # Return the generated tokens
     return scanner_obj.tokens
+
+
+def char_at(source_code, i):
+    """
+    Decodes the character starting at an index of utf-8 encoded source code
+    Params
+    ======
+    source_code (bytes)
+        : The utf-8 encoded pulse source code
+    i           (int)
+        : The index of the first byte of the character
+    Returns
+    =======
+    (str)
+        : The character, or the replacement character if the bytes are not valid utf-8
+    (int)
+        : Index of the first byte after the character
+    """
+
+    # The first byte of a utf-8 sequence tells the length of the sequence
+    lead = source_code[i]
+    size = 1 if lead < 0xC0 else 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+
+    return source_code[i : i + size].decode("utf-8", "replace"), i + size
+
+
+def identifier_end(source_code, i):
+    """
+    Finds the end of an identifier containing non ascii characters
+    Params
+    ======
+    source_code (str/bytes)
+        : The string containing pulse source code, or its utf-8 encoded bytes
+    i           (int)
+        : The current index in the source code
+    Returns
+    =======
+    (int)
+        : Index of the first character after the identifier
+    """
+
+    length = len(source_code)
+
+    # Loop until we get a character which cannot be part of an identifier
+    if isinstance(source_code, str):
+        while i < length and is_alnum(source_code[i]):
+            i += 1
+    else:
+        while i < length:
+            char, next = char_at(source_code, i)
+            if not is_alnum(char):
+                break
+            i = next
+
+    return i
+
+
+def report(msg, source_code, i, scanner_obj):
+    """
+    Reports an error in the source code, the scanner exits unless it collects diagnostics
+    Params
+    ======
+    msg         (str)
+        : The error message
+    source_code (str/bytes)
+        : Pulse source code or the chunk of it being scanned
+    i           (int)
+        : Index in the source code where the error starts
+    scanner_obj (Scanner)
+        : Instance of Scanner class
+    """
+
+    if scanner_obj.diagnostics is None:
+        error(msg, scanner_obj.line_num)
+
+    # Count the column from the last line break, which may be in an earlier chunk of a stream
+    line_break = source_code.rfind("\n" if isinstance(source_code, str) else b"\n", 0, i)
+    start = line_break + 1 if line_break != -1 else scanner_obj.line_start - scanner_obj.offset
+    if start >= 0:
+        column = LineIndex.column(source_code, start, i)
+    else:
+        column = LineIndex.column(source_code, 0, i) - start
+
+    scanner_obj.diagnostics.append(Diagnostic(msg, scanner_obj.line_num, column))
+
+
+def scan_tokens(source_code, i, table, scanner_obj, final=True, stop=None):
+    """
+    Generate tokens from source code, matching one whole lexeme of the token specification per step
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code or a chunk of it, either as a string or as utf-8 encoded bytes (any
+          bytes like object, such as a memory mapped file)
+    i           (int)
+        : The index in the source code where scanning starts
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    scanner_obj (Scanner)
+        : Instance of Scanner class holding the lexer state, which is carried across calls
+    final       (bool) (Optional)
+        : Whether the source code ends at the end of this string, when False scanning stops before
+          a lexeme which reaches the end of the string because it might continue in the next chunk
+    stop        (int) (Optional)
+        : Index at which no new lexeme is started, the lexeme starting before it is scanned whole,
+          by default scanning goes on to the end of the string
+    Yields
+    ======
+    (Token)
+        : The tokens of the source code as soon as they are complete
+    Returns
+    =======
+    (int)
+        : The index in the source code where scanning stopped
+    """
+
+    # Offsets of tokens are counted from the start of the whole source code, of which this may be a chunk
+    base = scanner_obj.offset
+    spans = scanner_obj.spans
+
+    # Tokens which are not wanted are never created
+    keep_comments = scanner_obj.comments
+    keep_newlines = scanner_obj.newlines
+
+    # Bytes are matched on byte values, and only the values of tokens are decoded
+    binary = not isinstance(source_code, str)
+
+    # Cache lookups used for every lexeme
+    if binary:
+        match = BYTES_MASTER_PATTERN.match
+        operator_types = BYTES_OPERATOR_TYPES
+        high, space, newline = 0x80, b" ", b"\n"
+    else:
+        match = MASTER_PATTERN.match
+        operator_types = OPERATOR_TYPES
+        high, space, newline = "\x80", " ", "\n"
+    length = len(source_code)
+    limit = length if stop is None else stop
+
+    # Loop through the source code lexeme by lexeme
+    while i < limit:
+        m = match(source_code, i)
+        kind = m.lastgroup
+        end = m.end()
+
+        # Identifiers can contain non ascii letters
+        if kind == "ident":
+            if end < length and source_code[end] >= high:
+                end = identifier_end(source_code, end)
+        elif kind == "unicode":
+            char, end = char_at(source_code, m.start()) if binary else (m.group(), end)
+            end = identifier_end(source_code, end) if is_alpha(char) else m.end()
+
+        # The lexeme might continue in the next chunk, so leave it for the next call
+        if end == length and not final:
+            return i
+
+        i = end
+
+        # Keywords and identifiers
+        if kind == "ident":
+            value = m.group() if end == m.end() else source_code[m.start() : end]
+            if binary:
+                value = value.decode("utf-8")
+
+            if value in KEYWORDS:
+                yield Token(value, "", scanner_obj.line_num, base + m.start(), base + end)
+            else:
+                # Check if identifier is in symbol table, else give a placeholder datatype var
+                id = table.get_by_symbol(value)
+                if id == -1:
+                    id = table.entry(value, "var", "variable")
+                yield Token("id", id, scanner_obj.line_num, base + m.start(), base + end)
+
+        # Whitespace and characters which do not form any token
+        elif kind == "skip":
+            continue
+
+        # Operators, brackets and begin block
+        elif kind == "op":
+            type = operator_types[m.group()]
+            yield Token(type, "", scanner_obj.line_num, base + m.start(), base + end)
+
+            # Start indentation after ':'
+            if type == "begin_block":
+                scanner_obj.isIndent = True
+                scanner_obj.indentLevel += 1
+
+        # Generate newline token and check for unindentation
+        elif kind == "newline":
+            # Record the state at the start of the line break, where scanning can be restarted
+            if scanner_obj.snapshots is not None:
+                scanner_obj.snapshots.append(
+                    (
+                        m.start(),
+                        scanner_obj.line_num,
+                        scanner_obj.isIndent,
+                        scanner_obj.indentLevel,
+                    )
+                )
+
+            scanner_obj.line_num += 1
+            if keep_newlines:
+                start = base + m.start()
+                yield Token("newline", "", scanner_obj.line_num, start, start + 1)
+
+            if scanner_obj.isIndent:
+                # Count tabs and spaces of the indentation matched after the line break
+                indent = m.group()
+                localSpaceCount = indent.count(space)
+                localTabCount = len(indent) - 1 - localSpaceCount
+
+                # Convert spaces into tabs
+                localTabCount = (
+                    localSpaceCount // 2 if localTabCount == 0 else localTabCount
+                )
+
+                # If the number of tabs are less than the current level of indentation then setup unindentation
+                if localTabCount < scanner_obj.indentLevel:
+                    scanner_obj.isUnindent = True
+                    scanner_obj.unindentLevel = scanner_obj.indentLevel - localTabCount
+
+                # If scanner's indentation level is zero then set isIndent to false
+                if scanner_obj.indentLevel == 0:
+                    scanner_obj.isIndent = False
+
+            # Generate the pending unindent tokens
+            if scanner_obj.unindentLevel > 0:
+                while scanner_obj.unindentLevel != 0:
+                    yield Token("unindent", "", scanner_obj.line_num, base + end, base + end)
+                    scanner_obj.unindentLevel -= 1
+                    scanner_obj.indentLevel -= 1
+
+                # Blocks which are still open go on tracking indentation
+                scanner_obj.isIndent = scanner_obj.indentLevel > 0
+
+        # Numeric constants
+        elif kind == "number":
+            value = m.group().decode("ascii") if binary else m.group()
+            if value.count(".") > 1:
+                report(INVALID_NUMBER, source_code, m.start(), scanner_obj)
+
+            # The token is kept even when it is invalid, so that scanning can go on
+            id = table.entry(value, numeric_type(value), "constant")
+            yield Token("number", id, scanner_obj.line_num, base + m.start(), base + end)
+
+        # String constants with either quote
+        elif kind == "string":
+            value = m.group()
+            if len(value) < 2 or value[-1] != value[0]:
+                report(UNTERMINATED_STRING, source_code, m.start(), scanner_obj)
+
+                # Skip the rest of the line and go on scanning at the line break
+                line_break = source_code.find(newline, m.start(), end)
+                if line_break != -1:
+                    i = line_break
+                continue
+
+            value = value[1:-1].decode("utf-8") if binary else value[1:-1]
+            id = table.entry('"' + value + '"', "string", "constant")
+            yield Token("string", id, scanner_obj.line_num, base + m.start(), base + end)
+
+        # Single line comment, the line break is left for the newline token
+        elif kind == "comment":
+            if not keep_comments:
+                continue
+
+            if spans:
+                value = Span(source_code, m.start() + 1, end)
+            else:
+                value = m.group()[1:]
+                if binary:
+                    value = value.decode("utf-8")
+
+            yield Token(
+                "single_line_comment", value, scanner_obj.line_num, base + m.start(), base + end
+            )
+
+        # Multi line comment, the closing characters are left to be scanned again
+        elif kind == "mcomment":
+            if not keep_comments:
+                continue
+
+            if spans:
+                value = Span(source_code, m.start() + 2, end)
+            else:
+                value = m.group()[2:]
+                if binary:
+                    value = value.decode("utf-8")
+
+            yield Token(
+                "multi_line_comment", value, scanner_obj.line_num, base + m.start(), base + end
+            )
+
+        # Non ascii character which can start an identifier, else it is skipped
+        elif kind == "unicode":
+            if is_alpha(char):
+                value = source_code[m.start() : end]
+                if binary:
+                    value = value.decode("utf-8")
+
+                id = table.get_by_symbol(value)
+                if id == -1:
+                    id = table.entry(value, "var", "variable")
+                yield Token("id", id, scanner_obj.line_num, base + m.start(), base + end)
+
+        # Null character terminates the source code
+        else:
+            scanner_obj.isEnd = True
+            return m.start()
+
+    return i
+
+
+def close_indentation(scanner_obj, offset=-1):
+    """
+    Generates the unindent tokens closing all open blocks at the end of the source code
+    Params
+    ======
+    scanner_obj (Scanner)
+        : Instance of Scanner class
+    offset      (int) (Optional)
+        : Offset of the end of the source code, where the unindent tokens are placed
+    Yields
+    ======
+    (Token)
+        : One unindent token per open indentation level
+    """
+
+    # If indentLevel is not 0 then generate unindent tokens until indentLevel is zero
+    while scanner_obj.indentLevel > 0:
+        yield Token("unindent", "", scanner_obj.line_num, offset, offset)
+        scanner_obj.indentLevel -= 1
+
+
+def regex_scanner(
+    source_code,
+    table,
+    stats=None,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+    workers=None,
+):
+    """
+    Generate tokens from source code with the master pattern, the default engine
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    stats       (ScanStats) (Optional)
+        : Statistics receiving token counts, timings and symbol table counts of this scan
+    diagnostics (list) (Optional)
+        : List receiving the errors in the source code, when given the scanner skips past errors
+          instead of exiting
+    spans       (bool) (Optional)
+        : Whether comment tokens get a Span of the source code as value instead of a copy of their text
+    comments    (bool) (Optional)
+        : Whether comment tokens are generated, when False comments are skipped without copying them
+    newlines    (bool) (Optional)
+        : Whether newline tokens are generated, lines are counted and indentation is tracked either way
+    workers     (int) (Optional)
+        : Ignored, the source code is scanned in this process
+    Returns
+    ========
+    tokens: A list of tokens of the source code
+    """
+
+    # Create scanner_obj class' object
+    scanner_obj = Scanner()
+    scanner_obj.diagnostics = diagnostics
+    scanner_obj.spans = spans
+    scanner_obj.comments = comments
+    scanner_obj.newlines = newlines
+
+    # Instrument the symbol table and the tokens only when statistics are asked for
+    if stats is not None:
+        stats.size += len(source_code)
+        table = stats.count_symbols(table)
+
+    tokens = chain(
+        scan_tokens(source_code, 0, table, scanner_obj),
+        close_indentation(scanner_obj, len(source_code)),
+    )
+
+    if stats is not None:
+        tokens = stats.measure(tokens)
+
+    scanner_obj.tokens.extend(tokens)
+
+    if stats is not None:
+        stats.finish()
+
+    # Return the generated tokens
+    return scanner_obj.tokens
+
+
+def bytes_scanner(
+    source_code,
+    table,
+    stats=None,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+    workers=None,
+):
+    """
+    Generate tokens from the utf-8 encoding of source code with the binary master pattern, the
+    engine of memory mapped files, the offsets of the tokens are byte offsets
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code, text is encoded first
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    stats       (ScanStats) (Optional)
+        : Statistics receiving token counts, timings and symbol table counts of this scan
+    diagnostics (list) (Optional)
+        : List receiving the errors in the source code, when given the scanner skips past errors
+          instead of exiting
+    spans       (bool) (Optional)
+        : Whether comment tokens get a Span of the source code as value instead of a copy of their text
+    comments    (bool) (Optional)
+        : Whether comment tokens are generated
+    newlines    (bool) (Optional)
+        : Whether newline tokens are generated
+    workers     (int) (Optional)
+        : Ignored, the source code is scanned in this process
+    Returns
+    ========
+    tokens: A list of tokens of the source code
+    """
+
+    if isinstance(source_code, str):
+        source_code = source_code.encode("utf-8")
+
+    return regex_scanner(source_code, table, stats, diagnostics, spans, comments, newlines)
+
+
+def reference_engine(
+    source_code,
+    table,
+    stats=None,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+    workers=None,
+):
+    """
+    Generate tokens from source code with reference_scanner, behind the same interface as the other
+    engines, for comparing them with it
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code, the end of the source code is marked with a null character if it is not
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    stats       (ScanStats) (Optional)
+        : Statistics receiving token counts and symbol table counts of this scan, the tokens are all
+          scanned before they are counted so the timings are not meaningful
+    diagnostics (list) (Optional)
+        : Not supported, the reference scanner exits on the first error, ValueError is raised when
+          it is given
+    spans       (bool) (Optional)
+        : Ignored, comment tokens always hold a copy of their text
+    comments    (bool) (Optional)
+        : Whether comment tokens are kept
+    newlines    (bool) (Optional)
+        : Whether newline tokens are kept
+    workers     (int) (Optional)
+        : Ignored, the source code is scanned in this process
+    Returns
+    ========
+    tokens: A list of tokens of the source code
+    """
+
+    if diagnostics is not None:
+        raise ValueError(
+            "The reference engine exits on the first error, it cannot collect diagnostics"
+        )
+
+    # Any buffer, such as a memory mapped file, is decoded
+    if not isinstance(source_code, str):
+        source_code = bytes(source_code).decode("utf-8")
+    if not source_code.endswith("\0"):
+        source_code += "\0"
+
+    # Instrument the symbol table and the tokens only when statistics are asked for
+    if stats is not None:
+        stats.size += len(source_code)
+        table = stats.count_symbols(table)
+
+    tokens = reference_scanner(source_code, table)
+
+    # The reference scanner generates every token, the ones which are not asked for are left out
+    skipped = set()
+    if not comments:
+        skipped.update(("single_line_comment", "multi_line_comment"))
+    if not newlines:
+        skipped.add("newline")
+    if skipped:
+        tokens = [token for token in tokens if token.type not in skipped]
+
+    if stats is not None:
+        tokens = list(stats.measure(tokens))
+        stats.finish()
+
+    # Return the generated tokens
+    return tokens
+
+
+def register_engine(name, module, function):
+    """
+    Adds a scanning engine, or replaces the one of the same name
+    Params
+    ======
+    name     (str)
+        : Name of the engine, as passed to scanner
+    module   (str)
+        : Name of the module of the engine, it is imported when the engine is first used
+    function (str)
+        : Name of the function of the engine in the module, it is called with the arguments of
+          scanner (except engine) as keywords and returns the tokens
+    """
+
+    ENGINES[name] = (module, function)
+
+
+def get_engine(name):
+    """
+    Returns the function of a scanning engine
+    Params
+    ======
+    name (str)
+        : Name of the engine
+    Returns
+    =======
+    (function)
+        : The function of the engine
+    """
+
+    if name not in ENGINES:
+        raise ValueError("Unknown scanning engine %r" % (name,))
+
+    module, function = ENGINES[name]
+
+    return getattr(importlib.import_module(module), function)
+
+
+def select_engine(source_code, workers=None):
+    """
+    Picks the engine of the auto policy by the size of the source code and the number of cores
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code
+    workers     (int) (Optional)
+        : Number of worker processes which may be used, by default one per core
+    Returns
+    =======
+    (str)
+        : Name of the engine
+    """
+
+    cores = workers if workers is not None else os.cpu_count() or 1
+
+    if cores > 1 and len(source_code) >= PARALLEL_MIN_SIZE:
+        return "parallel"
+
+    # The vector engine falls back to the regex engine without numpy, so it is not worth importing
+    if len(source_code) >= VECTOR_MIN_SIZE and importlib.util.find_spec("numpy") is not None:
+        return "vector"
+
+    return "regex"
+
+
+def scanner(
+    source_code,
+    table,
+    stats=None,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+    workers=None,
+    engine=None,
+):
+    """
+    Generate tokens from source code
+    Params
+    ======
+    source_code (str)
+        : Pulse source code
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    stats       (ScanStats) (Optional)
+        : Statistics receiving token counts, timings and symbol table counts of this scan
+    diagnostics (list) (Optional)
+        : List receiving the errors in the source code, when given the scanner skips past errors
+          instead of exiting
+    spans       (bool) (Optional)
+        : Whether comment tokens get a Span of the source code as value instead of a copy of their text
+    comments    (bool) (Optional)
+        : Whether comment tokens are generated, when False comments are skipped without copying them
+    newlines    (bool) (Optional)
+        : Whether newline tokens are generated, lines are counted and indentation is tracked either way
+    workers     (int) (Optional)
+        : Number of worker processes scanning chunks of a large source code, see
+          pulse_parallel.parallel_scanner, by default the source code is scanned in this process
+    engine      (str) (Optional)
+        : Name of the engine in ENGINES, or auto to pick one with select_engine, by default the
+          parallel engine for more than one worker and the regex engine otherwise
+    Returns
+    ========
+    tokens: A list of tokens of the source code
+    """
+
+    if engine is None:
+        engine = "parallel" if workers is not None and workers > 1 else "regex"
+    elif engine == "auto":
+        engine = select_engine(source_code, workers)
+
+    return get_engine(engine)(
+        source_code,
+        table,
+        stats=stats,
+        diagnostics=diagnostics,
+        spans=spans,
+        comments=comments,
+        newlines=newlines,
+        workers=workers,
+    )
+
+
+def scan_with_diagnostics(source_code, table, stats=None):
+    """
+    Generate tokens from source code without exiting on errors, for scanning many files in one
+    process where some of them may be broken
+    Params
+    ======
+    source_code (str)
+        : Pulse source code
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    stats       (ScanStats) (Optional)
+        : Statistics receiving token counts, timings and symbol table counts of this scan
+    Returns
+    ========
+    ScanResult: The tokens of the source code and the errors found in it
+    """
+
+    diagnostics = []
+    tokens = scanner(source_code, table, stats, diagnostics)
+
+    return ScanResult(tokens, diagnostics)
+
+
+def iter_tokens(
+    file_or_stream,
+    table,
+    chunk_size=CHUNK_SIZE,
+    stats=None,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+):
+    """
+    Generate tokens from a file while reading it in bounded chunks, so that memory stays flat and
+    the first tokens are available before the whole file is read
+    Params
+    ======
+    file_or_stream (str/file)
+        : Path to a pulse source file, or a text/binary stream (anything with a read method)
+    table          (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    chunk_size     (int) (Optional)
+        : Number of characters read from the stream at once
+    stats          (ScanStats) (Optional)
+        : Statistics receiving token counts, timings and symbol table counts of this scan
+    diagnostics    (list) (Optional)
+        : List receiving the errors in the source code, when given the scanner skips past errors
+          instead of exiting
+    spans          (bool) (Optional)
+        : Whether comment tokens get a Span of the chunk holding them as value instead of a copy of
+          their text
+    comments       (bool) (Optional)
+        : Whether comment tokens are generated
+    newlines       (bool) (Optional)
+        : Whether newline tokens are generated
+    Yields
+    ======
+    (Token)
+        : The tokens of the source code as soon as they are complete
+    """
+
+    # Open paths ourselves and close them once the tokens are exhausted
+    if not hasattr(file_or_stream, "read"):
+        with open(file_or_stream, "r") as file:
+            yield from iter_tokens(
+                file, table, chunk_size, stats, diagnostics, spans, comments, newlines
+            )
+        return
+
+    # Instrument the symbol table and the tokens only when statistics are asked for
+    if stats is not None:
+        table = stats.count_symbols(table)
+        yield from stats.measure(
+            read_tokens(
+                file_or_stream, table, chunk_size, stats, diagnostics, spans, comments, newlines
+            )
+        )
+        stats.finish()
+        return
+
+    yield from read_tokens(
+        file_or_stream,
+        table,
+        chunk_size,
+        diagnostics=diagnostics,
+        spans=spans,
+        comments=comments,
+        newlines=newlines,
+    )
+
+
+def read_tokens(
+    stream,
+    table,
+    chunk_size,
+    stats=None,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+):
+    """
+    Generate tokens from a stream while reading it in bounded chunks
+    Params
+    ======
+    stream      (file)
+        : A text or binary stream (anything with a read method)
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    chunk_size  (int)
+        : Number of characters read from the stream at once
+    stats       (ScanStats) (Optional)
+        : Statistics counting the characters read
+    diagnostics (list) (Optional)
+        : List receiving the errors in the source code instead of exiting
+    spans       (bool) (Optional)
+        : Whether comment tokens get a Span as value instead of a copy of their text
+    comments    (bool) (Optional)
+        : Whether comment tokens are generated
+    newlines    (bool) (Optional)
+        : Whether newline tokens are generated
+    Yields
+    ======
+    (Token)
+        : The tokens of the source code as soon as they are complete
+    """
+
+    # Binary streams are decoded chunk by chunk, keeping split utf-8 sequences for the next chunk
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    # Create scanner_obj class' object
+    scanner_obj = Scanner()
+    scanner_obj.diagnostics = diagnostics
+    scanner_obj.spans = spans
+    scanner_obj.comments = comments
+    scanner_obj.newlines = newlines
+
+    # Unscanned tail of the previous chunk, which holds an incomplete lexeme, and the chunks read
+    # since it was last scanned
+    buffer = ""
+    i = 0
+    pending = []
+    pending_size = 0
+
+    while True:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+
+        if stats is not None:
+            stats.size += len(chunk)
+
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk, final)
+
+        # An incomplete lexeme is scanned again only once the text read after it is as long as it,
+        # so that a long string or comment is not scanned from its start for every chunk
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if not final and pending_size < len(buffer) - i:
+            continue
+
+        # Move the offset of the buffer past the scanned characters, keeping track of the last line
+        # break for the columns of diagnostics
+        line_break = buffer.rfind("\n", 0, i)
+        if line_break != -1:
+            scanner_obj.line_start = scanner_obj.offset + line_break + 1
+        scanner_obj.offset += i
+
+        buffer = buffer[i:] + "".join(pending)
+        pending = []
+        pending_size = 0
+        i = yield from scan_tokens(buffer, 0, table, scanner_obj, final)
+
+        if final or scanner_obj.isEnd:
+            break
+
+    yield from close_indentation(scanner_obj, scanner_obj.offset + len(buffer))
@@ -0,0 +1,224 @@
+# Standard library to parse command line arguments
+import argparse
+
+# Standard library for operating system dependent functionality
+import os
+
+# Standard library for streams in memory
+import io
+
+# Standard library for network servers
+import socketserver
+
+# Standard library to handle signals
+import signal
+
+# Standard library for context managers
+from contextlib import redirect_stderr
+
+# Import the protocol of the scan daemon
+from pulse_client import SOCKET_PATH, recv_message, request, send_message
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import scanner
+from pulse_scanner import iter_tokens
+
+# Import TokenWriter class
+from token_writer_class import TokenWriter
+
+# Import the command line interface, which the daemon runs for scan requests
+from pulse import build_parser, run
+
+# Response telling the client to scan in its own process
+FALLBACK = {"status": "fallback"}
+
+
+def scan_command(argv, cwd):
+    """
+    Runs the command line interface for a client
+    Params
+    ======
+    argv (list)   = Command line arguments of the client
+    cwd  (string) = Working directory of the client, relative paths are resolved against it, so
+                    that the daemon's own working directory stays the same
+    Returns
+    =======
+    dict: The header of the response, with the exit status and the text written to stderr
+    bytes: The tokens written to stdout
+    """
+
+    out = io.BytesIO()
+    err = io.StringIO()
+
+    # Whatever the command line interface prints goes to the client, not the daemon's terminal
+    with redirect_stderr(err):
+        try:
+            args = build_parser().parse_args(argv)
+        except SystemExit:
+            # The client prints the usage error itself
+            return FALLBACK, b""
+
+        # Statistics time the scan in the client's process
+        if args.stats:
+            return FALLBACK, b""
+
+        # Errors are always collected, exiting on them is reproduced by the client itself
+        keep_going = args.keep_going
+        args.keep_going = True
+
+        args.files = [os.path.join(cwd, path) for path in args.files]
+        if args.cache:
+            args.cache = os.path.join(cwd, args.cache)
+
+        try:
+            status = run(args, out, err)
+        except (OSError, ValueError, SystemExit):
+            # Files which cannot be read, and options the daemon cannot honour such as the reference
+            # engine with errors collected, are reported by the client
+            return FALLBACK, b""
+
+    if status and not keep_going:
+        return FALLBACK, b""
+
+    return {"status": "ok", "exit": status, "stderr": err.getvalue()}, out.getvalue()
+
+
+def scan_inline(header, body):
+    """
+    Scans source code sent by a client
+    Params
+    ======
+    header (dict)  = Header of the request, with the format of the tokens and whether the symbol
+                     table is written
+    body   (bytes) = The utf-8 encoded source code
+    Returns
+    =======
+    dict: The header of the response, with the errors in the source code, or an error message if
+          the source code is not utf-8
+    bytes: The tokens in the requested format
+    """
+
+    table = SymbolTable()
+    diagnostics = []
+
+    out = io.BytesIO()
+    writer = TokenWriter(out, header.get("format", "binary"))
+
+    # Scanned like a file opened in text mode
+    stream = io.TextIOWrapper(io.BytesIO(body), encoding="utf-8")
+    try:
+        writer.write(iter_tokens(stream, table, diagnostics=diagnostics))
+    except UnicodeDecodeError as exception:
+        return {"status": "error", "message": "Source code is not utf-8: %s" % exception}, b""
+
+    if header.get("symbols"):
+        writer.write_symbols(table)
+
+    response = {
+        "status": "ok",
+        "diagnostics": [
+            (diagnostic.msg, diagnostic.line_num, diagnostic.column) for diagnostic in diagnostics
+        ],
+    }
+    return response, out.getvalue()
+
+
+class ScanRequestHandler(socketserver.BaseRequestHandler):
+    """
+    ScanRequestHandler class answers one request of a client
+    """
+
+    def handle(self):
+        """
+        Receives a request, scans and sends the response
+        """
+
+        self.request.settimeout(self.server.timeout)
+
+        try:
+            header, body = recv_message(self.request)
+        except (OSError, ValueError):
+            return
+
+        if "argv" in header:
+            response, output = scan_command(header["argv"], header["cwd"])
+        elif header.get("source"):
+            response, output = scan_inline(header, body)
+        else:
+            response, output = FALLBACK, b""
+
+        try:
+            send_message(self.request, response, output)
+        except OSError:
+            pass
+
+
+class ScanServer(socketserver.UnixStreamServer):
+    """
+    ScanServer class is the scan daemon, it answers requests one after another in one warm process so
+    that clients pay neither the interpreter start nor the imports
+    """
+
+    # Seconds a client may take to send its request
+    timeout = 10
+
+
+def serve(socket_path=SOCKET_PATH):
+    """
+    Runs the scan daemon until it is interrupted
+    Params
+    ======
+    socket_path (string) = Path of the socket to listen on
+    """
+
+    # The directory of the socket is created private to the user, other users must not own it so that
+    # they cannot replace the socket (root owns shared directories such as the one for temporary files)
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if os.stat(directory).st_uid not in (os.getuid(), 0):
+        raise SystemExit("The directory %s of the socket belongs to another user" % directory)
+
+    # A socket file left by a daemon which is no longer running is replaced
+    if os.path.exists(socket_path):
+        if request({}, socket_path=socket_path) is not None:
+            raise SystemExit("A pulse daemon is already listening on %s" % socket_path)
+        os.remove(socket_path)
+
+    server = ScanServer(socket_path, ScanRequestHandler)
+
+    # Only the user may connect, also when the directory is shared
+    os.chmod(socket_path, 0o600)
+
+    # Stopping the daemon with a signal removes its socket as well
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(socket_path)
+
+
+def serve_main(argv):
+    """
+    Starts the scan daemon from the command line, as pulse.py serve
+    Params
+    ======
+    argv (list) = Command line arguments after serve
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="pulse.py serve", description="Scan daemon of the pulse language"
+    )
+    parser.add_argument(
+        "--socket",
+        default=SOCKET_PATH,
+        help="path of the unix domain socket (default: %s)" % SOCKET_PATH,
+    )
+    args = parser.parse_args(argv)
+
+    serve(args.socket)
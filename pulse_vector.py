@@ -0,0 +1,461 @@
+# Standard library for binary search in sorted lists
+from bisect import bisect_left
+
+# Standard library for iterator building blocks
+from itertools import chain
+
+# NumPy is optional, without it the vector engine scans with the regular expression engine
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Import Token class
+from token_class import Token
+
+# Import Scanner class
+from scanner_class import Scanner
+
+# Import the reserved words and operators of pulse
+from token_spec import KEYWORDS, OPERATORS
+
+# Import scanner
+from pulse_scanner import (
+    BYTES_OPERATOR_TYPES,
+    INVALID_NUMBER,
+    OPERATOR_TYPES,
+    close_indentation,
+    numeric_type,
+    report,
+    scan_tokens,
+)
+
+# Classes of bytes found by the pre-pass
+SKIP, DIGIT, LETTER, OPERATOR, NEWLINE, COMPLEX = range(6)
+
+# Kinds of the lexemes found by the pre-pass, complex lexemes (strings, comments, non ascii characters
+# and the null character) are left to the regular expression engine
+LEXEME_COMPLEX, LEXEME_NUMBER, LEXEME_IDENT, LEXEME_OPERATOR, LEXEME_NEWLINE = range(5)
+
+
+def class_table():
+    """
+    Builds the table of the class of every byte value
+    Returns
+    =======
+    (ndarray)
+        : 256 byte classes, indexed by byte value
+    """
+
+    classes = np.full(256, SKIP, dtype=np.uint8)
+
+    # '.' is a digit as in global_helpers.DIGITS, digits continue identifiers
+    classes[list(b"0123456789.")] = DIGIT
+    classes[list(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_")] = LETTER
+    classes[list({ord(char) for lexeme, _ in OPERATORS for char in lexeme})] = OPERATOR
+    classes[ord("\n")] = NEWLINE
+
+    # Strings, comments, the null character and non ascii characters need the full lexer
+    classes[list(b"\"'#\0")] = COMPLEX
+    classes[0x80:] = COMPLEX
+
+    return classes
+
+
+# Byte classes and the codes (first byte * 256 + second byte) of the two character operators
+if np is not None:
+    CLASSES = class_table()
+    PAIR_CODES = np.array(
+        [ord(lexeme[0]) * 256 + ord(lexeme[1]) for lexeme, _ in OPERATORS if len(lexeme) == 2],
+        dtype=np.uint16,
+    )
+
+
+def runs(mask):
+    """
+    Finds the runs of true values of a boolean array
+    Params
+    ======
+    mask (ndarray)
+        : Boolean array
+    Returns
+    =======
+    (ndarray)
+        : Index of the first value of every run
+    (ndarray)
+        : Index after the last value of every run
+    """
+
+    edges = np.diff(mask.view(np.int8), prepend=np.int8(0), append=np.int8(0))
+
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def run_ends(mask, positions):
+    """
+    Finds where the runs of true values starting at some positions end
+    Params
+    ======
+    mask      (ndarray)
+        : Boolean array
+    positions (ndarray)
+        : Sorted positions, which may be one past the end of the array
+    Returns
+    =======
+    (ndarray)
+        : For every position, the index after the run containing it, or the position itself if the
+          value there is false
+    """
+
+    starts, ends = runs(mask)
+
+    k = np.searchsorted(starts, positions, side="right") - 1
+    run_end = ends[np.maximum(k, 0)] if len(ends) else np.zeros_like(positions)
+
+    return np.where((k >= 0) & (run_end > positions), run_end, positions)
+
+
+def prepass(data, length):
+    """
+    Classifies all bytes at once and finds the lexemes which do not need the full lexer
+    Params
+    ======
+    data   (bytes)
+        : utf-8 encoded (or ascii) source code, any bytes like object such as a memory mapped file
+    length (int)
+        : Number of bytes to look at, up to and including the first null character
+    Returns
+    =======
+    (list)
+        : Start of every lexeme in increasing order, skipped characters are not part of any lexeme
+    (list)
+        : End of every lexeme, for complex lexemes the end of what is known of them
+    (list)
+        : Kind of every lexeme, one of the LEXEME_ constants
+    (list)
+        : Indentation width (in tabs) after every line break, 0 for other lexemes
+    """
+
+    arr = np.frombuffer(data, dtype=np.uint8, count=length)
+    classes = CLASSES[arr]
+
+    # A run of digits and letters is a number followed by an identifier, either of which may be empty
+    word_starts, word_ends = runs((classes == DIGIT) | (classes == LETTER))
+    letters = np.append(np.flatnonzero(classes == LETTER), length)
+    first_letter = np.minimum(letters[np.searchsorted(letters, word_starts)], word_ends)
+
+    is_number = first_letter > word_starts
+    number_starts = word_starts[is_number]
+    number_ends = first_letter[is_number]
+
+    is_ident = first_letter < word_ends
+    ident_starts = first_letter[is_ident]
+    ident_ends = word_ends[is_ident]
+
+    # An identifier followed by a non ascii character may continue with it
+    followed = ident_ends < length
+    ident_kinds = np.full(len(ident_starts), LEXEME_IDENT, dtype=np.uint8)
+    ident_kinds[followed] = np.where(
+        arr[ident_ends[followed]] >= 0x80, LEXEME_COMPLEX, LEXEME_IDENT
+    )
+
+    # A line break is followed by the tabs and then the spaces of the indentation
+    newline_starts = np.flatnonzero(classes == NEWLINE)
+    tab_ends = run_ends(arr == ord("\t"), newline_starts + 1)
+    newline_ends = run_ends(arr == ord(" "), tab_ends)
+
+    tabs = tab_ends - newline_starts - 1
+    spaces = newline_ends - tab_ends
+    widths = np.where(tabs == 0, spaces // 2, tabs)
+
+    # Operators are matched greedily, in a chain of overlapping two character operators every other
+    # position starts one
+    pairs = np.zeros(length, dtype=bool)
+    if length > 1:
+        codes = arr[:-1].astype(np.uint16) * 256 + arr[1:]
+        pairs[:-1] = np.isin(codes, PAIR_CODES)
+
+    pair_starts = np.flatnonzero(pairs)
+    if len(pair_starts):
+        chain_starts, _ = runs(pairs)
+        chain_start = chain_starts[np.searchsorted(chain_starts, pair_starts, side="right") - 1]
+        pair_starts = pair_starts[(pair_starts - chain_start) % 2 == 0]
+
+    is_operator = classes == OPERATOR
+    is_operator[pair_starts + 1] = False
+
+    # '!' is an operator only as part of '!='
+    is_pair_start = np.zeros(length, dtype=bool)
+    is_pair_start[pair_starts] = True
+    is_operator &= ~((arr == ord("!")) & ~is_pair_start)
+
+    operator_starts = np.flatnonzero(is_operator)
+    operator_ends = operator_starts + 1 + is_pair_start[operator_starts]
+
+    # '/*' starts a multi line comment instead of an operator
+    operator_kinds = np.full(len(operator_starts), LEXEME_OPERATOR, dtype=np.uint8)
+    followed = operator_starts + 1 < length
+    operator_kinds[followed] = np.where(
+        (arr[operator_starts[followed]] == ord("/"))
+        & (arr[operator_starts[followed] + 1] == ord("*")),
+        LEXEME_COMPLEX,
+        LEXEME_OPERATOR,
+    )
+
+    complex_starts = np.flatnonzero(classes == COMPLEX)
+
+    starts = np.concatenate(
+        (number_starts, ident_starts, newline_starts, operator_starts, complex_starts)
+    )
+    ends = np.concatenate(
+        (number_ends, ident_ends, newline_ends, operator_ends, complex_starts + 1)
+    )
+    kinds = np.concatenate(
+        (
+            np.full(len(number_starts), LEXEME_NUMBER, dtype=np.uint8),
+            ident_kinds,
+            np.full(len(newline_starts), LEXEME_NEWLINE, dtype=np.uint8),
+            operator_kinds,
+            np.full(len(complex_starts), LEXEME_COMPLEX, dtype=np.uint8),
+        )
+    )
+    indents = np.concatenate(
+        (
+            np.zeros(len(number_starts) + len(ident_starts), dtype=widths.dtype),
+            widths,
+            np.zeros(len(operator_starts) + len(complex_starts), dtype=widths.dtype),
+        )
+    )
+
+    order = np.argsort(starts, kind="stable")
+
+    return (
+        starts[order].tolist(),
+        ends[order].tolist(),
+        kinds[order].tolist(),
+        indents[order].tolist(),
+    )
+
+
+def scan_tokens_vector(source_code, i, table, scanner_obj):
+    """
+    Generate tokens from source code like scan_tokens, jumping from lexeme to lexeme with the lexemes
+    found by the NumPy pre-pass, only strings, comments and non ascii characters are matched one
+    by one
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code, either as a string or as utf-8 encoded bytes (any bytes like object,
+          such as a memory mapped file)
+    i           (int)
+        : The index in the source code where scanning starts
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    scanner_obj (Scanner)
+        : Instance of Scanner class holding the lexer state
+    Yields
+    ======
+    (Token)
+        : The tokens of the source code, the same as scan_tokens yields
+    Returns
+    =======
+    (int)
+        : The index in the source code where scanning stopped
+    """
+
+    binary = not isinstance(source_code, str)
+
+    # Offsets of a string are only the offsets of its utf-8 encoding if it is ascii
+    if np is None or not (binary or source_code.isascii()):
+        return (yield from scan_tokens(source_code, i, table, scanner_obj))
+
+    data = source_code if binary else source_code.encode("ascii")
+    length = len(source_code)
+
+    # Nothing after the null character is scanned
+    null = data.find(b"\0", i)
+    starts, ends, kinds, indents = prepass(data, length if null == -1 else null + 1)
+
+    # Cache lookups used for every lexeme
+    base = scanner_obj.offset
+    operator_types = BYTES_OPERATOR_TYPES if binary else OPERATOR_TYPES
+    count = len(starts)
+
+    # Only skipped characters are between the end of the last lexeme and the next lexeme found
+    k = bisect_left(starts, i)
+    synced = k == 0 or ends[k - 1] <= i
+
+    while True:
+        if synced:
+            if k == count:
+                return length
+
+            start = starts[k]
+            kind = kinds[k]
+            end = ends[k]
+
+            # Keywords and identifiers
+            if kind == LEXEME_IDENT:
+                value = source_code[start:end]
+                if binary:
+                    value = value.decode("ascii")
+
+                if value in KEYWORDS:
+                    yield Token(value, "", scanner_obj.line_num, base + start, base + end)
+                else:
+                    # Check if identifier is in symbol table, else give a placeholder datatype var
+                    id = table.get_by_symbol(value)
+                    if id == -1:
+                        id = table.entry(value, "var", "variable")
+                    yield Token("id", id, scanner_obj.line_num, base + start, base + end)
+
+                k += 1
+                continue
+
+            # Operators, brackets and begin block
+            if kind == LEXEME_OPERATOR:
+                type = operator_types[source_code[start:end]]
+                yield Token(type, "", scanner_obj.line_num, base + start, base + end)
+
+                # Start indentation after ':'
+                if type == "begin_block":
+                    scanner_obj.isIndent = True
+                    scanner_obj.indentLevel += 1
+
+                k += 1
+                continue
+
+            # Generate newline token and check for unindentation
+            if kind == LEXEME_NEWLINE:
+                # Record the state at the start of the line break, where scanning can be restarted
+                if scanner_obj.snapshots is not None:
+                    scanner_obj.snapshots.append(
+                        (
+                            start,
+                            scanner_obj.line_num,
+                            scanner_obj.isIndent,
+                            scanner_obj.indentLevel,
+                        )
+                    )
+
+                scanner_obj.line_num += 1
+                if scanner_obj.newlines:
+                    yield Token("newline", "", scanner_obj.line_num, base + start, base + start + 1)
+
+                if scanner_obj.isIndent:
+                    # The pre-pass measured the indentation in tabs already
+                    localTabCount = indents[k]
+
+                    # If the number of tabs are less than the current level of indentation then setup unindentation
+                    if localTabCount < scanner_obj.indentLevel:
+                        scanner_obj.isUnindent = True
+                        scanner_obj.unindentLevel = scanner_obj.indentLevel - localTabCount
+
+                    # If scanner's indentation level is zero then set isIndent to false
+                    if scanner_obj.indentLevel == 0:
+                        scanner_obj.isIndent = False
+
+                # Generate the pending unindent tokens
+                if scanner_obj.unindentLevel > 0:
+                    while scanner_obj.unindentLevel != 0:
+                        yield Token("unindent", "", scanner_obj.line_num, base + end, base + end)
+                        scanner_obj.unindentLevel -= 1
+                        scanner_obj.indentLevel -= 1
+
+                    # Blocks which are still open go on tracking indentation
+                    scanner_obj.isIndent = scanner_obj.indentLevel > 0
+
+                k += 1
+                continue
+
+            # Numeric constants
+            if kind == LEXEME_NUMBER:
+                value = source_code[start:end]
+                if binary:
+                    value = value.decode("ascii")
+
+                if value.count(".") > 1:
+                    report(INVALID_NUMBER, source_code, start, scanner_obj)
+
+                id = table.entry(value, numeric_type(value), "constant")
+                yield Token("number", id, scanner_obj.line_num, base + start, base + end)
+
+                k += 1
+                continue
+
+            i = start
+
+        # Complex lexemes, and lexemes after one which ended inside a run, go through the full lexer
+        i = yield from scan_tokens(source_code, i, table, scanner_obj, True, i + 1)
+
+        if scanner_obj.isEnd or i >= length:
+            return i
+
+        k = bisect_left(starts, i, k)
+        synced = k == 0 or ends[k - 1] <= i
+
+
+def vector_scanner(
+    source_code,
+    table,
+    stats=None,
+    diagnostics=None,
+    spans=False,
+    comments=True,
+    newlines=True,
+    workers=None,
+):
+    """
+    Generate tokens from source code with the vector engine, the tokens are the same as the ones of
+    pulse_scanner.scanner
+    Params
+    ======
+    source_code (str/bytes)
+        : Pulse source code
+    table       (SymbolTable)
+        : Symbol table constructed holding information about identifiers and constants
+    stats       (ScanStats) (Optional)
+        : Statistics receiving token counts, timings and symbol table counts of this scan
+    diagnostics (list) (Optional)
+        : List receiving the errors in the source code, when given the scanner skips past errors
+          instead of exiting
+    spans       (bool) (Optional)
+        : Whether comment tokens get a Span of the source code as value instead of a copy of their text
+    comments    (bool) (Optional)
+        : Whether comment tokens are generated
+    newlines    (bool) (Optional)
+        : Whether newline tokens are generated
+    workers     (int) (Optional)
+        : Ignored, the source code is scanned in this process
+    Returns
+    ========
+    tokens: A list of tokens of the source code
+    """
+
+    # Create scanner_obj class' object
+    scanner_obj = Scanner()
+    scanner_obj.diagnostics = diagnostics
+    scanner_obj.spans = spans
+    scanner_obj.comments = comments
+    scanner_obj.newlines = newlines
+
+    # Instrument the symbol table and the tokens only when statistics are asked for
+    if stats is not None:
+        stats.size += len(source_code)
+        table = stats.count_symbols(table)
+
+    tokens = chain(
+        scan_tokens_vector(source_code, 0, table, scanner_obj),
+        close_indentation(scanner_obj, len(source_code)),
+    )
+
+    if stats is not None:
+        tokens = stats.measure(tokens)
+
+    scanner_obj.tokens.extend(tokens)
+
+    if stats is not None:
+        stats.finish()
+
+    # Return the generated tokens
+    return scanner_obj.tokens
@@ -0,0 +1,329 @@
+# The module for system-specific parameters and functions
+import sys
+
+# Standard library to parse command line arguments
+import argparse
+
+# Import some helper functions
+from global_helpers import error
+
+# Import Function class
+from bytecode_class import Function
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import scanner
+from pulse_scanner import scanner
+
+# Import parser
+from pulse_parser import parse
+
+# Import compiler
+from pulse_compiler import compile_ast
+
+# Import optimizer
+from pulse_optimizer import optimize
+
+# Import the reading of source files of the command line interface
+from pulse import readFile
+
+# Import the instruction set
+from opcode_spec import (
+    ADD_LOCAL_CONST,
+    BINARY,
+    BINARY_FUNCTIONS,
+    BINARY_LOCAL_CONST,
+    BINARY_LOCALS,
+    BRANCH_LOCAL_CONST,
+    BRANCH_LOCALS,
+    BUILD_LIST,
+    CALL,
+    DUP_TWO,
+    FUNCTION,
+    HALT,
+    INPUT,
+    JUMP,
+    JUMP_IF_FALSE,
+    JUMP_IF_FALSE_OR_POP,
+    JUMP_IF_TRUE,
+    JUMP_IF_TRUE_OR_POP,
+    LOAD_CONST,
+    LOAD_GLOBAL,
+    LOAD_INDEX,
+    LOAD_LOCAL,
+    POP,
+    PRINT,
+    RETURN,
+    STORE_GLOBAL,
+    STORE_INDEX,
+    STORE_LOCAL,
+    UNARY,
+    UNARY_FUNCTIONS,
+)
+
+# Maximum number of nested function calls
+MAX_FRAMES = 10000
+
+# Exceptions of the operations on values, which are errors of the pulse program
+RUNTIME_ERRORS = (TypeError, ValueError, ZeroDivisionError, IndexError, OverflowError)
+
+
+def to_string(value, nested=False):
+    """
+    Returns the text print shows for a value
+    Params
+    ======
+    value  (object)
+        : The value
+    nested (bool) (Optional)
+        : Whether the value is an element of a list, strings are quoted then
+    Returns
+    =======
+    (str)
+        : The text of the value
+    """
+
+    if value is None:
+        return "nil"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, list):
+        return "[%s]" % ", ".join(to_string(element, True) for element in value)
+    if isinstance(value, Function):
+        return "<fun>"
+    if isinstance(value, str) and nested:
+        return '"%s"' % value
+
+    return str(value)
+
+
+def execute(bytecode, out=None, inp=None):
+    """
+    Runs a compiled program, the instructions are dispatched by one loop over a plain list of the
+    code, the tests are ordered by how often the instructions run and everything the loop uses is a
+    local variable
+    Params
+    ======
+    bytecode (Bytecode)
+        : The compiled program
+    out      (file) (Optional)
+        : Text stream receiving what the program prints, sys.stdout by default
+    inp      (file) (Optional)
+        : Text stream the program reads its input from, sys.stdin by default
+    Returns
+    =======
+    (int)
+        : Number of instructions executed
+    """
+
+    out = sys.stdout if out is None else out
+    inp = sys.stdin if inp is None else inp
+
+    # A list is indexed faster than an array, whose items are boxed on every access
+    code = bytecode.code.tolist()
+    consts = bytecode.consts
+    functions = bytecode.functions
+    binary_functions = BINARY_FUNCTIONS
+    unary_functions = UNARY_FUNCTIONS
+
+    # The most frequent opcodes are compared with local variables instead of module globals
+    branch_local_const, add_local_const, binary_local_const = (
+        BRANCH_LOCAL_CONST,
+        ADD_LOCAL_CONST,
+        BINARY_LOCAL_CONST,
+    )
+    branch_locals, binary_locals, binary = BRANCH_LOCALS, BINARY_LOCALS, BINARY
+    load_local, store_local, load_const, jump = LOAD_LOCAL, STORE_LOCAL, LOAD_CONST, JUMP
+
+    # The locals of the program are its globals
+    globals = [None] * bytecode.globals
+    locals = globals
+
+    stack = []
+    push = stack.append
+    pop = stack.pop
+
+    # Return address, locals and stack height of every active call
+    frames = []
+
+    pc = 0
+    steps = 0
+
+    try:
+        while True:
+            opcode = code[pc]
+            steps += 1
+
+            if opcode == branch_local_const:
+                if binary_functions[code[pc + 1]](locals[code[pc + 2]], consts[code[pc + 3]]):
+                    pc += 5
+                else:
+                    pc = code[pc + 4]
+            elif opcode == add_local_const:
+                locals[code[pc + 1]] += consts[code[pc + 2]]
+                pc += 3
+            elif opcode == load_local:
+                push(locals[code[pc + 1]])
+                pc += 2
+            elif opcode == load_const:
+                push(consts[code[pc + 1]])
+                pc += 2
+            elif opcode == store_local:
+                locals[code[pc + 1]] = pop()
+                pc += 2
+            elif opcode == jump:
+                pc = code[pc + 1]
+            elif opcode == binary_local_const:
+                push(binary_functions[code[pc + 1]](locals[code[pc + 2]], consts[code[pc + 3]]))
+                pc += 4
+            elif opcode == binary:
+                right = pop()
+                stack[-1] = binary_functions[code[pc + 1]](stack[-1], right)
+                pc += 2
+            elif opcode == branch_locals:
+                if binary_functions[code[pc + 1]](locals[code[pc + 2]], locals[code[pc + 3]]):
+                    pc += 5
+                else:
+                    pc = code[pc + 4]
+            elif opcode == binary_locals:
+                push(binary_functions[code[pc + 1]](locals[code[pc + 2]], locals[code[pc + 3]]))
+                pc += 4
+            elif opcode == LOAD_GLOBAL:
+                push(globals[code[pc + 1]])
+                pc += 2
+            elif opcode == STORE_GLOBAL:
+                globals[code[pc + 1]] = pop()
+                pc += 2
+            elif opcode == JUMP_IF_FALSE:
+                pc = pc + 2 if pop() else code[pc + 1]
+            elif opcode == LOAD_INDEX:
+                index = pop()
+                stack[-1] = stack[-1][index]
+                pc += 1
+            elif opcode == STORE_INDEX:
+                value = pop()
+                index = pop()
+                pop()[index] = value
+                pc += 1
+            elif opcode == CALL:
+                count = code[pc + 1]
+                function = stack[-count - 1]
+                if not isinstance(function, Function):
+                    error("Can only call functions", bytecode.line(pc))
+                if count != function.params:
+                    error(
+                        "Expected %d arguments but got %d" % (function.params, count),
+                        bytecode.line(pc),
+                    )
+                if len(frames) == MAX_FRAMES:
+                    error("Stack overflow", bytecode.line(pc))
+
+                frames.append((pc + 2, locals, len(stack) - count - 1))
+                locals = stack[len(stack) - count :] + [None] * (function.locals - count)
+                del stack[len(stack) - count - 1 :]
+                pc = function.entry
+            elif opcode == RETURN:
+                pc, locals, height = frames.pop()
+                del stack[height:]
+                push(None)
+            elif opcode == POP:
+                pop()
+                pc += 1
+            elif opcode == UNARY:
+                stack[-1] = unary_functions[code[pc + 1]](stack[-1])
+                pc += 2
+            elif opcode == JUMP_IF_TRUE:
+                pc = code[pc + 1] if pop() else pc + 2
+            elif opcode == JUMP_IF_FALSE_OR_POP:
+                if stack[-1]:
+                    pop()
+                    pc += 2
+                else:
+                    pc = code[pc + 1]
+            elif opcode == JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    pc = code[pc + 1]
+                else:
+                    pop()
+                    pc += 2
+            elif opcode == DUP_TWO:
+                stack.extend(stack[-2:])
+                pc += 1
+            elif opcode == BUILD_LIST:
+                count = code[pc + 1]
+                elements = stack[len(stack) - count :]
+                del stack[len(stack) - count :]
+                push(elements)
+                pc += 2
+            elif opcode == FUNCTION:
+                push(functions[code[pc + 1]])
+                pc += 2
+            elif opcode == PRINT:
+                count = code[pc + 1]
+                values = stack[len(stack) - count :]
+                del stack[len(stack) - count :]
+                out.write(" ".join(map(to_string, values)) + "\n")
+                pc += 2
+            elif opcode == INPUT:
+                count = code[pc + 1]
+                values = stack[len(stack) - count :]
+                del stack[len(stack) - count :]
+                out.write(" ".join(map(to_string, values)))
+                out.flush()
+                line = inp.readline()
+                push(line.rstrip("\r\n") if line else None)
+                pc += 2
+            elif opcode == HALT:
+                return steps
+            else:
+                error("Unknown opcode %d" % opcode, bytecode.line(pc))
+
+    except RUNTIME_ERRORS as exception:
+        error("Runtime error: %s" % exception, bytecode.line(pc))
+
+
+def run_main(argv):
+    """
+    Compiles and runs a pulse program from the command line, as pulse.py run
+    Params
+    ======
+    argv (list) = Command line arguments after run
+    """
+
+    parser = argparse.ArgumentParser(prog="pulse.py run", description="Runs a pulse program")
+    parser.add_argument("file", help="path to the pulse source file")
+    parser.add_argument(
+        "--disassemble",
+        action="store_true",
+        help="print the bytecode of the program instead of running it",
+    )
+    parser.add_argument(
+        "--no-optimize",
+        action="store_true",
+        help="run the bytecode as it is compiled, without the optimization passes",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report the number of instructions every optimization pass saved on stderr",
+    )
+    args = parser.parse_args(argv)
+
+    table = SymbolTable()
+    ast = parse(scanner(readFile(args.file), table))
+
+    if args.no_optimize:
+        bytecode = compile_ast(ast, table)
+    else:
+        bytecode, report = optimize(ast, table)
+        if args.stats:
+            for name, saved in report.items():
+                print("%-20s %6d instructions saved" % (name, saved), file=sys.stderr)
+
+    if args.disassemble:
+        print(bytecode.disassemble())
+    else:
+        execute(bytecode)
@@ -0,0 +1,62 @@
+class Diagnostic:
+    """
+    Diagnostic class describes an error found in source code without stopping the scanner
+    """
+
+    __slots__ = ("msg", "line_num", "column")
+
+    def __init__(self, msg, line_num, column):
+        """
+        Class initializer
+        Params
+        ======
+        msg      (string) = The error message
+        line_num (int)    = Line number, counted like the line numbers of tokens
+        column   (int)    = Column of the error, counted from 1 after the last line break
+        """
+
+        self.msg = msg
+        self.line_num = line_num
+        self.column = column
+
+    def __str__(self):
+        """
+        Returns
+        =======
+        string: The diagnostic formatted like the messages of global_helpers.error
+        """
+
+        return "[Line %d:%d] Error: %s" % (self.line_num, self.column, self.msg)
+
+
+class ScanResult:
+    """
+    ScanResult class holds the tokens of a scan together with the errors found while scanning
+    """
+
+    def __init__(self, tokens, diagnostics=(), entries=None, stats=None):
+        """
+        Class initializer
+        Params
+        ======
+        tokens      (list/TokenStream) = The tokens of the source code
+        diagnostics (list)             = The errors found while scanning, the scanner skipped past them
+        entries     (list)             = The [value, type, typedata] symbol table entries of the scan, if
+                                         it used a symbol table of its own
+        stats       (ScanStats)        = Statistics of the scan, if they were collected
+        """
+
+        self.tokens = tokens
+        self.diagnostics = list(diagnostics)
+        self.entries = entries
+        self.stats = stats
+
+    @property
+    def ok(self):
+        """
+        Returns
+        =======
+        bool: Whether the source code was scanned without errors
+        """
+
+        return not self.diagnostics
@@ -0,0 +1,216 @@
+# Standard library for timing
+import time
+
+# Import the reserved words of pulse and the token type of every code
+from token_spec import KEYWORDS, TOKEN_TYPES
+
+# Sub-lexer producing each token type, other token types are produced by the operator lexer
+LEXERS = {
+    "number": "numeric_val",
+    "string": "string_val",
+    "id": "keyword_identifier",
+    "single_line_comment": "comments",
+    "multi_line_comment": "comments",
+    "newline": "indentation",
+    "unindent": "indentation",
+}
+LEXERS.update((keyword, "keyword_identifier") for keyword in KEYWORDS)
+
+
+class ScanStats:
+    """
+    ScanStats class collects statistics of scanner runs, scanning without a ScanStats object costs nothing
+    """
+
+    def __init__(self, hooks=()):
+        """
+        Initializer of ScanStats class
+        Params
+        ======
+        hooks (list) = Functions called with the ScanStats object after every scan, for example to
+                       export the numbers to a metrics system
+        Values
+        ======
+        token_counts   (dict)  = Number of tokens of every token type
+        lexer_times    (dict)  = Seconds spent in every sub-lexer, including the whitespace skipped
+                                 before its tokens
+        symbol_lookups (int)   = Number of symbol table lookups
+        symbol_inserts (int)   = Number of symbol table entries made
+        size           (int)   = Number of characters (or bytes) scanned
+        seconds        (float) = Seconds spent scanning, without the time spent by consumers of the tokens
+        cache_hits     (int)   = Number of files loaded from a cache instead of scanned
+        hooks          (list)  = Functions called after every scan
+        """
+
+        self.token_counts = {}
+        self.lexer_times = {}
+        self.symbol_lookups = 0
+        self.symbol_inserts = 0
+        self.size = 0
+        self.seconds = 0.0
+        self.cache_hits = 0
+        self.hooks = list(hooks)
+
+    def count_symbols(self, table):
+        """
+        Returns a view of a symbol table which counts lookups and inserts
+        Params
+        ======
+        table (SymbolTable) = The symbol table used by the scanner
+        Returns
+        =======
+        CountingSymbolTable: The counting view of the table
+        """
+
+        return CountingSymbolTable(table, self)
+
+    def measure(self, tokens):
+        """
+        Times the production of every token and counts the tokens
+        Params
+        ======
+        tokens (iterator) = Tokens produced by the scanner
+        Yields
+        ======
+        Token: The tokens, unchanged
+        """
+
+        counts = self.token_counts
+        times = self.lexer_times
+        clock = time.perf_counter
+
+        before = clock()
+        for token in tokens:
+            elapsed = clock() - before
+
+            type = token.type
+            lexer = LEXERS.get(type, "operators")
+            times[lexer] = times.get(lexer, 0.0) + elapsed
+            counts[type] = counts.get(type, 0) + 1
+            self.seconds += elapsed
+
+            yield token
+            before = clock()
+
+        self.seconds += clock() - before
+
+    def count_cached(self, tokens, size, inserts):
+        """
+        Counts the tokens of a file loaded from a cache, which take no scanning time
+        Params
+        ======
+        tokens  (TokenStream) = The cached tokens
+        size    (int)         = Number of characters (or bytes) of the file
+        inserts (int)         = Number of symbol table entries of the file
+        """
+
+        counts = self.token_counts
+        for kind in tokens.kinds:
+            type = TOKEN_TYPES[kind]
+            counts[type] = counts.get(type, 0) + 1
+
+        self.symbol_inserts += inserts
+        self.size += size
+        self.cache_hits += 1
+
+    def merge(self, other):
+        """
+        Adds the statistics of another ScanStats object, for example one collected by a worker process
+        Params
+        ======
+        other (ScanStats) = The statistics to be added
+        """
+
+        for type, count in other.token_counts.items():
+            self.token_counts[type] = self.token_counts.get(type, 0) + count
+        for lexer, seconds in other.lexer_times.items():
+            self.lexer_times[lexer] = self.lexer_times.get(lexer, 0.0) + seconds
+
+        self.symbol_lookups += other.symbol_lookups
+        self.symbol_inserts += other.symbol_inserts
+        self.size += other.size
+        self.seconds += other.seconds
+        self.cache_hits += other.cache_hits
+
+    def finish(self):
+        """
+        Calls the hooks once a scan is complete
+        """
+
+        for hook in self.hooks:
+            hook(self)
+
+    def __getstate__(self):
+        """
+        Returns
+        =======
+        dict: The statistics without the hooks, which may not be picklable, for worker processes
+        """
+
+        state = dict(self.__dict__)
+        state["hooks"] = []
+        return state
+
+    def __str__(self):
+        """
+        Returns
+        =======
+        string: Human readable report of the statistics
+        """
+
+        lines = [
+            "Scanned %d characters in %.6fs (%.2f MB/s)"
+            % (self.size, self.seconds, self.size / self.seconds / 1e6 if self.seconds else 0.0),
+            "Symbol table: %d lookups, %d inserts" % (self.symbol_lookups, self.symbol_inserts),
+            "Files loaded from the cache: %d" % self.cache_hits,
+            "Time per sub-lexer:",
+        ]
+        for lexer, seconds in sorted(self.lexer_times.items(), key=lambda item: -item[1]):
+            lines.append("  %-20s %.6fs" % (lexer, seconds))
+
+        lines.append("Tokens per type:")
+        for type, count in sorted(self.token_counts.items(), key=lambda item: -item[1]):
+            lines.append("  %-20s %d" % (type, count))
+
+        return "\n".join(lines)
+
+
+class CountingSymbolTable:
+    """
+    CountingSymbolTable class forwards to a symbol table while counting lookups and inserts
+    """
+
+    def __init__(self, table, stats):
+        """
+        Initializer of CountingSymbolTable class
+        Params
+        ======
+        table (SymbolTable) = The symbol table receiving the calls
+        stats (ScanStats)   = The statistics counting the calls
+        """
+
+        self.table = table
+        self.stats = stats
+
+    def get_by_symbol(self, value):
+        """
+        Counts and forwards a lookup, see SymbolTable.get_by_symbol
+        """
+
+        self.stats.symbol_lookups += 1
+        return self.table.get_by_symbol(value)
+
+    def entry(self, value, type, typedata):
+        """
+        Counts and forwards an insert, see SymbolTable.entry
+        """
+
+        self.stats.symbol_inserts += 1
+        return self.table.entry(value, type, typedata)
+
+    def __getattr__(self, name):
+        """
+        Forwards every other attribute to the symbol table
+        """
+
+        return getattr(self.table, name)
@@ -6,3 +6,11 @@ class Scanner:
         self.isUnindent = False
         self.indentLevel = 0
         self.unindentLevel = 0
+        self.isEnd = False
+        self.snapshots = None
+        self.diagnostics = None
+        self.offset = 0
+        self.line_start = 0
+        self.spans = False
+        self.comments = True
+        self.newlines = True
@@ -0,0 +1,78 @@
+class Span:
+    """
+    Span class is a token value referring to a slice of the source code, the text is only copied out
+    of the source code when it is asked for
+    """
+
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source, start, end):
+        """
+        Class initializer
+        Params
+        ======
+        source (str/bytes) = The source code, or the chunk of it holding the slice
+        start  (int)       = Index of the first character of the slice
+        end    (int)       = Index after the last character of the slice
+        """
+
+        self.source = source
+        self.start = start
+        self.end = end
+
+    def text(self):
+        """
+        Returns
+        =======
+        string: The text of the slice, decoded if the source code is utf-8 encoded
+        """
+
+        value = self.source[self.start : self.end]
+        return value if isinstance(value, str) else bytes(value).decode("utf-8")
+
+    def __str__(self):
+        """
+        Returns
+        =======
+        string: The text of the slice, so that printing a token shows the same as a copied value
+        """
+
+        return self.text()
+
+    def __repr__(self):
+        """
+        Returns
+        =======
+        string: The offsets of the slice, without copying its text
+        """
+
+        return "Span(%d, %d)" % (self.start, self.end)
+
+    def __len__(self):
+        """
+        Returns
+        =======
+        int: The length of the slice in characters (bytes for utf-8 encoded source code)
+        """
+
+        return self.end - self.start
+
+    def __eq__(self, other):
+        """
+        Returns
+        =======
+        bool: Whether the text of the slice equals a string or the text of another span
+        """
+
+        if isinstance(other, Span):
+            other = other.text()
+        return isinstance(other, str) and self.text() == other
+
+    def __hash__(self):
+        """
+        Returns
+        =======
+        int: The hash of the text, equal spans and strings hash alike
+        """
+
+        return hash(self.text())
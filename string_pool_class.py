@@ -0,0 +1,152 @@
+# Standard library for compact arrays of basic values
+from array import array
+
+# Standard library for iterator building blocks
+from itertools import accumulate
+
+# The module for system-specific parameters and functions
+import sys
+
+# Import some helper functions
+from global_helpers import pack_strings
+
+
+class StringPool:
+    """
+    StringPool class stores every distinct string once and refers to it by its position, a pool
+    loaded from a buffer only decodes the strings which are asked for
+    """
+
+    def __init__(self):
+        """
+        Initializer of StringPool class
+        Values
+        ======
+        strings (list)  = The strings by position, None for loaded strings which are not decoded yet
+        index   (dict)  = Position of every string, built on first use for a loaded pool
+        blob    (bytes) = utf-8 encoded strings of a loaded pool
+        offsets (array) = Offset of every loaded string in blob, and the end of the last one
+        """
+
+        self.strings = []
+        self.index = {}
+        self.blob = b""
+        self.offsets = None
+
+    def __len__(self):
+        """
+        Returns
+        =======
+        int: The number of strings
+        """
+
+        return len(self.strings)
+
+    def add(self, string):
+        """
+        Returns the position of a string, adding the string if it is not in the pool yet
+        Params
+        ======
+        string (string) = The string
+        Returns
+        =======
+        int: The position of the string
+        """
+
+        index = self.index if self.index is not None else self.build_index()
+
+        position = index.get(string)
+        if position is None:
+            position = index[string] = len(self.strings)
+            self.strings.append(string)
+
+        return position
+
+    def find(self, string):
+        """
+        Returns the position of a string
+        Params
+        ======
+        string (string) = The string
+        Returns
+        =======
+        int: The position of the string, -1 if it is not in the pool
+        """
+
+        index = self.index if self.index is not None else self.build_index()
+
+        return index.get(string, -1)
+
+    def get(self, position):
+        """
+        Returns the string at a position
+        Params
+        ======
+        position (int) = Position of the string
+        Returns
+        =======
+        string: The string
+        """
+
+        string = self.strings[position]
+
+        # Loaded strings are decoded on first use
+        if string is None:
+            string = self.strings[position] = str(
+                self.blob[self.offsets[position] : self.offsets[position + 1]], "utf-8"
+            )
+
+        return string
+
+    def build_index(self):
+        """
+        Builds the index of a loaded pool, which decodes all strings
+        Returns
+        =======
+        dict: The position of every string
+        """
+
+        self.index = {self.get(position): position for position in range(len(self.strings))}
+
+        return self.index
+
+    def to_bytes(self):
+        """
+        Returns
+        =======
+        bytes: The strings in the format of global_helpers.pack_strings
+        """
+
+        return pack_strings(self.get(position) for position in range(len(self.strings)))
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """
+        Loads a pool written by to_bytes without decoding its strings
+        Params
+        ======
+        data   (bytes) = Buffer holding the pool, for example a memory mapped file which stays in use
+                         by the pool
+        offset (int)   = Offset of the pool in the buffer
+        Returns
+        =======
+        StringPool: The pool
+        int: Offset of the first byte after the pool
+        """
+
+        count = int.from_bytes(data[offset : offset + 4], "little")
+        offset += 4
+
+        lengths = array("I")
+        lengths.frombytes(data[offset : offset + 4 * count])
+        if sys.byteorder == "big":
+            lengths.byteswap()
+        offset += 4 * count
+
+        pool = cls()
+        pool.offsets = array("Q", accumulate(lengths, initial=0))
+        pool.blob = memoryview(data)[offset : offset + pool.offsets[-1]]
+        pool.strings = [None] * count
+        pool.index = None
+
+        return pool, offset + pool.offsets[-1]
@@ -1,23 +1,109 @@
+# Standard library for compact arrays of basic values
+from array import array
+
+# Standard library for abstract container classes
+from collections.abc import Mapping
+
+# The module for system-specific parameters and functions
+import sys
+
+# Import some helper functions
+from global_helpers import map_file, pack_strings, unpack_strings
+
+# Import StringPool class
+from string_pool_class import StringPool
+
+# Datatypes and types of data known in advance, other names get codes when they are first used
+DATATYPES = ("var", "int", "float", "double", "string")
+TYPEDATA = ("variable", "constant")
+
+
 class SymbolTable:
     """
     SymbolTable class is responsible for storing information about identifiers and constants
     """
 
-    def __init__(self):
+    # Magic bytes at the start of a saved symbol table
+    MAGIC = b"PST2"
+
+    def __init__(self, intern_constants=False):
         """
         Initializer of SymbolTable class
+        Params
+        ======
+        intern_constants (bool) = Whether repeated constants share one entry instead of getting a new id each
         Values
         ======
-        id            (int)  = Global id which acts as unique id for a symbol (identifier/constant)
-        symbol_table  (dict) = Dictionary containing the actual symbol table
+        id               (int)        = Global id which acts as unique id for a symbol (identifier/constant)
+        symbol_table     (Mapping)    = Read only view of the table as {id: [value, type, typedata]}
+        pool             (StringPool) = Every distinct value, stored once
+        values           (array)      = Position in the pool of the value of every id (id - 1)
+        types            (array)      = 16 bit code of the datatype of every id, see datatypes
+        typedata         (array)      = 16 bit code of the type of data of every id, see typedata_names
+        first_ids        (array)      = The first id of every value in the pool
+        datatypes        (list)       = Datatype of every code
+        typedata_names   (list)       = Type of data of every code
+        symbol_index     (dict)       = Reverse index from (value position, type code, typedata code) to
+                                        the first id of that entry, built on first use
+        intern_constants (bool)       = Whether repeated constants share one entry
         """
 
         self.id = 1
-        self.symbol_table = {}
+        self.symbol_table = SymbolTableView(self)
+        self.pool = StringPool()
+        self.values = array("I")
+        self.types = array("H")
+        self.typedata = array("H")
+        self.first_ids = array("I")
+        self.datatypes = list(DATATYPES)
+        self.typedata_names = list(TYPEDATA)
+        self.codes = {name: code for code, name in enumerate(DATATYPES)}
+        self.typedata_codes = {name: code for code, name in enumerate(TYPEDATA)}
+        self.symbol_index = {} if intern_constants else None
+        self.intern_constants = intern_constants
+
+    def code(self, names, codes, name):
+        """
+        Returns the code of a datatype or type of data, giving it a new code on first use
+        Params
+        ======
+        names (list)   = Name of every code
+        codes (dict)   = Code of every name
+        name  (string) = The datatype or type of data
+        Returns
+        =======
+        int: The code, ValueError is raised once the 16 bit codes run out
+        """
+
+        code = codes.get(name)
+        if code is None:
+            if len(names) > 0xFFFF:
+                raise ValueError("Too many datatypes or types of data")
+            code = codes[name] = len(names)
+            names.append(name)
+
+        return code
+
+    def index(self):
+        """
+        Returns the reverse index of all entries, building it on first use
+        Returns
+        =======
+        dict: The first id of every (value position, type code, typedata code)
+        """
+
+        if self.symbol_index is None:
+            self.symbol_index = {}
+            for id in range(self.id - 1, 0, -1):
+                key = (self.values[id - 1], self.types[id - 1], self.typedata[id - 1])
+                self.symbol_index[key] = id
+
+        return self.symbol_index
 
     def entry(self, value, type, typedata):
         """
-        Returns id in symbol table after making an entry
+        Returns id in symbol table after making an entry, when constants are interned an existing
+        constant with the same value and type is returned instead of making a new entry
         Params
         ======
         value    (string) = Value to be stored in symbol table (identifier/constant)
@@ -28,7 +114,37 @@ class SymbolTable:
         int: The id of the current entry in symbol table
         """
 
-        self.symbol_table[self.id] = [value, type, typedata]
+        position = self.pool.add(value)
+
+        type_code = self.codes.get(type)
+        if type_code is None:
+            type_code = self.code(self.datatypes, self.codes, type)
+        typedata_code = self.typedata_codes.get(typedata)
+        if typedata_code is None:
+            typedata_code = self.code(self.typedata_names, self.typedata_codes, typedata)
+
+        key = (position, type_code, typedata_code)
+
+        # Reuse the id of an identical constant
+        if self.intern_constants and typedata == "constant":
+            id = self.index().get(key)
+            if id is not None:
+                return id
+
+        # Columns of a loaded table are read only views of its buffer until the first entry
+        if isinstance(self.values, memoryview):
+            self.unmap()
+
+        self.values.append(position)
+        self.types.append(type_code)
+        self.typedata.append(typedata_code)
+
+        # Keep the reverse indices pointing at the first id of every value
+        if position == len(self.first_ids):
+            self.first_ids.append(self.id)
+        if self.symbol_index is not None:
+            self.symbol_index.setdefault(key, self.id)
+
         self.id += 1
         return self.id - 1
 
@@ -43,7 +159,14 @@ class SymbolTable:
         list: [value, type, typedata], typedata = constant/variable
         """
 
-        return self.symbol_table.get(id, [None, None, None])
+        if not 0 < id < self.id:
+            return [None, None, None]
+
+        return [
+            self.pool.get(self.values[id - 1]),
+            self.datatypes[self.types[id - 1]],
+            self.typedata_names[self.typedata[id - 1]],
+        ]
 
     def get_by_symbol(self, value):
         """
@@ -56,8 +179,201 @@ class SymbolTable:
         int: The unique id of the entry in symbol table
         """
 
-        id = -1
-        for ids, value_list in self.symbol_table.items():
-            if value_list[0] == value:
-                return ids
-        return id
+        # Look into the index of the pool directly, this is done for every identifier scanned
+        index = self.pool.index
+        position = index.get(value, -1) if index is not None else self.pool.find(value)
+
+        return self.first_ids[position] if position != -1 else -1
+
+    def lookup(self, value, type, typedata):
+        """
+        Returns unique id of the entry with the given value, datatype and type of data
+        Params
+        ======
+        value    (string) = Value to be searched in the symbol table
+        type     (string) = Datatype of symbol
+        typedata (string) = Type of data (constant/variable)
+        Returns
+        =======
+        int: The unique id of the entry in symbol table, -1 if there is no such entry
+        """
+
+        position = self.pool.find(value)
+        if position == -1 or type not in self.codes or typedata not in self.typedata_codes:
+            return -1
+
+        # The index of all entries is only kept once it is needed
+        key = (position, self.codes[type], self.typedata_codes[typedata])
+        return self.index().get(key, -1)
+
+    def unmap(self):
+        """
+        Copies the columns of a loaded table out of its buffer, so that entries can be added
+        """
+
+        self.values = array("I", self.values)
+        self.types = array("H", self.types)
+        self.typedata = array("H", self.typedata)
+        self.first_ids = array("I", self.first_ids)
+
+    def to_bytes(self):
+        """
+        Returns
+        =======
+        bytes: The table in the binary format read by from_bytes
+        """
+
+        columns = [self.values, self.first_ids, self.types, self.typedata]
+        if sys.byteorder == "big":
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+
+        header = (
+            self.MAGIC
+            + bytes([self.intern_constants])
+            + pack_strings(self.datatypes)
+            + pack_strings(self.typedata_names)
+            + (self.id - 1).to_bytes(4, "little")
+            + self.pool.to_bytes()
+        )
+
+        # Align the 32 bit columns, followed by the 16 bit ones, so that a memory mapped table can use
+        # them in place
+        padding = b"\0" * (-len(header) % 4)
+
+        return (
+            header
+            + padding
+            + b"".join(bytes(column) for column in columns)
+        )
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """
+        Loads a table written by to_bytes, on little endian machines the columns are used in place
+        and values are only decoded when they are asked for
+        Params
+        ======
+        data   (bytes) = Buffer holding the table, for example a memory mapped file which stays in
+                         use by the table
+        offset (int)   = Offset of the table in the buffer
+        Returns
+        =======
+        SymbolTable: The table
+        int: Offset of the first byte after the table
+        """
+
+        start = offset
+
+        if data[offset : offset + len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError("Not a symbol table")
+        offset += len(cls.MAGIC)
+
+        table = cls(intern_constants=bool(data[offset]))
+        offset += 1
+
+        table.datatypes, offset = unpack_strings(data, offset)
+        table.typedata_names, offset = unpack_strings(data, offset)
+        table.codes = {name: code for code, name in enumerate(table.datatypes)}
+        table.typedata_codes = {name: code for code, name in enumerate(table.typedata_names)}
+
+        count = int.from_bytes(data[offset : offset + 4], "little")
+        offset += 4
+
+        table.pool, offset = StringPool.from_bytes(data, offset)
+        offset += -(offset - start) % 4
+
+        view = memoryview(data)
+        sizes = [(count, "I"), (len(table.pool), "I"), (count, "H"), (count, "H")]
+        columns = []
+        for length, typecode in sizes:
+            size = length * array(typecode).itemsize
+            columns.append(view[offset : offset + size].cast(typecode))
+            offset += size
+
+        table.values, table.first_ids, table.types, table.typedata = columns
+        table.id = count + 1
+
+        # Big endian machines need copies of the columns in their byte order
+        if sys.byteorder == "big":
+            table.unmap()
+            for column in (table.values, table.first_ids, table.types, table.typedata):
+                column.byteswap()
+
+        # The index of interned constants is rebuilt on first use
+        table.symbol_index = None
+
+        return table, offset
+
+    def save(self, path):
+        """
+        Writes the table to a file
+        Params
+        ======
+        path (string) = Path of the file
+        """
+
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory maps a table written by save, the file is only read as far as the table is used
+        Params
+        ======
+        path (string) = Path of the file
+        Returns
+        =======
+        SymbolTable: The table
+        """
+
+        with open(path, "rb") as file:
+            table, offset = cls.from_bytes(map_file(file))
+
+        return table
+
+
+class SymbolTableView(Mapping):
+    """
+    SymbolTableView class shows a symbol table as a read only dictionary of id to [value, type, typedata]
+    """
+
+    def __init__(self, table):
+        """
+        Initializer of SymbolTableView class
+        Params
+        ======
+        table (SymbolTable) = The symbol table
+        """
+
+        self.table = table
+
+    def __getitem__(self, id):
+        """
+        Returns the entry of an id, see SymbolTable.get_by_id
+        """
+
+        if not (isinstance(id, int) and 0 < id < self.table.id):
+            raise KeyError(id)
+
+        return self.table.get_by_id(id)
+
+    def __iter__(self):
+        """
+        Returns
+        =======
+        iterator: The ids in increasing order
+        """
+
+        return iter(range(1, self.table.id))
+
+    def __len__(self):
+        """
+        Returns
+        =======
+        int: The number of entries
+        """
+
+        return self.table.id - 1
@@ -0,0 +1,8 @@
+# The module for system-specific parameters and functions
+import sys
+
+# Standard library for operating system dependent functionality
+import os
+
+# The modules of pulse are top level modules of the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,53 @@
+# Standard library for testing
+import pytest
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import ScanStats class
+from scan_stats_class import ScanStats
+
+# Import TokenCache class
+from token_cache_class import TokenCache
+
+# Import batch scanning of many files
+from pulse_batch import scan_files
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_unreadable_files_are_errors_of_their_own(tmp_path, mapped):
+    good = tmp_path / "a.pulse"
+    good.write_text("var x = 1\n")
+    undecodable = tmp_path / "b.pulse"
+    undecodable.write_bytes(b'var y = 2\nprint("\xff")\n')
+    missing = tmp_path / "c.pulse"
+
+    paths = [str(good), str(undecodable), str(missing)]
+    results = scan_files(paths, SymbolTable(), workers=1, mapped=mapped, collect_errors=True)
+
+    assert [path for path, result in results] == paths
+    assert [token.type for token in results[0][1].tokens][:2] == ["var", "id"]
+
+    (diagnostic,) = results[1][1].diagnostics
+    assert (diagnostic.line_num, diagnostic.column) == (2, 8)
+    assert "utf-8" in diagnostic.msg
+
+    (diagnostic,) = results[2][1].diagnostics
+    assert "Could not read" in diagnostic.msg
+    assert len(results[2][1].tokens) == 0
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_cache_hits_count_their_tokens(tmp_path, mapped):
+    path = tmp_path / "a.pulse"
+    path.write_bytes(b'var s = "h\xc3\xa9"\r\nprint(s)\r\n')
+    cache = TokenCache(str(tmp_path / "cache"))
+
+    scanned, loaded = ScanStats(), ScanStats()
+    scan_files([str(path)], SymbolTable(), workers=1, mapped=mapped, cache=cache, stats=scanned)
+    scan_files([str(path)], SymbolTable(), workers=1, mapped=mapped, cache=cache, stats=loaded)
+
+    assert (scanned.cache_hits, loaded.cache_hits) == (0, 1)
+    assert loaded.token_counts == scanned.token_counts
+    assert loaded.size == scanned.size
+    assert loaded.symbol_inserts == scanned.symbol_inserts
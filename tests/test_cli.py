@@ -0,0 +1,27 @@
+# Standard library for garbage collection
+import gc
+
+# Standard library for in memory streams
+import io
+
+# Standard library for warning control
+import warnings
+
+# Import the command line interface
+from pulse import build_parser, run
+
+
+def test_streamed_files_are_closed(tmp_path):
+    path = tmp_path / "a.pulse"
+    path.write_text("var x = 1\nprint(x)\n")
+    args = build_parser().parse_args([str(path), "--format", "jsonl"])
+
+    out = io.BytesIO()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        status = run(args, out, io.StringIO())
+        gc.collect()
+
+    assert not status
+    assert b'"type": "var"' in out.getvalue()
+    assert not [warning for warning in caught if warning.category is ResourceWarning]
@@ -0,0 +1,63 @@
+# Standard library for operating system dependent functionality
+import os
+
+# Standard library for threads
+import threading
+
+# Standard library for testing
+import pytest
+
+# Import the protocol of the scan daemon
+from pulse_client import request, scan_remote
+
+# Import the scan daemon
+from pulse_server import ScanRequestHandler, ScanServer, scan_command
+
+# Import TokenWriter class
+from token_writer_class import TokenWriter
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Runs a scan daemon in a thread, yields the path of its socket"""
+    path = str(tmp_path / "pulse.sock")
+    server = ScanServer(path, ScanRequestHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    yield path
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_scan_remote(daemon):
+    tokens, diagnostics = scan_remote("var x = 1\n", socket_path=daemon)
+
+    stream, table = TokenWriter.load(tokens)
+    assert [token.type for token in stream] == ["var", "id", "assignment", "number", "newline"]
+    assert diagnostics == []
+
+
+def test_scan_remote_invalid_utf8(daemon):
+    with pytest.raises(ValueError):
+        scan_remote(b"var x = '\xff'\n", socket_path=daemon)
+
+    # The daemon goes on answering
+    assert scan_remote("x\n", socket_path=daemon) is not None
+
+
+def test_no_daemon(tmp_path):
+    assert request({}, socket_path=str(tmp_path / "missing.sock")) is None
+
+
+def test_scan_command_keeps_working_directory(tmp_path):
+    (tmp_path / "a.pulse").write_text("print(1)\n")
+    cwd = os.getcwd()
+
+    header, output = scan_command(["a.pulse"], str(tmp_path))
+
+    assert header["status"] == "ok"
+    assert b"print" in output
+    assert os.getcwd() == cwd
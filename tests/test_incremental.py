@@ -0,0 +1,102 @@
+# Standard library for random numbers
+import random
+
+# Standard library for testing
+import pytest
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import IncrementalSource class
+from incremental_source_class import IncrementalSource
+
+# Import incremental re-lexing
+from pulse_incremental import lex, relex
+
+SOURCE = (
+    "var total = 0\n"
+    "# sum the numbers\n"
+    "for var i = 0, i < 10, i++:\n"
+    "\tif i % 2 == 0:\n"
+    "\t\ttotal += i\n"
+    "\telse:\n"
+    "\t\ttotal -= 1\n"
+    "/* done */\n"
+    "print(total)\n"
+)
+
+# Inserted text which never makes the source code invalid
+PIECES = ["\n", "\t", "x", " y ", "if a:\n\t", "\n\tb = 1\n", "# c", ":", "\n\t\tc\n", "1.5"]
+
+
+def view(tokens, table):
+    """Returns the tokens with the values of their symbols instead of the ids"""
+    return [
+        (
+            token.type,
+            table.get_by_id(token.val)[0] if token.type in ("id", "number", "string") else token.val,
+            token.line_num,
+            token.start,
+            token.end,
+        )
+        for token in tokens
+    ]
+
+
+def test_relex_returns_rescanned_range():
+    table = SymbolTable()
+    source = lex(SOURCE, table)
+    count = len(source)
+
+    start, stop = relex(source, (SOURCE.index("10"), 2, "20"), table)
+
+    assert source.source_code == SOURCE.replace("10", "20")
+    assert len(source) == count
+    assert 0 < start < stop < count
+    assert [token.type for token in list(source)[start:stop]].count("newline") <= 1
+
+
+def test_edit_after_line_break_rescans_lexeme_before_it():
+    # The comment ends before the line break only while a "/" follows the line break
+    source_code = "éxa/**///*\n:%)[#\t:b1/*\nif a:\n\tb\n/\n"
+    table = SymbolTable()
+    source = lex(source_code, table)
+
+    relex(source, (32, 1, " %)%"), table)
+
+    fresh_table = SymbolTable()
+    fresh = lex(source.source_code, fresh_table)
+    assert view(source, table) == view(fresh, fresh_table)
+    assert [source.snapshot(k) for k in range(len(source.snapshots))] == fresh.snapshots
+
+
+@pytest.mark.parametrize("max_segments", [1, 2, IncrementalSource.MAX_SEGMENTS])
+@pytest.mark.parametrize("seed", range(5))
+def test_relex_matches_fresh_scan(seed, max_segments, monkeypatch):
+    monkeypatch.setattr(IncrementalSource, "MAX_SEGMENTS", max_segments)
+    rng = random.Random(seed)
+
+    table = SymbolTable()
+    source = lex(SOURCE * 3, table)
+    originals = list(source)
+    positions = [(token.line_num, token.start, token.end) for token in originals]
+
+    for _ in range(30):
+        offset = rng.randint(0, len(source.source_code))
+        deleted = 0 if rng.random() < 0.5 else rng.randint(0, 2)
+        deleted = min(deleted, len(source.source_code) - offset)
+
+        # Only whitespace is deleted, so that no string or comment is left open
+        if source.source_code[offset : offset + deleted].strip():
+            deleted = 0
+
+        relex(source, (offset, deleted, rng.choice(PIECES)), table)
+
+        fresh_table = SymbolTable()
+        fresh = lex(source.source_code, fresh_table)
+        assert view(source, table) == view(fresh, fresh_table)
+        assert view([source[i] for i in range(len(source))], table) == view(source, table)
+        assert [source.snapshot(k) for k in range(len(source.snapshots))] == fresh.snapshots
+
+    # The tokens of the caller are never moved in place
+    assert [(token.line_num, token.start, token.end) for token in originals] == positions
@@ -0,0 +1,51 @@
+# Standard library for in memory streams
+import io
+
+# Standard library for testing
+import pytest
+
+# Import LineIndex class
+from line_index_class import LineIndex
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import the scanner and its streaming interface
+from pulse_scanner import iter_tokens, scanner
+
+
+def test_positions_round_trip_through_invalid_utf8():
+    source_code = b"var a = 1\n\xff\xfe b = '\xc3\xa9' + c\n"
+    index = LineIndex(source_code)
+
+    assert len(index) == 3
+    for offset in range(len(source_code)):
+        if source_code[offset] & 0xC0 != 0x80:
+            assert index.offset(*index.position(offset)) == offset
+
+    # Every invalid byte is one character, and so is the two byte "é"
+    assert index.position(source_code.index(b"b")) == (2, 4)
+    assert index.position(source_code.index(b"c")) == (2, 14)
+
+
+@pytest.mark.parametrize("encode", [False, True], ids=["text", "bytes"])
+def test_diagnostics_count_characters(encode):
+    source_code = 'var s = "ü"\nvar t = "é" + 1.2.3\n'
+    if encode:
+        source_code = source_code.encode("utf-8")
+
+    diagnostics = []
+    scanner(source_code, SymbolTable(), diagnostics=diagnostics)
+
+    ((line_num, column),) = [(d.line_num, d.column) for d in diagnostics]
+    assert (line_num, column) == (2, 15)
+
+
+def test_streamed_diagnostics_count_from_earlier_chunks():
+    source_code = "var t = " + "x + " * 40 + "1.2.3\n"
+
+    diagnostics = []
+    list(iter_tokens(io.StringIO(source_code), SymbolTable(), 16, diagnostics=diagnostics))
+
+    (diagnostic,) = diagnostics
+    assert diagnostic.column == source_code.index("1.2.3") + 1
@@ -0,0 +1,131 @@
+# Standard library for redirecting printed errors
+import contextlib
+
+# Standard library for streams in memory
+import io
+
+# Standard library for random programs
+import random
+
+# Standard library for testing
+import pytest
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import scanner
+from pulse_scanner import scanner
+
+# Import parser
+from pulse_parser import parse
+
+# Import compiler
+from pulse_compiler import compile_ast
+
+# Import optimizer
+from pulse_optimizer import PASSES, optimize
+
+# Import virtual machine
+from pulse_vm import execute
+
+# Names, constants and operators of the random programs
+NAMES = ["a", "b", "c", "d"]
+CONSTANTS = ["0", "1", "2", "3", "7", "2.5", "true", "false"]
+OPERATORS = ["+", "-", "*", "==", "!=", "<", ">=", "and", "or"]
+
+
+def expression(rng, depth=0):
+    """Returns a random expression"""
+    if depth > 2 or rng.random() < 0.3:
+        return rng.choice(NAMES + CONSTANTS)
+    if rng.random() < 0.1:
+        return "%s(%s)" % (rng.choice(["not ", "-"]), expression(rng, depth + 1))
+    if rng.random() < 0.1:
+        divisor = rng.choice(["3", "7", "2.5"])
+        return "(%s %s %s)" % (expression(rng, depth + 1), rng.choice(["//", "%"]), divisor)
+    return "(%s %s %s)" % (
+        expression(rng, depth + 1),
+        rng.choice(OPERATORS),
+        expression(rng, depth + 1),
+    )
+
+
+def block(rng, lines, depth, in_function=False):
+    """Adds random statements at an indentation depth, the last one may open a nested block"""
+    indent = "\t" * depth
+
+    for _ in range(rng.randint(1, 3)):
+        choice = rng.random()
+        if choice < 0.25:
+            lines.append(indent + "var %s = %s" % (rng.choice(NAMES), expression(rng)))
+        elif choice < 0.4:
+            operator = rng.choice(["=", "+=", "-="])
+            lines.append(indent + "%s %s %s" % (rng.choice(NAMES), operator, expression(rng)))
+        elif choice < 0.6:
+            lines.append(indent + "print(%s, %s)" % (expression(rng), expression(rng)))
+        elif choice < 0.7 and depth < 3:
+            lines.append(indent + "if %s:" % expression(rng))
+            block(rng, lines, depth + 1, in_function)
+            if rng.random() < 0.5:
+                lines.append(indent + "else:")
+                block(rng, lines, depth + 1, in_function)
+            return
+        elif choice < 0.8 and depth < 3:
+            name = "i%d" % depth
+            limit = rng.randint(0, 4)
+            lines.append(indent + "for var %s = 0, %s < %d, %s++:" % (name, name, limit, name))
+            block(rng, lines, depth + 1, in_function)
+            return
+        elif choice < 0.85 and depth == 0:
+            lines.append("fun g(a, x):")
+            lines.append("\tvar y = %s" % expression(rng))
+            block(rng, lines, 1, True)
+            return
+        elif not in_function:
+            lines.append(indent + "f(%s, %s)" % (expression(rng), expression(rng)))
+
+
+def program(seed):
+    """Returns a random program, which may stop with a runtime error"""
+    rng = random.Random(seed)
+    lines = ["var a = 1", "var b = 2", "var c = 3", "var d = 4", "fun f(a, x):", "\tprint(a, x, b)"]
+    for _ in range(6):
+        block(rng, lines, 0)
+    return "\n".join(lines) + "\n"
+
+
+def run(source_code, optimized):
+    """Compiles and runs a program, returns what it prints including a runtime error"""
+    table = SymbolTable()
+    ast = parse(scanner(source_code + "\0", table))
+
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        try:
+            bytecode = optimize(ast, table)[0] if optimized else compile_ast(ast, table)
+            execute(bytecode, out, io.StringIO())
+        except SystemExit:
+            pass
+
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_optimized_programs_print_the_same(seed):
+    source_code = program(seed)
+
+    assert run(source_code, True) == run(source_code, False)
+
+
+def test_constants_are_folded():
+    source_code = "var k = 10\nprint(2 * 3 + 4 - k, -k)\nif false:\n\tprint(k)\nwhile k < 0:\n\tk++\n"
+    table = SymbolTable()
+    ast = parse(scanner(source_code + "\0", table))
+    unoptimized = compile_ast(ast, table).count()
+
+    bytecode, report = optimize(ast, table)
+
+    assert set(report) == {"propagate_constants"} | set(PASSES)
+    assert bytecode.count() < unoptimized
+    assert unoptimized - bytecode.count() == sum(report.values())
+    assert run(source_code, True) == run(source_code, False) == "0 -10\n"
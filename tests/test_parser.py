@@ -0,0 +1,114 @@
+# Standard library for testing
+import pytest
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import scanner
+from pulse_scanner import scanner
+
+# Import parser
+from pulse_parser import parse
+
+# Import the token type of every kind code
+from token_spec import TOKEN_TYPES
+
+# Nodes whose value is a symbol id and nodes whose value is an operator's kind code
+SYMBOLS = ("name", "number", "string")
+OPERATORS = ("assign", "binary", "unary", "postfix")
+
+
+def tree(source_code, streamed=False):
+    """Parses a program and returns its syntax tree with symbols and operators by name"""
+    table = SymbolTable()
+    tokens = scanner(source_code + "\0", table)
+    ast = parse(iter(tokens) if streamed else tokens)
+
+    def named(node):
+        kind, value, children = node
+        if kind in SYMBOLS:
+            return (kind, table.get_by_id(value)[0])
+        if kind in OPERATORS:
+            return (kind, TOKEN_TYPES[value], [named(child) for child in children])
+        return (kind, [named(child) for child in children])
+
+    return named(ast.dump())
+
+
+def test_precedence_and_blocks():
+    source_code = "var x = 1 + 2 * 3\nif x > 6:\n\tprint(x)\nelse:\n\tx = -x\n"
+
+    assert tree(source_code) == (
+        "program",
+        [
+            (
+                "var",
+                [
+                    (
+                        "assign",
+                        "assignment",
+                        [
+                            ("name", "x"),
+                            (
+                                "binary",
+                                "plus",
+                                [
+                                    ("number", "1"),
+                                    ("binary", "multiply", [("number", "2"), ("number", "3")]),
+                                ],
+                            ),
+                        ],
+                    )
+                ],
+            ),
+            (
+                "if",
+                [
+                    ("binary", "greater_than", [("name", "x"), ("number", "6")]),
+                    ("block", [("print", [("name", "x")])]),
+                    (
+                        "block",
+                        [
+                            (
+                                "assign",
+                                "assignment",
+                                [("name", "x"), ("unary", "minus", [("name", "x")])],
+                            )
+                        ],
+                    ),
+                ],
+            ),
+        ],
+    )
+
+
+def test_staged_dedent_closes_both_blocks():
+    source_code = "while c:\n\tif c:\n\t\tprint(1)\n\tprint(2)\nprint(3)\n"
+
+    program = tree(source_code)
+    (loop, after) = program[1]
+
+    assert loop[0] == "while" and after == ("print", [("number", "3")])
+    assert [statement[0] for statement in loop[1][1][1]] == ["if", "print"]
+
+
+def test_comments_and_streamed_tokens_parse_alike():
+    source_code = "# first\nvar a = [1, 2] /* two\nlines */\nfun f(b):\n\tprint(a[0] + b)\nf(a[1])\n"
+
+    assert tree(source_code, streamed=True) == tree(source_code)
+    assert [statement[0] for statement in tree(source_code)[1]] == ["var", "fun", "call"]
+
+
+@pytest.mark.parametrize(
+    "source_code, message",
+    [
+        ("var x = (1 + 2\n", "Expected"),
+        ("print(1\n", "Expected"),
+        ("3 = x\n", "Cannot assign to number"),
+    ],
+)
+def test_syntax_errors_exit(capsys, source_code, message):
+    with pytest.raises(SystemExit):
+        tree(source_code)
+
+    assert message in capsys.readouterr().out
@@ -0,0 +1,177 @@
+# Standard library for asynchronous code
+import asyncio
+
+# Standard library for in memory streams
+import io
+
+# Standard library for testing
+import pytest
+
+# Import some helper functions
+from global_helpers import map_file
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import the scanner, its streaming interface and its registry of engines
+import pulse_scanner
+from pulse_scanner import ENGINES, iter_tokens, scanner
+
+# Import the differential tests of the engines, which registers the chunked parallel engine
+from benchmarks import differential
+
+# Import the parallel engine
+from pulse_parallel import parallel_scanner
+
+# Import the asynchronous streaming interface
+import pulse_async
+from pulse_async import aiter_tokens
+
+# A block closed in two steps, two levels back to one and then one back to none
+STAGED_DEDENT = (
+    "var c = 0\n"
+    "while c < 2:\n"
+    "\tif c == 0:\n"
+    '\t\tprint("zero")\n'
+    '\tprint("after if")\n'
+    "\tc++\n"
+    'print("done")\n'
+)
+
+
+def kinds(tokens):
+    """Returns the types of the tokens which shape blocks"""
+    return [token.type for token in tokens if token.type in ("begin_block", "unindent")]
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+@pytest.mark.parametrize(
+    "source_code",
+    [STAGED_DEDENT, STAGED_DEDENT.replace("\t", "  ")],
+    ids=["tabs", "spaces"],
+)
+def test_staged_dedent_closes_every_block(engine, source_code):
+    tokens = scanner(source_code, SymbolTable(), engine=engine)
+
+    assert kinds(tokens) == ["begin_block", "begin_block", "unindent", "unindent"]
+
+    # The if block closes before the second print, the while block before the last one
+    unindents = [token.line_num for token in tokens if token.type == "unindent"]
+    assert unindents == [5, 7]
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_engines_match_reference(engine):
+    source_code = STAGED_DEDENT + "# done\nfun f(a):\n\tif a:\n\t\treturn_value = a\n"
+
+    expected_table = SymbolTable()
+    expected = scanner(source_code, expected_table, engine="reference")
+    table = SymbolTable()
+    tokens = scanner(source_code, table, engine=engine)
+
+    assert [(token.type, token.val, token.line_num) for token in tokens] == [
+        (token.type, token.val, token.line_num) for token in expected
+    ]
+    assert [table.get_by_id(id) for id in range(1, table.id)] == [
+        expected_table.get_by_id(id) for id in range(1, expected_table.id)
+    ]
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        scanner("", SymbolTable(), engine="nope")
+
+
+@pytest.mark.parametrize("engine", sorted(ENGINES))
+def test_memory_mapped_source(engine, tmp_path):
+    path = tmp_path / "source.pulse"
+    path.write_bytes(STAGED_DEDENT.encode("utf-8"))
+
+    with open(str(path), "rb") as file:
+        tokens = scanner(map_file(file), SymbolTable(), engine=engine)
+
+    assert kinds(tokens) == ["begin_block", "begin_block", "unindent", "unindent"]
+
+
+def test_reference_engine_rejects_diagnostics():
+    with pytest.raises(ValueError):
+        scanner("x\n", SymbolTable(), diagnostics=[], engine="reference")
+
+
+# Lexemes much longer than a chunk, the last one ended by the end of the source code
+LONG_LEXEMES = 'var s = "' + "x" * 20000 + '"\n/* ' + "y" * 20000 + " */\n# " + "z" * 20000
+
+
+def view(tokens):
+    """Returns the tokens as comparable tuples"""
+    return [(token.type, token.val, token.line_num, token.start, token.end) for token in tokens]
+
+
+async def collect(source_code, chunk_size, table):
+    """Returns the tokens of source code streamed asynchronously"""
+
+    async def chunks():
+        for i in range(0, len(source_code), chunk_size):
+            yield source_code[i : i + chunk_size]
+
+    return [token async for token in aiter_tokens(chunks(), table, chunk_size)]
+
+
+def test_streaming_long_lexemes_is_linear(monkeypatch):
+    expected = view(scanner(LONG_LEXEMES + "\0", SymbolTable()))
+
+    # Count the characters every call of the scanner starts with
+    for module in (pulse_scanner, pulse_async):
+        scan_tokens = module.scan_tokens
+        scanned = []
+
+        def counting_scan_tokens(source_code, i, *args, scan_tokens=scan_tokens, scanned=scanned):
+            scanned.append(len(source_code) - i)
+            return scan_tokens(source_code, i, *args)
+
+        monkeypatch.setattr(module, "scan_tokens", counting_scan_tokens)
+
+        if module is pulse_scanner:
+            tokens = list(iter_tokens(io.StringIO(LONG_LEXEMES), SymbolTable(), chunk_size=64))
+        else:
+            tokens = asyncio.run(collect(LONG_LEXEMES, 64, SymbolTable()))
+
+        assert view(tokens) == expected
+        assert sum(scanned) < 4 * len(LONG_LEXEMES)
+
+
+# The edge cases of the differential tests and one generated source per size and shape
+DIFFERENTIAL_SOURCES = dict(differential.sources([1 << 10, 1 << 13], 1))
+
+
+@pytest.mark.parametrize("name", sorted(DIFFERENTIAL_SOURCES))
+def test_differential_sources(name):
+    source_code = DIFFERENTIAL_SOURCES[name]
+
+    for comments, newlines in ((True, True), (False, False)):
+        expected = differential.scan(differential.REFERENCE, source_code, comments, newlines)
+
+        for engine in sorted(set(ENGINES) - {differential.REFERENCE}):
+            for source in (source_code, source_code.encode("utf-8")):
+                found = differential.scan(engine, source, comments, newlines)
+                assert differential.difference(expected[0], found[0]) is None, engine
+                assert differential.difference(expected[1], found[1]) is None, engine
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_parallel_chunk_ends_before_non_ascii_character(tmp_path, mapped):
+    source_code = ("a\n" * 8 + "/* note\né is here\nvar z = 1 */\nvar q = 2\n" + "b\n" * 8).encode()
+    path = tmp_path / "source.pulse"
+    path.write_bytes(source_code)
+
+    expected_table = SymbolTable()
+    expected = view(scanner(source_code, expected_table, engine="regex"))
+
+    with open(str(path), "rb") as file:
+        if mapped:
+            source_code = map_file(file)
+
+        for chunk_size in range(1, 40):
+            table = SymbolTable()
+            assert view(parallel_scanner(source_code, table, 2, chunk_size)) == expected
+            assert list(table.symbol_table.values()) == list(expected_table.symbol_table.values())
@@ -0,0 +1,54 @@
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+
+def test_interned_constants_share_an_id():
+    table = SymbolTable(intern_constants=True)
+    first = table.entry("1", "int", "constant")
+
+    assert table.entry("1", "int", "constant") == first
+    assert table.entry("1", "float", "constant") != first
+    assert table.entry("x", "var", "variable") != table.entry("x", "var", "variable")
+
+
+def test_loaded_interning_table_takes_new_entries():
+    table = SymbolTable(intern_constants=True)
+    one = table.entry("1", "int", "constant")
+    table.entry("x", "var", "variable")
+
+    loaded, offset = SymbolTable.from_bytes(table.to_bytes())
+
+    assert loaded.entry("1", "int", "constant") == one
+    two = loaded.entry("2", "int", "constant")
+    assert loaded.get_by_id(two) == ["2", "int", "constant"]
+    assert loaded.lookup("x", "var", "variable") == 2
+
+
+def test_many_datatypes():
+    table = SymbolTable()
+    ids = [table.entry("v", "type%d" % code, "variable") for code in range(300)]
+
+    # Codes above 255 neither overflow the columns nor collide in the index
+    assert table.get_by_id(ids[-1]) == ["v", "type299", "variable"]
+    assert table.lookup("v", "type299", "variable") == ids[-1]
+    assert table.lookup("v", "type43", "variable") == ids[43]
+
+    loaded, offset = SymbolTable.from_bytes(table.to_bytes())
+    assert [loaded.get_by_id(id) for id in ids] == [table.get_by_id(id) for id in ids]
+
+    # The codes stay small, two bytes per entry and column in memory and in the saved table
+    for columns in (table, loaded):
+        assert columns.types.itemsize == columns.typedata.itemsize == 2
+
+
+def test_save_and_load(tmp_path):
+    table = SymbolTable()
+    table.entry("alpha", "var", "variable")
+    table.entry('"text"', "string", "constant")
+    path = str(tmp_path / "table.pst")
+    table.save(path)
+
+    loaded = SymbolTable.load(path)
+
+    assert dict(loaded.symbol_table) == dict(table.symbol_table)
+    assert loaded.entry("beta", "var", "variable") == 3
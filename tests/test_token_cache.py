@@ -0,0 +1,84 @@
+# Standard library for file modification times
+import os
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import the scanner
+from pulse_scanner import scanner
+
+# Import TokenCache class
+from token_cache_class import TokenCache
+
+# Import TokenStream class
+from token_stream_class import TokenStream
+
+
+def test_keys_depend_on_content_and_mode(tmp_path):
+    cache = TokenCache(str(tmp_path))
+
+    assert cache.key(b"var a = 1\n") == cache.key(b"var a = 1\n")
+    assert cache.key(b"var a = 1\n") != cache.key(b"var a = 2\n")
+    assert cache.key(b"var a = 1\n") != cache.key(b"var a = 1\n", "bytes")
+
+
+def test_round_trip_and_corrupt_files(tmp_path):
+    cache = TokenCache(str(tmp_path))
+    table = SymbolTable()
+    tokens = TokenStream(scanner('var s = "a"\n# c\n\0', table))
+    entries = list(table.symbol_table.values())
+
+    assert cache.load("missing") is None
+
+    cache.store("key", tokens, entries)
+    loaded, loaded_entries = cache.load("key")
+    assert [token.val for token in loaded] == [token.val for token in tokens]
+    assert loaded_entries == entries
+
+    with open(cache.path("key"), "r+b") as file:
+        file.truncate(10)
+    assert cache.load("key") is None
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = TokenCache(str(tmp_path))
+    tokens = TokenStream(scanner("var a = 1\n\0", SymbolTable()))
+
+    for age, key in enumerate(["old", "used", "new"]):
+        cache.store(key, tokens, [])
+        os.utime(cache.path(key), (age, age))
+
+    # Loading a file marks it as recently used
+    cache.load("used")
+    cache.max_size = 2 * os.path.getsize(cache.path("new"))
+    cache.evict()
+
+    assert cache.load("old") is None
+    assert cache.load("used") is not None
+    assert cache.load("new") is not None
+
+
+def test_temporary_files_of_crashed_writers_are_removed(tmp_path):
+    cache = TokenCache(str(tmp_path))
+    tokens = TokenStream(scanner("var a = 1\n\0", SymbolTable()))
+    cache.store("entry", tokens, [])
+    size = os.path.getsize(cache.path("entry"))
+
+    crashed = tmp_path / ("crashed" + TokenCache.TEMP_SUFFIX)
+    crashed.write_bytes(b"\0" * size)
+    os.utime(str(crashed), (0, 0))
+    writing = tmp_path / ("writing" + TokenCache.TEMP_SUFFIX)
+    writing.write_bytes(b"\0" * size)
+
+    # A file still being written is kept but leaves room for one cache file only
+    cache.max_size = 2 * size
+    cache.evict()
+
+    assert not crashed.exists()
+    assert writing.exists()
+    assert cache.load("entry") is not None
+
+    cache.max_size = size
+    cache.evict()
+    assert writing.exists()
+    assert cache.load("entry") is None
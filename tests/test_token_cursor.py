@@ -0,0 +1,66 @@
+# Standard library for testing
+import pytest
+
+# Import Token class
+from token_class import Token
+
+# Import TokenCursor class
+from token_cursor_class import TokenCursor
+
+# Import TokenStream class
+from token_stream_class import TokenStream
+
+
+def numbered(count):
+    """Returns tokens whose line numbers count them, with a comment after every third"""
+    tokens = []
+    for line_num in range(count):
+        tokens.append(Token("newline", "", line_num))
+        if line_num % 3 == 0:
+            tokens.append(Token("single_line_comment", "#", line_num))
+    return tokens
+
+
+@pytest.mark.parametrize("source", ["list", "stream", "iterator"])
+def test_lookahead_and_backtracking(source):
+    tokens = numbered(100)
+    if source == "stream":
+        tokens = TokenStream(tokens)
+    elif source == "iterator":
+        tokens = iter(tokens)
+
+    cursor = TokenCursor(tokens, skip=["single_line_comment"])
+
+    assert cursor.peek().line_num == 0
+    assert cursor.peek(5).line_num == 5
+    assert cursor.advance().line_num == 0
+
+    # Lookahead past the initial ring buffer while a mark holds its start
+    mark = cursor.mark()
+    for line_num in range(1, 60):
+        assert cursor.expect("newline").line_num == line_num
+    assert cursor.accept("id") is None
+
+    cursor.rewind(mark)
+    assert cursor.peek().line_num == 1
+    assert cursor.previous.line_num == 0
+
+    # A released mark can no longer be rewound to, so the tokens before it are dropped
+    cursor.release(cursor.mark())
+    while cursor.advance() is not None:
+        pass
+    assert cursor.previous.line_num == 99
+    assert cursor.peek() is None
+
+
+def test_expect_exits_on_other_tokens(capsys):
+    cursor = TokenCursor([Token("id", 1, 4)])
+
+    with pytest.raises(SystemExit):
+        cursor.expect("number")
+    assert "Expected number but found id" in capsys.readouterr().out
+
+    cursor.advance()
+    with pytest.raises(SystemExit):
+        cursor.expect("number")
+    assert "end of the source code" in capsys.readouterr().out
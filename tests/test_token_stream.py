@@ -0,0 +1,64 @@
+# Standard library for in memory streams
+import io
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import the scanner
+from pulse_scanner import scanner
+
+# Import TokenStream class
+from token_stream_class import TokenStream
+
+# Import TokenWriter class
+from token_writer_class import TokenWriter
+
+# Import TokenCache class
+from token_cache_class import TokenCache
+
+# Import batch scanning of many files
+from pulse_batch import scan_files
+
+SOURCE = 'var s = "text"\n# note\nif s:\n\tprint(s)\n'
+
+
+def view(tokens):
+    return [(token.type, token.val, token.line_num, token.start, token.end) for token in tokens]
+
+
+def scan(source_code):
+    return scanner(source_code + "\0", SymbolTable())
+
+
+def test_round_trip_keeps_offsets():
+    tokens = scan(SOURCE)
+    stream = TokenStream(tokens)
+    loaded, offset = TokenStream.from_bytes(stream.to_bytes())
+
+    assert offset == len(stream.to_bytes())
+    assert view(loaded) == view(tokens)
+    assert all(token.start >= 0 for token in loaded)
+
+
+def test_writer_and_cache_keep_offsets(tmp_path):
+    tokens = scan(SOURCE)
+
+    out = io.BytesIO()
+    TokenWriter(out, "binary", batch_size=3).write(tokens)
+    loaded, entries = TokenWriter.load(out.getvalue())
+    assert view(loaded) == view(tokens)
+
+    cache = TokenCache(str(tmp_path))
+    cache.store("key", TokenStream(tokens), [])
+    loaded, entries = cache.load("key")
+    assert view(loaded) == view(tokens)
+
+
+def test_batch_keeps_offsets(tmp_path):
+    path = tmp_path / "a.pulse"
+    path.write_text(SOURCE)
+
+    ((name, result),) = scan_files([str(path)], SymbolTable(), workers=1)
+    assert [(token.start, token.end) for token in result.tokens] == [
+        (token.start, token.end) for token in scan(SOURCE)
+    ]
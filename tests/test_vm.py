@@ -0,0 +1,119 @@
+# Standard library for streams in memory
+import io
+
+# Standard library for testing
+import pytest
+
+# Import SymbolTable class
+from symbol_table_class import SymbolTable
+
+# Import scanner
+from pulse_scanner import scanner
+
+# Import parser
+from pulse_parser import parse
+
+# Import compiler
+from pulse_compiler import compile_ast
+
+# Import optimizer
+from pulse_optimizer import optimize
+
+# Import virtual machine
+from pulse_vm import execute
+
+
+# Programs and what they print
+PROGRAMS = {
+    "loops": (
+        "var total = 0\n"
+        "for var i = 0, i < 10, i++:\n"
+        "\ttotal += i\n"
+        "var y = 0\n"
+        "do:\n"
+        "\ty++\n"
+        "while y < 3\n"
+        "print(total, y)\n",
+        "45 3\n",
+    ),
+    "operators": (
+        'print(not true, -3, 7 // 2, 7 / 2, 7 % 3, 1 == 1 or 0, false or "z", 1 and 0, "ab" * 2)\n',
+        "false -3 3 3.5 1 true z 0 abab\n",
+    ),
+    "lists": (
+        "var l = [1, 2, 3]\n"
+        "l[1] = 7\n"
+        "l[0] += 10\n"
+        "l[2]++\n"
+        'print(l, l[1], [1, "a", [2]])\n',
+        '[11, 7, 4] 7 [1, "a", [2]]\n',
+    ),
+    "branches": (
+        "var x = 1\n"
+        "if x == 0:\n"
+        '\tprint("zero")\n'
+        "elif x == 1:\n"
+        '\tprint("one")\n'
+        "else:\n"
+        '\tprint("other")\n',
+        "one\n",
+    ),
+    "functions": (
+        "var g = 3\n"
+        "fun fib(n):\n"
+        "\tvar a = 0\n"
+        "\tvar b = 1\n"
+        "\tfor var k = 0, k < n, k++:\n"
+        "\t\tvar t = a + b\n"
+        "\t\ta = b\n"
+        "\t\tb = t\n"
+        "\tg = a\n"
+        "fib(20)\n"
+        "print(g)\n",
+        "6765\n",
+    ),
+    "postfix": ("var x = 0\nprint(x++, x)\n", "0 1\n"),
+    "input": ('var n = input("name? ")\nprint("hi", n)\n', "name? hi Ada\n"),
+}
+
+
+def run(source_code, optimized=False):
+    """Compiles and runs a program, returns what it prints"""
+    table = SymbolTable()
+    ast = parse(scanner(source_code + "\0", table))
+    bytecode = optimize(ast, table)[0] if optimized else compile_ast(ast, table)
+
+    out = io.StringIO()
+    execute(bytecode, out, io.StringIO("Ada\n"))
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("optimized", [False, True])
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_programs(name, optimized):
+    source_code, expected = PROGRAMS[name]
+
+    assert run(source_code, optimized) == expected
+
+
+@pytest.mark.parametrize("optimized", [False, True])
+def test_runtime_errors_exit(capsys, optimized):
+    with pytest.raises(SystemExit):
+        run("var a = 0\nprint(1)\nprint(2 // a)\n", optimized)
+
+    assert "[Line 3] Error: Runtime error" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("optimized", [False, True])
+def test_staged_dedent(optimized):
+    source_code = (
+        "var c = 0\n"
+        "while c < 2:\n"
+        "\tif c == 0:\n"
+        '\t\tprint("zero")\n'
+        '\tprint("after if")\n'
+        "\tc++\n"
+        'print("done")\n'
+    )
+
+    assert run(source_code, optimized) == "zero\nafter if\nafter if\ndone\n"
@@ -0,0 +1,190 @@
+# Standard library for operating system dependent functionality
+import os
+
+# Standard library for secure hashes
+import hashlib
+
+# Standard library to create temporary files
+import tempfile
+
+# Standard library for the current time
+import time
+
+# Import some helper functions
+from global_helpers import pack_strings, unpack_strings
+
+# Import TokenStream class
+from token_stream_class import TokenStream
+
+# Import the version of the scanner output
+from pulse_scanner import SCANNER_VERSION
+
+
+class TokenCache:
+    """
+    TokenCache class stores the tokens and symbol table entries of scanned files on disk, keyed by a
+    hash of the file contents, so that unchanged files are not scanned again
+    """
+
+    # Magic bytes at the start of every cache file
+    MAGIC = b"PTC2"
+
+    # Extension of cache files
+    SUFFIX = ".tok"
+
+    # Extension of cache files being written, and the age in seconds after which such a file is left
+    # over from a writer which crashed
+    TEMP_SUFFIX = ".tmp"
+    STALE_AGE = 60 * 60
+
+    def __init__(self, directory, max_size=256 * 1024 * 1024):
+        """
+        Initializer of TokenCache class
+        Params
+        ======
+        directory (string) = Directory holding the cache files, created if it does not exist
+        max_size  (int)    = Size in bytes above which evict removes the least recently used files
+        """
+
+        self.directory = directory
+        self.max_size = max_size
+
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, content, mode="text"):
+        """
+        Returns the cache key of the contents of a file
+        Params
+        ======
+        content (bytes)  = Contents of the file
+        mode    (string) = How the file is scanned ("text" or "bytes"), which can change line endings
+        Returns
+        =======
+        string: Hash of the scanner version, the scan mode and the contents
+        """
+
+        digest = hashlib.sha256(b"%d:%s:" % (SCANNER_VERSION, mode.encode("ascii")))
+        digest.update(content)
+
+        return digest.hexdigest()
+
+    def path(self, key):
+        """
+        Returns the path of the cache file of a key
+        Params
+        ======
+        key (string) = Cache key
+        Returns
+        =======
+        string: Path of the cache file
+        """
+
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def load(self, key):
+        """
+        Returns the cached tokens and symbol table entries of a key and marks them as recently used
+        Params
+        ======
+        key (string) = Cache key
+        Returns
+        =======
+        tuple: (TokenStream, list of [value, type, typedata] entries), None if the key is not cached
+        """
+
+        path = self.path(key)
+
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except OSError:
+            # Missing, or evicted by another process in the meantime
+            return None
+
+        if data[: len(self.MAGIC)] != self.MAGIC:
+            return None
+
+        try:
+            tokens, offset = TokenStream.from_bytes(data, len(self.MAGIC))
+            strings, offset = unpack_strings(data, offset)
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+        # A file with bytes after the entries was not written by store
+        if offset != len(data):
+            return None
+
+        # Entries are stored as one flat list of strings
+        entries = [strings[i : i + 3] for i in range(0, len(strings), 3)]
+
+        return tokens, entries
+
+    def store(self, key, tokens, entries):
+        """
+        Stores the tokens and symbol table entries of a key, concurrent writers of the same key are
+        safe because the cache file is replaced atomically
+        Params
+        ======
+        key     (string)      = Cache key
+        tokens  (TokenStream) = Tokens of the file, with symbol ids referring to entries
+        entries (list)        = The [value, type, typedata] entries of the file's symbol table in id order
+        """
+
+        strings = [string for entry in entries for string in entry]
+        data = self.MAGIC + tokens.to_bytes() + pack_strings(strings)
+
+        # Write into a temporary file next to the cache file, and move it in place once complete
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=self.TEMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self.path(key))
+        except OSError:
+            # A cache which cannot be written only costs speed
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def evict(self):
+        """
+        Removes the least recently used cache files until the cache is not larger than max_size,
+        temporary files left over from crashed writers are removed too and the ones still being
+        written count towards the size
+        """
+
+        files = []
+        total = 0
+        stale = time.time() - self.STALE_AGE
+
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith((self.SUFFIX, self.TEMP_SUFFIX)):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            if entry.name.endswith(self.TEMP_SUFFIX):
+                if stat.st_mtime < stale:
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+                else:
+                    total += stat.st_size
+                continue
+
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        # Oldest files first
+        files.sort()
+
+        for mtime, size, path in files:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
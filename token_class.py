@@ -3,7 +3,9 @@ class Token:
     Token class is responsible for creating tokens
     """
 
-    def __init__(self, type, val, line_num):
+    __slots__ = ("type", "val", "line_num", "start", "end")
+
+    def __init__(self, type, val, line_num, start=-1, end=-1):
         """
         Class initializer
         Params
@@ -11,17 +13,24 @@ class Token:
         type     (string) = type of token as string
         val      (string) = value stored at token
         line_num (int)    = line number
+        start    (int)    = offset of the first character of the lexeme in the source code
+        end      (int)    = offset after the last character of the lexeme
         Values
         ======
         type     (string) = type of token as string
         typedig  (int)    = type of token as integer
         val      (string) = value stored at token
         line_num (int)    = line number
+        start    (int)    = offset of the lexeme in the source code (bytes for utf-8 encoded source
+                            code), -1 if the token was not scanned from source code
+        end      (int)    = offset after the lexeme, tokens without a lexeme (unindent) are empty
         """
 
         self.type = type
         self.val = val
         self.line_num = line_num
+        self.start = start
+        self.end = end
 
     def __str__(self):
         """
@@ -0,0 +1,211 @@
+# Import some helper functions
+from global_helpers import error
+
+
+class TokenCursor:
+    """
+    TokenCursor class walks over tokens for a parser, with lookahead and backtracking in constant time,
+    tokens of a generator are kept in a ring buffer holding only the lookahead window and the tokens
+    after the oldest mark
+    """
+
+    # Number of tokens the ring buffer holds at first, it grows when the parser looks further ahead
+    CAPACITY = 16
+
+    def __init__(self, tokens, skip=()):
+        """
+        Class initializer
+        Params
+        ======
+        tokens (iterable) = The tokens, either a sequence such as a list or a TokenStream, or an iterator
+                            such as the scanner's token generator, which is read only as far as needed
+        skip   (iterable) = Types of tokens which are left out, for example comment types
+        Values
+        ======
+        position (int)      = Number of tokens advanced over
+        filled   (int)      = Number of tokens read from the source
+        buffer   (list)     = The tokens read, the token number n is at index n & mask
+        mask     (int)      = Size of the ring buffer minus one, -1 when buffer is the whole sequence
+        source   (iterator) = Iterator over the tokens not read yet, None once it is exhausted
+        marks    (list)     = (position, previous token) of the marks which can be rewound to, in the
+                              order they were made
+        previous (Token)    = The last token advanced over
+        """
+
+        skip = frozenset(skip)
+        if skip:
+            tokens = (token for token in tokens if token.type not in skip)
+
+        # A sequence is already in memory, it is used as the buffer and indexed directly
+        if hasattr(tokens, "__getitem__") and hasattr(tokens, "__len__"):
+            self.buffer = tokens
+            self.mask = -1
+            self.filled = len(tokens)
+            self.source = None
+        else:
+            self.buffer = [None] * self.CAPACITY
+            self.mask = self.CAPACITY - 1
+            self.filled = 0
+            self.source = iter(tokens)
+
+        self.position = 0
+        self.marks = []
+        self.previous = None
+
+    def fill(self, index):
+        """
+        Reads tokens from the source until the token number index is in the buffer
+        Params
+        ======
+        index (int) = Number of the token
+        Returns
+        =======
+        bool: Whether there is such a token
+        """
+
+        while self.filled <= index:
+            if self.source is None:
+                return False
+
+            token = next(self.source, None)
+            if token is None:
+                self.source = None
+                return False
+
+            # Tokens from the oldest mark on must stay, so make room instead of overwriting them
+            oldest = self.marks[0][0] if self.marks else self.position
+            if self.filled - oldest > self.mask:
+                self.grow(oldest)
+
+            self.buffer[self.filled & self.mask] = token
+            self.filled += 1
+
+        return True
+
+    def grow(self, oldest):
+        """
+        Doubles the size of the ring buffer
+        Params
+        ======
+        oldest (int) = Number of the first token which is kept
+        """
+
+        size = 2 * len(self.buffer)
+        buffer = [None] * size
+
+        for index in range(oldest, self.filled):
+            buffer[index & (size - 1)] = self.buffer[index & self.mask]
+
+        self.buffer = buffer
+        self.mask = size - 1
+
+    def peek(self, k=0):
+        """
+        Returns a token ahead without advancing
+        Params
+        ======
+        k (int) = How far ahead, 0 for the current token
+        Returns
+        =======
+        Token: The token, None after the last token
+        """
+
+        index = self.position + k
+        if index >= self.filled and not self.fill(index):
+            return None
+
+        return self.buffer[index & self.mask]
+
+    def advance(self):
+        """
+        Advances over the current token
+        Returns
+        =======
+        Token: The token advanced over, None after the last token
+        """
+
+        token = self.peek()
+        if token is not None:
+            self.position += 1
+            self.previous = token
+
+        return token
+
+    def accept(self, type):
+        """
+        Advances over the current token if it has the given type
+        Params
+        ======
+        type (string) = Type of token
+        Returns
+        =======
+        Token: The token advanced over, None if the current token has another type
+        """
+
+        token = self.peek()
+        if token is None or token.type != type:
+            return None
+
+        self.position += 1
+        self.previous = token
+        return token
+
+    def expect(self, type):
+        """
+        Advances over the current token, which must have the given type
+        Params
+        ======
+        type (string) = Type of token
+        Returns
+        =======
+        Token: The token advanced over
+        """
+
+        token = self.accept(type)
+
+        if token is None:
+            found = self.peek()
+            if found is None:
+                line_num = self.previous.line_num if self.previous is not None else 1
+                error("Expected %s but found the end of the source code" % type, line_num)
+            error("Expected %s but found %s" % (type, found.type), found.line_num)
+
+        return token
+
+    def mark(self):
+        """
+        Remembers the current position, the tokens from it on are kept until the mark is rewound to or
+        released
+        Returns
+        =======
+        int: The mark
+        """
+
+        self.marks.append((self.position, self.previous))
+        return self.position
+
+    def rewind(self, mark):
+        """
+        Goes back to a mark and releases it
+        Params
+        ======
+        mark (int) = The mark returned by mark
+        """
+
+        self.position, self.previous = self.release(mark)
+
+    def release(self, mark):
+        """
+        Forgets a mark and the marks made after it, once the parser will not rewind to it
+        Params
+        ======
+        mark (int) = The mark returned by mark
+        Returns
+        =======
+        tuple: The position and the previous token of the mark
+        """
+
+        while self.marks[-1][0] > mark:
+            self.marks.pop()
+
+        return self.marks.pop()
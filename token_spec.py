@@ -0,0 +1,136 @@
+# Standard library for regular expressions
+import re
+
+# Reserved words of pulse, each keyword becomes a token of the same name
+KEYWORDS = frozenset(
+    [
+        "and",
+        "or",
+        "var",
+        "print",
+        "while",
+        "input",
+        "if",
+        "else",
+        "class",
+        "fun",
+        "for",
+        "do",
+        "not",
+        "true",
+        "false",
+        "elif",
+    ]
+)
+
+# Fixed lexemes and the token type each one produces, two character operators are listed
+# before their one character prefixes so that the longest lexeme always wins
+OPERATORS = [
+    ("==", "equal"),
+    ("=", "assignment"),
+    ("+=", "plus_equal"),
+    ("++", "increment"),
+    ("+", "plus"),
+    ("-=", "minus_equal"),
+    ("--", "decrement"),
+    ("-", "minus"),
+    ("*=", "multiply_equal"),
+    ("*", "multiply"),
+    ("/=", "divide_equal"),
+    ("//", "integer_divide"),
+    ("/", "divide"),
+    ("%=", "modulus_equal"),
+    ("%", "modulus"),
+    ("!=", "not_equal"),
+    (">=", "greater_than_equal"),
+    (">", "greater_than"),
+    ("<=", "less_than_equal"),
+    ("<", "less_than"),
+    (",", "comma"),
+    ("(", "left_paren"),
+    (")", "right_paren"),
+    ("{", "left_brace"),
+    ("}", "right_brace"),
+    ("[", "token_left_bracket"),
+    ("]", "token_right_bracket"),
+    (":", "begin_block"),
+]
+
+# Lexeme classes of pulse in the order they are tried, every class is matched as a whole lexeme
+#   newline  : line break followed by the indentation of the next line
+#   number   : run of digits and decimal points (a leading '.' starts a number too)
+#   string   : double or single quoted string, the closing quote is optional so that
+#              unterminated strings can be reported
+#   ident    : keyword or identifier, identifiers may contain digits and '.' after the first letter
+#   comment  : single line comment running up to the end of the line
+#   mcomment : multi line comment, the body stops at the first '*' or before a '/'
+#   op       : any of the fixed lexemes in OPERATORS
+#   skip     : run of characters which never start a token (whitespace, ';', a lone '!', ...)
+#   unicode  : a single non ascii character (or utf-8 byte), which is either the start of an
+#              identifier or skipped
+#   eof      : the null character which terminates the source code
+TOKEN_SPEC = [
+    ("newline", r"\n\t* *"),
+    ("number", r"[0-9.]+"),
+    ("string", r"\"[^\"\0]*\"?|'[^'\0]*'?"),
+    ("ident", r"[A-Za-z_][A-Za-z0-9_.]*"),
+    ("comment", r"#[^\n\0]*"),
+    ("mcomment", r"/\*(?:[^*\0](?!/))*"),
+    ("op", "|".join(re.escape(lexeme) for lexeme, _ in OPERATORS)),
+    ("skip", r"[^0-9.A-Za-z_\"'\n#/*+\-=%,!<>()\[\]{}:\0\x80-\U0010ffff]+|!"),
+    ("unicode", r"[\x80-\U0010ffff]"),
+    ("eof", r"\0"),
+]
+
+# Replacements turning the patterns of TOKEN_SPEC into patterns over utf-8 encoded bytes, where a
+# non ascii character is a lead byte followed by continuation bytes
+BINARY_REPLACEMENTS = [
+    (
+        r"[^*\0]",
+        r"(?:[^*\0\x80-\xff]|[\xc0-\xdf][\x80-\xbf]|[\xe0-\xef][\x80-\xbf]{2}|[\xf0-\xf7][\x80-\xbf]{3})",
+    ),
+    (r"\x80-\U0010ffff", r"\x80-\xff"),
+]
+
+
+def master_pattern(binary=False):
+    """
+    Builds the master regular expression from the token specification
+    Params
+    ======
+    binary (bool) (Optional)
+        : Whether the pattern scans utf-8 encoded bytes instead of a string
+    Returns
+    =======
+    (Pattern)
+        : Compiled pattern with one named group per lexeme class of TOKEN_SPEC
+    """
+
+    pattern = "|".join("(?P<%s>%s)" % (name, regex) for name, regex in TOKEN_SPEC)
+
+    # Rewrite character classes to work on utf-8 encoded source code
+    if binary:
+        for old, new in BINARY_REPLACEMENTS:
+            pattern = pattern.replace(old, new)
+        pattern = pattern.encode("ascii")
+
+    return re.compile(pattern)
+
+
+# Every token type the scanner produces, the position of a type in this list is its kind code
+TOKEN_TYPES = (
+    sorted(KEYWORDS)
+    + [type for _, type in OPERATORS]
+    + [
+        "id",
+        "string",
+        "number",
+        "newline",
+        "unindent",
+        "single_line_comment",
+        "multi_line_comment",
+    ]
+)
+
+# Kind code of every token type
+TOKEN_CODES = {type: code for code, type in enumerate(TOKEN_TYPES)}
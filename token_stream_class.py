@@ -0,0 +1,230 @@
+# Standard library for compact arrays of basic values
+from array import array
+
+# The module for system-specific parameters and functions
+import sys
+
+# Import some helper functions
+from global_helpers import pack_strings, unpack_strings
+
+# Import Token class
+from token_class import Token
+
+# Import the kind codes of the token types
+from token_spec import TOKEN_CODES, TOKEN_TYPES
+
+
+class TokenStream:
+    """
+    TokenStream class stores tokens column wise in typed arrays instead of one object per token
+    """
+
+    def __init__(self, tokens=()):
+        """
+        Initializer of TokenStream class
+        Params
+        ======
+        tokens (iterable) = Tokens to be stored, for example a list of tokens or a token generator
+        Values
+        ======
+        kinds  (array) = Kind code of every token, see TOKEN_TYPES
+        vals   (array) = Value of every token, a symbol id (>= 0), -1 for no value or -(index + 2) for
+                         an index into texts
+        lines  (array) = Line number of every token
+        starts (array) = Offset of the first character of every token in the source code, -1 if unknown
+        ends   (array) = Offset after the last character of every token, -1 if unknown
+        texts  (list)  = Text values of tokens (comments) which are not symbol ids
+        """
+
+        self.kinds = array("B")
+        self.vals = array("i")
+        self.lines = array("i")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.texts = []
+
+        self.extend(tokens)
+
+    def append(self, token):
+        """
+        Adds a token at the end of the stream
+        Params
+        ======
+        token (Token) = The token to be stored
+        """
+
+        val = token.val
+
+        # Text values (and spans, as their text) are kept aside and referenced by a negative value
+        if isinstance(val, int):
+            pass
+        elif isinstance(val, str) and not val:
+            val = -1
+        else:
+            self.texts.append(str(val))
+            val = -len(self.texts) - 1
+
+        self.kinds.append(TOKEN_CODES[token.type])
+        self.vals.append(val)
+        self.lines.append(token.line_num)
+        self.starts.append(token.start)
+        self.ends.append(token.end)
+
+    def extend(self, tokens):
+        """
+        Adds tokens at the end of the stream
+        Params
+        ======
+        tokens (iterable) = The tokens to be stored
+        """
+
+        # Columns of another stream are copied directly, shifting its references into texts
+        if isinstance(tokens, TokenStream):
+            shift = len(self.texts)
+            self.kinds.extend(tokens.kinds)
+            self.vals.extend(
+                tokens.vals if not shift else [val - shift if val < -1 else val for val in tokens.vals]
+            )
+            self.lines.extend(tokens.lines)
+            self.starts.extend(tokens.starts)
+            self.ends.extend(tokens.ends)
+            self.texts.extend(tokens.texts)
+            return
+
+        append = self.append
+        for token in tokens:
+            append(token)
+
+    def remap(self, mapping):
+        """
+        Replaces the symbol ids of the tokens, for example after merging symbol tables
+        Params
+        ======
+        mapping (list) = New symbol id at the index of every old symbol id
+        """
+
+        self.vals = array("i", [mapping[val] if val >= 0 else val for val in self.vals])
+
+    def to_bytes(self):
+        """
+        Serializes the tokens into a compact binary form, which from_bytes loads back
+        Returns
+        =======
+        bytes: Number of tokens, the kind, value, line, start and end columns (little endian) and
+               the texts
+        """
+
+        columns = [self.vals, self.lines, self.starts, self.ends]
+        if sys.byteorder == "big":
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+
+        return b"".join(
+            [len(self.kinds).to_bytes(4, "little"), self.kinds.tobytes()]
+            + [column.tobytes() for column in columns]
+            + [pack_strings(self.texts)]
+        )
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """
+        Deserializes tokens serialized by to_bytes
+        Params
+        ======
+        data   (bytes) = Bytes containing the serialized tokens
+        offset (int)   = Index of the serialized tokens in data
+        Returns
+        =======
+        TokenStream: The tokens
+        int: Index of the first byte after the serialized tokens, ValueError is raised if data ends
+             before them
+        """
+
+        stream = cls()
+
+        count = int.from_bytes(data[offset : offset + 4], "little")
+        offset += 4
+
+        # Read the columns one after another
+        columns = [stream.kinds, stream.vals, stream.lines, stream.starts, stream.ends]
+        for column in columns:
+            size = column.itemsize * count
+            column.frombytes(data[offset : offset + size])
+            offset += size
+
+        if offset > len(data):
+            raise ValueError("Truncated token stream")
+
+        if sys.byteorder == "big":
+            for column in columns[1:]:
+                column.byteswap()
+
+        stream.texts, offset = unpack_strings(data, offset)
+
+        return stream, offset
+
+    def value(self, index):
+        """
+        Returns the value of a token as the scanner produced it
+        Params
+        ======
+        index (int) = Position of the token in the stream
+        Returns
+        =======
+        int/string: The symbol id of the token, its text, or "" if the token has no value
+        """
+
+        val = self.vals[index]
+        if val >= 0:
+            return val
+        return "" if val == -1 else self.texts[-val - 2]
+
+    def columns(self):
+        """
+        Iterates over the tokens without creating Token objects
+        Returns
+        =======
+        iterator: (kind code, raw value, line number) of every token
+        """
+
+        return zip(self.kinds, self.vals, self.lines)
+
+    def __len__(self):
+        """
+        Returns
+        =======
+        int: Number of tokens in the stream
+        """
+
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        """
+        Returns a Token view of a stored token
+        Params
+        ======
+        index (int/slice) = Position of the token in the stream, or a slice of positions
+        Returns
+        =======
+        Token/list: The token at the position, or a list of tokens for a slice
+        """
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        return Token(
+            TOKEN_TYPES[self.kinds[index]],
+            self.value(index),
+            self.lines[index],
+            self.starts[index],
+            self.ends[index],
+        )
+
+    def __iter__(self):
+        """
+        Iterates over Token views of the stored tokens
+        """
+
+        for i in range(len(self.kinds)):
+            yield self[i]
@@ -0,0 +1,188 @@
+# Standard library for json encoding
+import json
+
+# Standard library for iterator building blocks
+from itertools import islice
+
+# Import some helper functions
+from global_helpers import pack_strings, unpack_strings
+
+# Import TokenStream class
+from token_stream_class import TokenStream
+
+# Import the token types of the kind codes
+from token_spec import TOKEN_TYPES
+
+
+class TokenWriter:
+    """
+    TokenWriter class writes tokens and symbol tables to a binary stream in large batches
+    """
+
+    # Supported output formats
+    FORMATS = ("text", "jsonl", "binary")
+
+    # Magic bytes at the start of the binary format
+    MAGIC = b"PTK2"
+
+    def __init__(self, out, format="text", batch_size=8192):
+        """
+        Initializer of TokenWriter class
+        Params
+        ======
+        out        (file)   = Binary stream receiving the output, for example sys.stdout.buffer
+        format     (string) = One of FORMATS, text is the same as printing every token
+        batch_size (int)    = Number of tokens formatted before each write
+        """
+
+        if format not in self.FORMATS:
+            raise ValueError("Unknown token format %r" % (format,))
+
+        self.out = out
+        self.format = format
+        self.batch_size = batch_size
+
+        # The binary format starts with the magic bytes, followed by tagged records
+        if format == "binary":
+            out.write(self.MAGIC)
+
+    def write(self, tokens):
+        """
+        Writes tokens
+        Params
+        ======
+        tokens (iterable) = Tokens to be written, a TokenStream is written without creating Token objects
+        """
+
+        if self.format == "binary":
+            if isinstance(tokens, TokenStream):
+                self.out.write(b"T" + tokens.to_bytes())
+                return
+
+            tokens = iter(tokens)
+            while True:
+                batch = TokenStream(islice(tokens, self.batch_size))
+                if not len(batch):
+                    break
+                self.out.write(b"T" + batch.to_bytes())
+            return
+
+        # Text formats work on (type, value, line) rows
+        if isinstance(tokens, TokenStream):
+            value = tokens.value
+            rows = (
+                (TOKEN_TYPES[kind], value(i), line)
+                for i, (kind, val, line) in enumerate(tokens.columns())
+            )
+        else:
+            rows = ((token.type, token.val, token.line_num) for token in tokens)
+
+        format_row = self.format_text if self.format == "text" else self.format_jsonl
+
+        while True:
+            batch = [format_row(row) for row in islice(rows, self.batch_size)]
+            if not batch:
+                break
+            self.out.write("".join(batch).encode("utf-8"))
+
+    def write_symbols(self, table):
+        """
+        Writes the entries of a symbol table
+        Params
+        ======
+        table (SymbolTable) = The symbol table to be written
+        """
+
+        entries = table.symbol_table.items()
+
+        if self.format == "binary":
+            strings = [string for id, entry in entries for string in entry]
+            self.out.write(b"S" + pack_strings(strings))
+        elif self.format == "text":
+            lines = ["Symbol(%d, %s, %s, %s)\n" % ((id,) + tuple(entry)) for id, entry in entries]
+            self.out.write("".join(lines).encode("utf-8"))
+        else:
+            lines = [
+                json.dumps({"id": id, "value": value, "type": type, "typedata": typedata}) + "\n"
+                for id, (value, type, typedata) in entries
+            ]
+            self.out.write("".join(lines).encode("utf-8"))
+
+    def flush(self):
+        """
+        Flushes the output stream
+        """
+
+        self.out.flush()
+
+    @staticmethod
+    def format_text(row):
+        """
+        Formats a token exactly like printing the Token object
+        Params
+        ======
+        row (tuple) = (type, value, line number) of the token
+        Returns
+        =======
+        string: The line (two lines for newline tokens) of the token
+        """
+
+        type, val, line_num = row
+        return (
+            "Token(%s, %s)\n" % (type, val)
+            if type != "newline"
+            else "Token(%s, %s)\n\n" % (type, val)
+        )
+
+    @staticmethod
+    def format_jsonl(row):
+        """
+        Formats a token as one json object per line
+        Params
+        ======
+        row (tuple) = (type, value, line number) of the token
+        Returns
+        =======
+        string: The json line of the token
+        """
+
+        type, val, line_num = row
+        return '{"type": "%s", "val": %s, "line": %d}\n' % (
+            type,
+            val if isinstance(val, int) else json.dumps(str(val)),
+            line_num,
+        )
+
+    @classmethod
+    def load(cls, data):
+        """
+        Loads tokens and symbol table entries written in the binary format
+        Params
+        ======
+        data (bytes) = The binary output, for example the contents of a file or a memory map
+        Returns
+        =======
+        TokenStream: All tokens of the output
+        list: The [value, type, typedata] symbol table entries in id order, None if none were written
+        """
+
+        if data[: len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError("Not a binary token file")
+
+        tokens = TokenStream()
+        entries = None
+        offset = len(cls.MAGIC)
+
+        while offset < len(data):
+            tag = data[offset : offset + 1]
+
+            if tag == b"T":
+                stream, offset = TokenStream.from_bytes(data, offset + 1)
+                tokens.extend(stream)
+            elif tag == b"S":
+                strings, offset = unpack_strings(data, offset + 1)
+                entries = [strings[i : i + 3] for i in range(0, len(strings), 3)]
+            else:
+                raise ValueError("Corrupt binary token file at byte %d" % offset)
+
+        return tokens, entries